@@ -1,14 +1,57 @@
-from typing import Any
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, ClassVar, Mapping
 
 from pydantic import BaseModel
 
 
+@dataclass(frozen=True)
+class ModelMetaData:
+    """
+    Everything the UI needs to know about a Model class, see Model.get_meta_data
+    - column configs are dicts (as expected by streamlit, which copies them before any change) and must not be modified
+    """
+    column_config: Mapping[str, Any]
+    id_fields: tuple[str, ...]
+    column_order: tuple[str, ...]
+    dtype_hints: Mapping[str, str]
+
+
 class Model(BaseModel):
+    _meta_data: ClassVar[dict[type, ModelMetaData]] = {}
 
     @classmethod
     def get_id_field(cls):
         return 'id'
 
+    @classmethod
+    def get_id_fields(cls) -> tuple[str, ...]:
+        """ For a composite key, override it to return all the fields (columns) of the key """
+        return (cls.get_id_field(),)
+
     @classmethod
     def get_column_config(cls) -> dict[str, Any]:
         return {}
+
+    @classmethod
+    def get_dtype_hints(cls) -> dict[str, str]:
+        """ dtype of a column (by alias) in a compact table, when it is better than the one derived from its field """
+        return {}
+
+    @classmethod
+    def get_meta_data(cls) -> ModelMetaData:
+        """
+        Column configs, id fields, column order and dtype hints of the class, built once (per class) and read-only
+        - the methods above build these on every call, e.g. a column config is a new streamlit object each time
+        """
+        meta_data: ModelMetaData | None = Model._meta_data.get(cls, None)
+        if meta_data is None:
+            column_config: dict[str, Any] = cls.get_column_config()
+            # a race just builds it twice, and either of them is kept
+            meta_data = Model._meta_data.setdefault(cls, ModelMetaData(
+                column_config=MappingProxyType(column_config), id_fields=tuple(cls.get_id_fields()),
+                column_order=tuple(column_config.keys()), dtype_hints=MappingProxyType(dict(cls.get_dtype_hints()))))
+
+        return meta_data
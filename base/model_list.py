@@ -1,15 +1,75 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Any, ClassVar, Optional, Type
 
 import pandas as pd
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+
+from base.model import Model
+from core.table_compactor import TableCompactor
+from util import Util
 
 
 class ModelList(BaseModel):
+    """
+    A list of models, as expected by the backend for bulk requests
+    - subclasses are expected to set item_class and declare exactly one field, the list of item_class
+    - from_df validates the whole DataFrame in one call (instead of one call per row)
+    - get_ids reads the id column(s) of item_class directly, i.e. without validating any row
+    """
+
+    item_class: ClassVar[Optional[Type[Model]]] = None
+    _type_adapters: ClassVar[dict[Type[Model], TypeAdapter]] = {}
+
     @classmethod
     def from_df(cls, df: pd.DataFrame) -> Optional[ModelList]:
-        raise NotImplementedError("from_df is not implemented")
+        if cls.item_class is None:
+            raise NotImplementedError("from_df is not implemented")
+
+        if Util.is_none_or_empty_df(df):
+            return None
+
+        items: list[Model] = cls._get_type_adapter().validate_python(cls._to_records(df))
+
+        # items are already validated, so there is no need to validate them again
+        return cls.model_construct(**{cls._get_items_field(): items})
 
     @classmethod
     def get_ids(cls, df: pd.DataFrame) -> list:
-        raise NotImplementedError("get_ids is not implemented")
+        """ values of the id field, or tuples of values if the id is a composite key """
+        if cls.item_class is None:
+            raise NotImplementedError("get_ids is not implemented")
+
+        if Util.is_none_or_empty_df(df):
+            return []
+
+        id_fields: tuple[str, ...] = cls.item_class.get_meta_data().id_fields
+        if len(id_fields) == 1:
+            return df[id_fields[0]].tolist()
+
+        return list(df[list(id_fields)].itertuples(index=False, name=None))
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> list[dict[str, Any]]:
+        """
+        Same as df.to_dict('records'), but faster as values are converted to python objects column by column
+        - values of a compact table are converted as if it had the default dtypes (see TableCompactor.to_list)
+        """
+        columns: list[str] = df.columns.to_list()
+        return [dict(zip(columns, row)) for row in zip(*[TableCompactor.to_list(df[column]) for column in columns])]
+
+    @classmethod
+    def _get_items_field(cls) -> str:
+        fields: list[str] = [field for field in cls.model_fields.keys()]
+        if len(fields) != 1:
+            raise TypeError(f'{cls} is expected to have exactly one field, but found: {fields}')
+
+        return fields[0]
+
+    @classmethod
+    def _get_type_adapter(cls) -> TypeAdapter:
+        type_adapter: Any = cls._type_adapters.get(cls.item_class, None)
+        if type_adapter is None:
+            type_adapter = TypeAdapter(list[cls.item_class])
+            cls._type_adapters[cls.item_class] = type_adapter
+
+        return type_adapter
@@ -1,59 +1,109 @@
+import json
+import time
 from streamlit.logger import get_logger
-from io import StringIO
-from typing import Optional
+from typing import Any, Optional, Type
 
 import pandas as pd
 import requests
 
+from base.model import Model
+from base.model_list import ModelList
+from base.response_decoder import ResponseDecoder, SchemaJsonDecoder
+from core.metrics import BYTES_BUCKETS, Metrics
 from core.response_data import ResponseData
-from util import Util
+from core.session_pool import SessionPool
 
 logger = get_logger(__name__.split('.')[-1])
 
 
 class RequestHandler:
-    """ All the Rest API calls are being made separately, so that it can be overridden by subclasses. """
+    """
+    All the Rest API calls are being made separately, so that it can be overridden by subclasses.
+    - requests are made using keep-alive sessions from SessionPool, so connections are reused across calls
+    - responses are decoded by response_decoder, as per the fields of model_class (if provided)
+    - if enabled, time taken and payload sizes of every request are recorded in Metrics, by end point
+    - if the backend expects a different format, override the transform hooks instead of the http verbs:
+        -- transform_incoming: applied (once) to the decoded DataFrame of every response
+        -- transform_outgoing: applied (once) to the dumped payload (python objects) before it is serialized
+    """
+
+    response_decoder: Type[ResponseDecoder] = SchemaJsonDecoder
 
     @classmethod
-    def handle_get(cls, url: str, headers: Optional[dict[str, str]] = None) -> ResponseData:
+    def transform_incoming(cls, df: pd.DataFrame) -> pd.DataFrame:
+        return df
+
+    @classmethod
+    def transform_outgoing(cls, payload: Any) -> Any:
+        return payload
+
+    @classmethod
+    def to_json(cls, model_list: ModelList) -> str:
+        """ Serializes the model_list (by alias) to be sent as request body, after applying transform_outgoing """
+        if cls.transform_outgoing.__func__ is RequestHandler.transform_outgoing.__func__:
+            return model_list.model_dump_json(by_alias=True)  # nothing to transform, so the fastest path
+
+        return json.dumps(cls.transform_outgoing(model_list.model_dump(mode='json', by_alias=True)))
+
+    @classmethod
+    def handle_get(cls, url: str, headers: Optional[dict[str, str]] = None,
+                   model_class: Optional[Type[Model]] = None) -> ResponseData:
         logger.info(f"Get request: {url}")
-        return cls._wrap(requests.get(url=url, headers=headers))
+        return cls._wrap(cls._request('GET', url=url, headers=headers), model_class)
 
     @classmethod
     def handle_post(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
         logger.info(f"Post request: {url}, json_data: {json_data}")
-        return cls._wrap(requests.post(url=url, data=json_data, headers=headers))
+        return cls._wrap(cls._request('POST', url=url, data=json_data, headers=headers))
 
     @classmethod
     def handle_put(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
         logger.info(f"Put request: {url}, json_data: {json_data}")
-        return cls._wrap(requests.put(url=url, data=json_data, headers=headers))
+        return cls._wrap(cls._request('PUT', url=url, data=json_data, headers=headers))
 
     @classmethod
     def handle_delete(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
         logger.info(f"Delete request: {url}, json_data: {json_data}")
-        return cls._wrap(requests.delete(url=url, data=json_data, headers=headers))
+        return cls._wrap(cls._request('DELETE', url=url, data=json_data, headers=headers))
 
     @classmethod
-    def _extract_response_data(cls, response: requests.Response) -> Optional[pd.DataFrame]:
+    def _request(cls, method: str, url: str, **kwargs) -> requests.Response:
+        if not Metrics.enabled:
+            return SessionPool.request(method, url=url, **kwargs)
+
+        end_point: str = Metrics.get_end_point(url)
+        start: float = time.perf_counter()
+        try:
+            response: requests.Response = SessionPool.request(method, url=url, **kwargs)
+        except requests.exceptions.RequestException:
+            Metrics.inc("http_request_errors_total", method=method, end_point=end_point)
+            raise
+
+        Metrics.observe("http_request_seconds", time.perf_counter() - start, method=method, end_point=end_point,
+                        status=response.status_code)
+        Metrics.observe("http_request_bytes", len(kwargs.get('data', None) or ''), BYTES_BUCKETS, method=method,
+                        end_point=end_point)
+        Metrics.observe("http_response_bytes", len(response.content), BYTES_BUCKETS, method=method,
+                        end_point=end_point)
+        return response
+
+    @classmethod
+    def _extract_response_data(cls, response: requests.Response,
+                               model_class: Optional[Type[Model]] = None) -> Optional[pd.DataFrame]:
         if response.status_code != requests.codes.ok:
             return None
 
-        if not response.text:
+        if not response.content:
             return None
 
-        return pd.read_json(StringIO(response.text))
+        df: Optional[pd.DataFrame] = cls.response_decoder.decode(response.content, model_class)
+        return None if df is None else cls.transform_incoming(df)
 
     @classmethod
-    def _wrap(cls, response: requests.Response) -> ResponseData:
+    def _wrap(cls, response: requests.Response, model_class: Optional[Type[Model]] = None) -> ResponseData:
         if response.status_code == requests.codes.ok:
-
-            # it is okay to have empty response
-            df: Optional[pd.DataFrame] = cls._extract_response_data(response)
-            if not Util.is_none_or_empty_df(df):
-                return ResponseData(response.status_code, df=df)
-
-            return ResponseData(response.status_code, error_msg="No Data")
+            # decoded only if (and when) the df is needed, and it is okay to have empty response, i.e. 'No Data'
+            return ResponseData(response.status_code, loader=lambda: cls._extract_response_data(response, model_class))
 
         if response.text:
             return ResponseData(response.status_code, error_msg=response.text)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import types
+from enum import Enum
+from io import StringIO
+from typing import Any, Optional, Type, Union, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+from pandas.io.json import ujson_loads
+
+from base.model import Model
+
+
+class ResponseDecoder:
+    """
+    Converts the body of a response to a DataFrame, RequestHandler uses its response_decoder to decode responses
+    - to use a different decoder, override response_decoder in the RequestHandler subclass
+    """
+
+    @classmethod
+    def decode(cls, content: bytes, model_class: Optional[Type[Model]] = None) -> Optional[pd.DataFrame]:
+        raise NotImplementedError("decode is not implemented")
+
+
+class PandasJsonDecoder(ResponseDecoder):
+    """ Lets pandas guess the dtype of every column, hence it ignores the model_class """
+
+    @classmethod
+    def decode(cls, content: bytes, model_class: Optional[Type[Model]] = None) -> Optional[pd.DataFrame]:
+        if not content:
+            return None
+
+        return pd.read_json(StringIO(content.decode()))
+
+
+class SchemaJsonDecoder(ResponseDecoder):
+    """
+    Decodes a json list of objects straight from the bytes and builds the DataFrame column by column
+    - dtype of a column is as per the type of the corresponding field (by alias) of the model_class, e.g.
+        -- int fields are int64 (or float64 if there are missing values, same as pandas would do)
+        -- float fields are float64 and str (and enum) fields are object
+    - columns which are not in the model_class (or if there is no model_class) are left to pandas to infer
+    - anything other than a list of objects is decoded by PandasJsonDecoder
+    It uses the same (ujson based) parser as pandas, with the same default for precise_float
+    """
+
+    precise_float: bool = False
+
+    @classmethod
+    def decode(cls, content: bytes, model_class: Optional[Type[Model]] = None) -> Optional[pd.DataFrame]:
+        if not content:
+            return None
+
+        records: Any = ujson_loads(content, precise_float=cls.precise_float)
+        if not isinstance(records, list) or not all([isinstance(record, dict) for record in records]):
+            return PandasJsonDecoder.decode(content, model_class)
+
+        return cls.to_df(records, model_class)
+
+    @classmethod
+    def to_df(cls, records: list[dict[str, Any]], model_class: Optional[Type[Model]] = None) -> pd.DataFrame:
+        dtypes: dict[str, Optional[type]] = cls.get_dtypes(model_class) if model_class else {}
+        try:
+            # usually, all the records have the same keys, so there is no need to look beyond the first record
+            column_names: list[str] = list(records[0].keys()) if records else []
+            columns: dict[str, list] = {name: [record[name] for record in records] for name in column_names}
+            if not all([len(record) == len(column_names) for record in records]):
+                raise KeyError("records have different keys")
+
+        except KeyError:
+            column_names: list[str] = list(dict.fromkeys([key for record in records for key in record.keys()]))
+            columns: dict[str, list] = {name: [record.get(name, None) for record in records] for name in column_names}
+
+        return pd.DataFrame({name: cls._to_array(values, dtypes.get(name, None)) for name, values in columns.items()},
+                            columns=column_names)
+
+    @classmethod
+    def get_dtypes(cls, model_class: Type[Model]) -> dict[str, Optional[type]]:
+        """ python type of each field by its (validation) alias, None if the type is not handled """
+        dtypes: dict[str, Optional[type]] = {}
+        for field_name, field_info in model_class.model_fields.items():
+            dtypes[field_info.alias or field_name] = cls._get_python_type(field_info.annotation)
+
+        return dtypes
+
+    @classmethod
+    def _get_python_type(cls, annotation: Any) -> Optional[type]:
+        if get_origin(annotation) in (Union, types.UnionType):  # e.g. Optional[int]
+            args: list = [arg for arg in get_args(annotation) if arg is not type(None)]
+            return cls._get_python_type(args[0]) if len(args) == 1 else None
+
+        if isinstance(annotation, type) and issubclass(annotation, (Enum, str)):
+            return str
+
+        if annotation in (int, float):
+            return annotation
+
+        return None
+
+    @classmethod
+    def _to_array(cls, values: list, python_type: Optional[type]) -> Any:
+        try:
+            if python_type is int:
+                if None in values:
+                    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+                return np.array(values, dtype=np.int64)
+
+            if python_type is float:
+                return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+            if python_type is str:
+                # unlike np.array, this does not expand list values (if any) to a 2d array
+                return np.fromiter(values, dtype=object, count=len(values))
+
+        except (TypeError, ValueError, OverflowError):
+            pass  # the values don't match the schema, let pandas figure it out
+
+        return values
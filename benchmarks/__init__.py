@@ -0,0 +1,5 @@
+"""
+Micro benchmarks of the data path, these are not tests, hence not collected by the test runner
+e.g. python -m benchmarks.bench_response_decoder --rows 100000
+- suite runs all of these (for 1k, 100k and 1M rows) and compares the results with a baseline, see suite.py
+"""
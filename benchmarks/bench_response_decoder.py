@@ -0,0 +1,24 @@
+import argparse
+import json
+
+from base.response_decoder import PandasJsonDecoder, SchemaJsonDecoder
+from benchmarks.synthetic import measure, movie_records
+from impl.movie import Movie
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the response decoders")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        content: bytes = json.dumps(movie_records(rows)).encode()
+        pandas_time: float = measure(lambda: PandasJsonDecoder.decode(content, Movie), args.repeat)
+        schema_time: float = measure(lambda: SchemaJsonDecoder.decode(content, Movie), args.repeat)
+        print(f'rows: {rows:>9}, size: {len(content) / 1024 / 1024:8.2f}MB, pandas: {pandas_time * 1000:9.1f}ms, '
+              f'schema: {schema_time * 1000:9.1f}ms, speedup: {pandas_time / schema_time:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import random
+
+import pandas as pd
+
+from benchmarks.synthetic import measure, movie_records
+from core.editor_meta_data import EditorMetaDataMap
+from core.model_session_data import ModelSessionData
+from core.update_calculator import UpdateCalculator
+from enums import ModelSessionDataEnum, Operation
+
+
+def edited_rows(df: pd.DataFrame, edits: int, seed: int = 0) -> dict[int, dict]:
+    """ as streamlit would do, if a block of cells (title and rating) is pasted in the editor """
+    rnd: random.Random = random.Random(seed)
+    return {position: {"title": f"Edited {position}", "rating": round(rnd.uniform(1, 10), 1)}
+            for position in rnd.sample(range(df.shape[0]), edits)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the vectorized diff with the reference implementation")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--edits", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df: pd.DataFrame = pd.DataFrame(movie_records(args.rows))
+    session_state: dict = {}
+    session_data: ModelSessionData = ModelSessionData("movies", session_state)
+    key: str = session_data.get_key(ModelSessionDataEnum.EditorData)
+    calculator: UpdateCalculator = UpdateCalculator(df, session_data)
+
+    for edits in args.edits:
+        session_state[key] = {EditorMetaDataMap[Operation.Edited].operation_key: edited_rows(df, edits)}
+        reference_time: float = measure(calculator._get_edited_rows_reference, args.repeat)
+        vectorized_time: float = measure(calculator._get_edited_rows, args.repeat)
+        print(f'rows: {args.rows:>9}, edits: {edits:>7}, reference: {reference_time * 1000:9.1f}ms, '
+              f'vectorized: {vectorized_time * 1000:9.1f}ms, speedup: {reference_time / vectorized_time:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Benchmark suite of the core data path, on synthetic tables of different sizes
+- run: times every case for every size and writes the results as json, e.g.
+    python -m benchmarks.suite run --rows 1000 100000 1000000 --output bench.json
+- compare: compares the results with a baseline, and exits with 1 if any case is slower than the tolerance, e.g.
+    python -m benchmarks.suite compare baseline.json bench.json --tolerance 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import pydantic
+import requests
+
+from base.request_handler import RequestHandler
+from benchmarks.bench_update_calculator import edited_rows
+from benchmarks.synthetic import measure, movie_records, super_hero_records
+from core.edit_window import EditWindow
+from core.editor_meta_data import EditorMetaDataMap
+from core.model_session_data import ModelSessionData
+from core.update_calculator import UpdateCalculator
+from enums import ModelSessionDataEnum, Operation
+from impl.movie import Movie, MoviesList
+from impl.super_hero import SuperHeroList
+from impl.super_hero_request_handler import SuperHeroJsonRequestHandler
+from util import Util
+
+# a case prepares its data for the given number of rows, and returns the function to be timed
+Case = Callable[[int], Callable[[], Any]]
+
+
+@dataclass
+class CaseResult:
+    case: str
+    rows: int
+    seconds: float  # best of the runs
+
+
+@dataclass
+class Comparison:
+    case: str
+    rows: int
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def is_regression(self, tolerance: float, min_seconds: float) -> bool:
+        """ timings smaller than min_seconds are mostly noise, so these are not considered """
+        return max(self.baseline, self.current) >= min_seconds and self.ratio > 1 + tolerance
+
+
+def _movies_df(rows: int) -> pd.DataFrame:
+    return pd.DataFrame(movie_records(rows))
+
+
+def _super_heros_df(rows: int) -> pd.DataFrame:
+    df: pd.DataFrame = pd.DataFrame(super_hero_records(rows))
+    df["awards"] = df["awards"].str.join(',')
+    return df
+
+
+def calculate_update(rows: int) -> Callable[[], Any]:
+    """ edits 1% of the rows, deletes 1% and adds 0.1%, as streamlit would report in editor data """
+    df: pd.DataFrame = _movies_df(rows)
+    rnd: random.Random = random.Random(0)
+    session_state: dict = {}
+    session_data: ModelSessionData = ModelSessionData("movies", session_state)
+    session_state[session_data.get_key(ModelSessionDataEnum.EditorData)] = {
+        EditorMetaDataMap[Operation.Edited].operation_key: edited_rows(df, max(1, rows // 100)),
+        EditorMetaDataMap[Operation.New].operation_key: movie_records(max(1, rows // 1000), seed=1),
+        EditorMetaDataMap[Operation.Deleted].operation_key: rnd.sample(range(rows), max(1, rows // 100)),
+    }
+    calculator: UpdateCalculator = UpdateCalculator(df, session_data)
+    return calculator.calculate_update
+
+
+def windowed_update(rows: int) -> Callable[[], Any]:
+    """ edits 10 rows in each of (at most) 10 windows of the editor (see EditWindow), then calculates the update """
+    df: pd.DataFrame = _movies_df(rows)
+    session_data: ModelSessionData = ModelSessionData("movies", {})
+    window_size: int = max(1, min(5000, rows // 10))
+    editor_data: dict = {EditorMetaDataMap[Operation.Edited].operation_key: {
+        position: {"title": f"Edited {position}"} for position in range(min(10, window_size))}}
+
+    def update() -> dict[Operation, pd.DataFrame]:
+        window: EditWindow = EditWindow(df, window_size)
+        for start in range(window_size, min(rows, 10 * window_size) + 1, window_size):
+            window.get_window_df(df)
+            window.move(df, start, editor_data)
+        return UpdateCalculator(df, session_data, window).calculate_update()
+
+    return update
+
+
+def movies_list_to_json(rows: int) -> Callable[[], Any]:
+    """ what is done for each batch of new/edited rows before sending these """
+    df: pd.DataFrame = _movies_df(rows)
+    return lambda: MoviesList.from_df(df).model_dump_json(by_alias=True)
+
+
+def super_hero_outgoing(rows: int) -> Callable[[], Any]:
+    model_list: SuperHeroList = SuperHeroList.from_df(_super_heros_df(rows))
+    return lambda: SuperHeroJsonRequestHandler.to_json(model_list)
+
+
+def super_hero_incoming(rows: int) -> Callable[[], Any]:
+    df: pd.DataFrame = pd.DataFrame(super_hero_records(rows))
+    # transform is in place, so it is applied to a (shallow) copy every time
+    return lambda: SuperHeroJsonRequestHandler.transform_incoming(df.copy(deep=False))
+
+
+def extract_response_data(rows: int) -> Callable[[], Any]:
+    response: requests.Response = requests.Response()
+    response.status_code = requests.codes.ok
+    response._content = json.dumps(movie_records(rows)).encode()
+    return lambda: RequestHandler._extract_response_data(response, Movie)
+
+
+def is_none_or_empty_df(rows: int) -> Callable[[], Any]:
+    df: pd.DataFrame = _movies_df(rows)
+    return lambda: Util.is_none_or_empty_df(df)
+
+
+CASES: dict[str, Case] = {
+    "calculate_update": calculate_update,
+    "windowed_update": windowed_update,
+    "movies_list_to_json": movies_list_to_json,
+    "super_hero_outgoing": super_hero_outgoing,
+    "super_hero_incoming": super_hero_incoming,
+    "extract_response_data": extract_response_data,
+    "is_none_or_empty_df": is_none_or_empty_df,
+}
+
+
+def run(cases: list[str], rows_list: list[int], repeat: int) -> list[CaseResult]:
+    results: list[CaseResult] = []
+    for rows in rows_list:
+        for case in cases:
+            func: Callable[[], Any] = CASES[case](rows)
+            result: CaseResult = CaseResult(case=case, rows=rows, seconds=measure(func, repeat))
+            print(f'{case:<24} rows: {rows:>9}, {result.seconds * 1000:10.2f}ms', file=sys.stderr)
+            results.append(result)
+
+    return results
+
+
+def get_environment() -> dict[str, str]:
+    """ results are only comparable if these are same (or at least, if the change is intended) """
+    return {"python": platform.python_version(), "platform": platform.platform(), "pandas": pd.__version__,
+            "numpy": np.__version__, "pydantic": pydantic.VERSION}
+
+
+def to_json(results: list[CaseResult], repeat: int) -> dict[str, Any]:
+    return {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "repeat": repeat,
+            "environment": get_environment(), "results": [asdict(result) for result in results]}
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[Comparison]:
+    """ only the cases (and sizes) which are in both the results are compared """
+    baseline_results: dict[tuple[str, int], float] = {(r["case"], r["rows"]): r["seconds"]
+                                                      for r in baseline["results"]}
+    return [Comparison(case=r["case"], rows=r["rows"], baseline=baseline_results[(r["case"], r["rows"])],
+                       current=r["seconds"])
+            for r in current["results"] if (r["case"], r["rows"]) in baseline_results]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of the core data path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="runs the benchmarks and writes the results as json")
+    run_parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    run_parser.add_argument("--cases", nargs="+", choices=list(CASES.keys()), default=list(CASES.keys()))
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--output", help="json file for the results, otherwise printed to stdout")
+
+    compare_parser = commands.add_parser("compare", help="compares the results (json) with a baseline (json)")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.25, help="e.g. 0.25 means 25%% slower")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.001, help="faster cases are ignored")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        output: str = json.dumps(to_json(run(args.cases, args.rows, args.repeat), args.repeat), indent=2)
+        if args.output:
+            with open(args.output, "w") as fp:
+                fp.write(output)
+        else:
+            print(output)
+        return 0
+
+    with open(args.baseline) as fp:
+        baseline: dict[str, Any] = json.load(fp)
+    with open(args.current) as fp:
+        current: dict[str, Any] = json.load(fp)
+
+    if baseline["environment"] != current["environment"]:
+        print(f'Environment has changed: {baseline["environment"]} -> {current["environment"]}')
+
+    regressions: int = 0
+    for comparison in compare(baseline, current):
+        is_regression: bool = comparison.is_regression(args.tolerance, args.min_seconds)
+        regressions += is_regression
+        print(f'{comparison.case:<24} rows: {comparison.rows:>9}, baseline: {comparison.baseline * 1000:10.2f}ms, '
+              f'current: {comparison.current * 1000:10.2f}ms, ratio: {comparison.ratio:5.2f}'
+              f'{"  <-- regression" if is_regression else ""}')
+
+    print(f'{regressions} regression(s) beyond {args.tolerance:.0%} tolerance')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
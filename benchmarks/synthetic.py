@@ -0,0 +1,33 @@
+import random
+import time
+from typing import Any, Callable
+
+GENRES: list[str] = ["Action", "Adventure", "Comedy", "Crime", "Drama", "Fantasy", "Horror", "Mystery", "Thriller"]
+AWARDS: list[str] = ["Oscar", "Golden Globe", "BAFTA", "Emmy", "Saturn Award", "MTV Movie Award"]
+
+
+def movie_records(rows: int, seed: int = 0) -> list[dict[str, Any]]:
+    """ as sent by the backend, i.e. by alias """
+    rnd: random.Random = random.Random(seed)
+    return [{"id": i, "title": f"Title {i}", "year": rnd.randint(1950, 2025), "votes": rnd.randint(1, 2_000_000),
+             "rating": round(rnd.uniform(1, 10), 1), "genres": ','.join(rnd.sample(GENRES, rnd.randint(1, 3)))}
+            for i in range(1, rows + 1)]
+
+
+def super_hero_records(rows: int, seed: int = 0) -> list[dict[str, Any]]:
+    """ as sent by the backend, i.e. awards is a list """
+    rnd: random.Random = random.Random(seed)
+    return [{"superHeroId": f"hero{i}", "name": f"Hero {i}", "imdbLink": f"https://www.imdb.com/name/nm{i:07d}/",
+             "awards": rnd.sample(AWARDS, rnd.randint(1, 3))}
+            for i in range(1, rows + 1)]
+
+
+def measure(func: Callable[[], Any], repeat: int = 3) -> float:
+    """ best of repeat runs, in seconds """
+    timings: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
@@ -4,7 +4,9 @@ from pathlib import Path
 
 from streamlit.logger import get_logger
 
+from core.metrics import Metrics, MetricsSettings
 from core.model_config import ModelConfig
+from core.persistence import Persistence
 from util import Util
 
 PROJECT_ROOT_DIR: Path = Path(__file__).parent
@@ -52,6 +54,14 @@ class ConfigParser:
         if not model_configs:
             raise RuntimeError(f"No child configs found in '{child_config_directory}'")
 
+        for cache, cache_config_key in ((Persistence.table_cache, "table_cache"),
+                                        (Persistence.audit_cache, "audit_cache")):
+            cache_config: dict = config.get(cache_config_key, dict())
+            cache.configure(ttl_seconds=cache_config.get("ttl_seconds", None),
+                            max_size=cache_config.get("max_size_mb", 0) * 1024 * 1024 or None)
+
+        Metrics.configure(MetricsSettings.from_dict(config.get("metrics", None)))
+
         cls.configs = model_configs
         cls.config_file_path = parent_config_file_path
         return model_configs
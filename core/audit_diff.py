@@ -0,0 +1,106 @@
+from functools import partial
+from typing import Any, Callable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.io.formats.style import Styler
+
+from util import Util
+
+
+class AuditDiff:
+    """
+    Changes between the consecutive versions of each id in audit rows, i.e. which fields were changed by a version
+    - computed column by column (each column against itself shifted by a row), so it is fast for thousands of versions
+    - all the fields of the first version of an id are changed, and a missing value changed to a missing one is not
+    """
+
+    VERSION: str = "version"
+    OPERATION: str = "operation"
+    MAX_STYLED_CELLS: int = 200_000
+
+    @staticmethod
+    def sort(df: pd.DataFrame, id_fields: tuple[str, ...]) -> pd.DataFrame:
+        """ by id and then version, i.e. the order expected by get_changed """
+        columns: list[str] = [column for column in id_fields + (AuditDiff.VERSION,) if column in df.columns]
+        return df.sort_values(by=columns, kind="stable", ignore_index=True)
+
+    @staticmethod
+    def get_changed(df: pd.DataFrame, id_fields: tuple[str, ...]) -> pd.DataFrame:
+        """ True for the changed fields of each row (in the same shape as df), df is expected to be sorted, see sort """
+        is_first: np.ndarray = np.ones(df.shape[0], dtype=bool)
+        if df.shape[0] > 1:
+            is_same_id: np.ndarray = np.ones(df.shape[0] - 1, dtype=bool)
+            for id_field in id_fields:
+                ids: np.ndarray = df[id_field].to_numpy()
+                is_same_id &= ids[1:] == ids[:-1]
+            is_first[1:] = ~is_same_id
+
+        changed: dict[str, np.ndarray] = {}
+        for column in df.columns:
+            if column in id_fields or column in (AuditDiff.VERSION, AuditDiff.OPERATION):
+                changed[column] = np.zeros(df.shape[0], dtype=bool)
+                continue
+
+            values: pd.Series = df[column]
+            previous: pd.Series = values.shift(1)
+            is_missing: np.ndarray = (values.isna() & previous.isna()).to_numpy()
+            changed[column] = ((values != previous).fillna(True).to_numpy(dtype=bool) & ~is_missing) | is_first
+
+        return pd.DataFrame(changed, index=df.index)
+
+    @staticmethod
+    def get_view(df: pd.DataFrame, id_fields: tuple[str, ...],
+                 column_config: Optional[Mapping[str, Any]] = None) -> pd.DataFrame | Styler:
+        """
+        Only the changed fields of each version, colored by its operation (see Util.STATE_COLOR_MAP), while ids,
+        versions and operations are always shown
+        - dtypes are retained, i.e. a hidden field is missing (NaN or NA), and int columns are nullable (Int64)
+        - styling is per cell (and slow to render), so a frame of more than MAX_STYLED_CELLS is not colored
+        - a Styler's display values replace the formats of column_config, hence these are applied by the Styler itself
+        """
+        df = AuditDiff.sort(df, id_fields)
+        changed: pd.DataFrame = AuditDiff.get_changed(df, id_fields)
+        is_shown: pd.DataFrame = changed.copy()
+        for column in id_fields + (AuditDiff.VERSION, AuditDiff.OPERATION):
+            if column in is_shown.columns:
+                is_shown[column] = True
+
+        view_df: pd.DataFrame = df.astype({column: "Int64" for column, dtype in df.dtypes.items()
+                                           if pd.api.types.is_integer_dtype(dtype)}).where(is_shown)
+        if df.size > AuditDiff.MAX_STYLED_CELLS:
+            return view_df
+
+        colors: np.ndarray = np.full(df.shape[0], "", dtype=object)
+        if AuditDiff.OPERATION in df.columns:
+            operations: pd.Series = df[AuditDiff.OPERATION].astype(str)
+            for operation, color in Util.STATE_COLOR_MAP.items():
+                colors[(operations == operation.value).to_numpy()] = f"color: {color}"
+
+        styles: np.ndarray = np.where(changed.to_numpy(), colors[:, np.newaxis], "")
+        if AuditDiff.OPERATION in df.columns:
+            styles[:, df.columns.get_loc(AuditDiff.OPERATION)] = colors
+
+        return view_df.style.format(AuditDiff._get_formats(view_df, column_config), na_rep="").apply(
+            lambda _: pd.DataFrame(styles, index=df.index, columns=df.columns), axis=None)
+
+    @staticmethod
+    def _get_formats(df: pd.DataFrame, column_config: Optional[Mapping[str, Any]]) -> dict[str, Callable[[Any], str]]:
+        """ printf-style formats (e.g. %.1f) of the number columns, and the shortest repr for other float columns """
+        formats: dict[str, Callable[[Any], str]] = {}
+        for column, dtype in df.dtypes.items():
+            config: Any = (column_config or {}).get(column, None)
+            number_format: Optional[str] = config.get("type_config", {}).get("format", None) \
+                if isinstance(config, dict) else None
+            if number_format and number_format.startswith("%"):
+                formats[column] = partial(AuditDiff._format, number_format)
+            elif pd.api.types.is_float_dtype(dtype):
+                formats[column] = lambda value: str(float(value))
+        return formats
+
+    @staticmethod
+    def _format(number_format: str, value: Any) -> str:
+        try:
+            return number_format % value
+        except (TypeError, ValueError):
+            return str(value)
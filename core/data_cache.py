@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+import pandas as pd
+from streamlit.logger import get_logger
+
+logger = get_logger(__name__.split('.')[-1])
+
+
+@dataclass
+class CacheEntry:
+    df: pd.DataFrame
+    size: int  # in bytes
+    expires_at: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # because of the memory budget
+    expirations: int = 0  # because of the ttl
+    invalidations: int = 0
+    entries: int = 0
+    size: int = 0  # in bytes
+    max_size: int = 0  # in bytes
+
+    @property
+    def hit_ratio(self) -> float:
+        total: int = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class DataCache:
+    """
+    A thread safe, process wide cache of DataFrames with:
+    - ttl: an entry is not served once it is older than ttl_seconds
+    - memory budget: least recently used entries are evicted once total size (deep) exceeds max_size
+    Keys are expected to be tuples starting with the model name, e.g. (model, url), so that all entries
+    of a model (or just a part of it) can be invalidated together, see invalidate
+
+    The cached DataFrames are shared across streamlit sessions, hence these must be treated as read only
+    """
+
+    def __init__(self, name: str, ttl_seconds: float = 60.0, max_size: int = 256 * 1024 * 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name: str = name
+        self._ttl_seconds: float = ttl_seconds
+        self._max_size: int = max_size
+        self._clock: Callable[[], float] = clock
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._size: int = 0
+        self._stats: CacheStats = CacheStats()
+
+    def configure(self, ttl_seconds: Optional[float] = None, max_size: Optional[int] = None) -> None:
+        with self._lock:
+            self._ttl_seconds = self._ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+            self._max_size = self._max_size if max_size is None else int(max_size)
+            self._evict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_size > 0
+
+    def get(self, key: tuple[Hashable, ...]) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry: Optional[CacheEntry] = self._entries.get(key, None)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.df
+
+    def __contains__(self, key: tuple[Hashable, ...]) -> bool:
+        """ Unlike get, it neither updates the stats nor the recency of the entry """
+        with self._lock:
+            entry: Optional[CacheEntry] = self._entries.get(key, None)
+            return entry is not None and entry.expires_at > self._clock()
+
+    def put(self, key: tuple[Hashable, ...], df: pd.DataFrame) -> None:
+        if not self.enabled:
+            return
+
+        size: int = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if size > self._max_size:
+                logger.warning(f'[{self.name}] not caching {key}, its size [{size}] is more than the budget')
+                self._remove(key)  # any old entry is stale anyway
+                return
+
+            self._remove(key)
+            self._entries[key] = CacheEntry(df=df, size=size, expires_at=self._clock() + self._ttl_seconds)
+            self._size += size
+            self._evict()
+
+    def invalidate(self, *key_prefix: Hashable) -> int:
+        """ Removes all the entries whose key starts with key_prefix (or everything if there is no prefix) """
+        with self._lock:
+            keys: list[tuple] = [key for key in self._entries.keys() if key[:len(key_prefix)] == key_prefix]
+            for key in keys:
+                self._remove(key)
+
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._stats.hits, misses=self._stats.misses, evictions=self._stats.evictions,
+                              expirations=self._stats.expirations, invalidations=self._stats.invalidations,
+                              entries=len(self._entries), size=self._size, max_size=self._max_size)
+
+    def clear(self) -> None:
+        """ Removes all entries and resets the stats, mostly helpful for testing """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._stats = CacheStats()
+
+    def _remove(self, key: tuple) -> None:
+        """ Expected to be called with lock held """
+        entry: Optional[CacheEntry] = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _evict(self) -> None:
+        """ Expected to be called with lock held """
+        while self._size > self._max_size and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self._stats.evictions += 1
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}'
+                f'(name={self.name}, ttl_seconds={self._ttl_seconds}, max_size={self._max_size})')
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.editor_meta_data import EditorMetaDataMap
+from core.model_config import ModelConfig
+from enums import Operation
+
+
+@dataclass(frozen=True)
+class WindowSettings:
+    """
+    Read from [editor] section of the child config, e.g.
+        window_size = 5000  # rows in the editor at a time, 0 (default) means the whole table is in the editor
+    """
+    window_size: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_size > 0
+
+    @classmethod
+    def from_dict(cls, editor_dict: Optional[dict[str, Any]]) -> WindowSettings:
+        editor_dict = editor_dict if editor_dict else {}
+        return WindowSettings(window_size=max(0, int(editor_dict.get("window_size", cls().window_size))))
+
+    @classmethod
+    def from_config(cls, config: ModelConfig) -> WindowSettings:
+        return cls.from_dict(config.config.get("editor", None))
+
+
+class EditWindow:
+    """
+    A window (i.e. a page) of the rows of a table in the editor, while the whole table stays in the session
+    - positions of the editor (i.e. in the window) are mapped to positions in the table, and the edits of a window are
+    kept (as pending edits) when another window is opened, so that edits of all the windows are a single change set
+        -- hence, UpdateCalculator works on the whole table, with the editor data of all the windows
+    - a window shows its pending edits, but not its pending deleted rows, and the added rows are not shown at all
+    - pending edits are of one table (i.e. positions in it), and are dropped with it, see for_table
+    """
+
+    def __init__(self, df: pd.DataFrame, size: int):
+        self.size: int = size
+        self.start: int = 0
+        self._table_ref: weakref.ref = weakref.ref(df)
+        self._edited: dict[int, dict[str, Any]] = {}
+        self._deleted: set[int] = set()
+        self._added: list[dict[str, Any]] = []
+        self._positions: np.ndarray = np.arange(0)
+        self.set_start(df, 0)
+
+    @staticmethod
+    def for_table(window: Optional[EditWindow], df: pd.DataFrame, size: int) -> EditWindow:
+        """ window itself if it is of df (and of the same size), a new one otherwise """
+        if window is not None and window._table_ref() is df and window.size == size:
+            return window
+        return EditWindow(df, size)
+
+    @property
+    def row_count(self) -> int:
+        """ rows of the table in this window, i.e. without the pending deleted rows """
+        return len(self._positions)
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._edited or self._deleted or self._added)
+
+    def get_window_count(self, df: pd.DataFrame) -> int:
+        return max(1, -(-df.shape[0] // self.size))
+
+    def set_start(self, df: pd.DataFrame, start: int) -> None:
+        self.start = min(max(0, start), (self.get_window_count(df) - 1) * self.size)
+        positions: np.ndarray = np.arange(self.start, min(self.start + self.size, df.shape[0]))
+        self._positions = positions[~np.isin(positions, list(self._deleted))] if self._deleted else positions
+
+    def move(self, df: pd.DataFrame, start: int, editor_data: Optional[dict[str, Any]]) -> None:
+        """ keeps the edits of the current window (i.e. editor_data) as pending edits, and opens the one at start """
+        self._added = self.get_editor_data(Operation.New, editor_data)
+        self._edited = self.get_editor_data(Operation.Edited, editor_data)
+        self._deleted = set(self.get_editor_data(Operation.Deleted, editor_data))
+        self.set_start(df, start)
+
+    def get_window_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        """ rows of the window with their pending edits, df is expected to be the table (in editor dtypes) """
+        window_df: pd.DataFrame = df.iloc[self._positions].reset_index(drop=True)
+        if not self._edited:
+            return window_df
+
+        for window_position, position in enumerate(self._positions.tolist()):
+            for column, value in self._edited.get(position, {}).items():
+                if column in window_df.columns:
+                    window_df.at[window_position, column] = value
+        return window_df
+
+    def get_editor_data(self, operation: Operation, editor_data: Optional[dict[str, Any]]) -> Any:
+        """
+        Editor data (in streamlit's format) of all the windows, i.e. with positions in the table, where editor_data is
+        of the current window (as in streamlit.session_state)
+        - edits of a deleted row are dropped, as the row is deleted anyway
+        """
+        window_data: Any = (editor_data or {}).get(EditorMetaDataMap[operation].operation_key,
+                                                   EditorMetaDataMap[operation].default_value)
+        if operation == Operation.New:
+            return self._added + list(window_data)
+
+        deleted: set[int] = self._deleted.union([self._to_position(position) for position in
+                                                 (editor_data or {}).get(EditorMetaDataMap[Operation.Deleted]
+                                                                         .operation_key, [])])
+        if operation == Operation.Deleted:
+            return sorted(deleted)
+
+        edited: dict[int, dict[str, Any]] = {position: dict(changes) for position, changes in self._edited.items()}
+        for window_position, changes in window_data.items():
+            position: int = self._to_position(window_position)
+            edited[position] = dict(edited.get(position, {}), **changes)
+        return {position: edited[position] for position in sorted(edited.keys()) if position not in deleted}
+
+    def _to_position(self, window_position: int | str) -> int:
+        return int(self._positions[int(window_position)])
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import pandas as pd
+from streamlit.logger import get_logger
+
+from core.model_config import ModelConfig
+from core.response_data import ResponseData
+from core.table_compactor import TableCompactor
+from enums import EndPoint, Operation
+
+logger = get_logger(__name__.split('.')[-1])
+
+
+class IncrementalSync:
+    """
+    Instead of reloading the whole table, it fetches only the rows changed since the last seen version and merges
+    those into the table. It is enabled if the child config has [apis.model_changes] section, e.g.
+        [apis.model_changes]
+        get = "/movies-changes/"
+    - {get}{version}/ is expected to return the audit rows (i.e. model_audit_class) of all the changes made after
+    the version, and version is expected to be a global sequence of changes, i.e. without any gaps
+    - {get}latest/ is expected to return the audit row of the latest change (or nothing if there is no change yet)
+
+    Version of a table is kept in its DataFrame.attrs, as the same DataFrame might be shared by multiple sessions
+    """
+
+    VERSION_ATTR: str = "sync_version"
+    VERSION_FIELD: str = "version"
+    OPERATION_FIELD: str = "operation"
+
+    @staticmethod
+    def is_enabled(config: ModelConfig) -> bool:
+        return "model_changes" in config.config["apis"]
+
+    @staticmethod
+    def get_version(df: Optional[pd.DataFrame]) -> Optional[int]:
+        return None if df is None else df.attrs.get(IncrementalSync.VERSION_ATTR, None)
+
+    @staticmethod
+    def set_version(df: pd.DataFrame, version: Optional[int]) -> pd.DataFrame:
+        if version is not None:
+            df.attrs[IncrementalSync.VERSION_ATTR] = version
+        return df
+
+    @staticmethod
+    def get_head_version(config: ModelConfig) -> Optional[int]:
+        """ version of the latest change, 0 if there isn't any change yet and None if it couldn't be fetched """
+        response_data: ResponseData = IncrementalSync._get_changes_impl(config, "latest")
+        if not response_data.is_status_ok:
+            logger.warning(f'Could not fetch the latest version of [{config.name}]: {response_data.error_msg}')
+            return None
+
+        if not response_data.is_valid():
+            return 0  # i.e. No Data
+
+        if IncrementalSync.VERSION_FIELD not in response_data.df.columns:
+            logger.warning(f'Latest change of [{config.name}] does not have [{IncrementalSync.VERSION_FIELD}]')
+            return None
+
+        return int(response_data.df[IncrementalSync.VERSION_FIELD].max())
+
+    @staticmethod
+    def sync(config: ModelConfig, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """ Returns a new DataFrame (with the latest version) or None if the table must be reloaded instead """
+        version: Optional[int] = IncrementalSync.get_version(df)
+        if version is None:
+            return None
+
+        response_data: ResponseData = IncrementalSync._get_changes_impl(config, str(version))
+        if not response_data.is_status_ok:
+            logger.warning(f'Could not fetch the changes of [{config.name}]: {response_data.error_msg}')
+            return None
+
+        if not response_data.is_valid():
+            return df  # i.e. No Data, so nothing has changed
+
+        return IncrementalSync.merge(df, response_data.df, config.model_class.get_meta_data().id_fields, version)
+
+    @staticmethod
+    def merge(df: pd.DataFrame, changes: pd.DataFrame, id_fields: tuple[str, ...],
+              version: int) -> Optional[pd.DataFrame]:
+        """ Applies changes (made after version) to a copy of df, None if there is a gap in the changes """
+        changes = changes.sort_values(by=IncrementalSync.VERSION_FIELD, kind="stable")
+        versions: pd.Series = changes[IncrementalSync.VERSION_FIELD]
+        expected_versions: range = range(version + 1, version + 1 + changes.shape[0])
+        if not versions.astype("int64").reset_index(drop=True).equals(pd.Series(expected_versions, dtype="int64")):
+            logger.info(f'Found a gap in changes after version {version}, i.e. {versions.to_list()[:5]}...')
+            return None
+
+        # only the latest change of a row matters
+        latest: pd.DataFrame = changes.drop_duplicates(subset=list(id_fields), keep="last")
+        is_changed: pd.Series = IncrementalSync._is_in(df, latest, id_fields)
+        upserts: pd.DataFrame = latest.loc[latest[IncrementalSync.OPERATION_FIELD] != Operation.Deleted.value,
+                                           df.columns.to_list()]
+
+        merged: pd.DataFrame = pd.concat([df.loc[~is_changed], upserts], ignore_index=True)
+        merged = TableCompactor.conform_dtypes(merged, df.dtypes.to_dict())  # df might be compact
+        merged.sort_values(by=list(id_fields), ascending=True, inplace=True)
+        merged.reset_index(drop=True, inplace=True)
+        return IncrementalSync.set_version(merged, int(versions.iloc[-1]))
+
+    @staticmethod
+    def _is_in(df: pd.DataFrame, other: pd.DataFrame, id_fields: tuple[str, ...]) -> pd.Series:
+        if len(id_fields) == 1:
+            return df[id_fields[0]].isin(other[id_fields[0]])
+
+        keys: pd.MultiIndex = pd.MultiIndex.from_frame(other[list(id_fields)])
+        return pd.Series(pd.MultiIndex.from_frame(df[list(id_fields)]).isin(keys), index=df.index)
+
+    @staticmethod
+    def _get_changes_impl(config: ModelConfig, version: str) -> ResponseData:
+        url: str = f'{config.get_model_changes_end_point(EndPoint.Get)}{version}/'
+        return config.request_handler_class.handle_get(url=url, model_class=config.model_audit_class)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+import pandas as pd
+
+
+class KeyIndex:
+    """
+    Position of each row of a table by its key, i.e. value of the id field (or a tuple of values for a composite key)
+    - built once per DataFrame (see for_df), as tables are never modified in place (e.g. LocalWriteBack and
+    IncrementalSync create a new DataFrame), hence it remains consistent with the local updates
+    - keys are python scalars (e.g. int, not numpy.int64), so that 1 and np.int64(1) are the same key
+    """
+
+    _lock: threading.Lock = threading.Lock()
+    _indices: OrderedDict[tuple[int, tuple[str, ...]], tuple[weakref.ref, KeyIndex]] = OrderedDict()
+    max_indices: int = 16  # a few tables (and their versions) per process
+
+    def __init__(self, df: pd.DataFrame, id_fields: tuple[str, ...]):
+        self.id_fields: tuple[str, ...] = id_fields
+        self.size: int = df.shape[0]
+        self._positions: dict[Hashable, int] = {}
+        self.duplicates: list[Hashable] = []
+
+        for position, key in enumerate(self.get_keys(df, id_fields)):
+            if key in self._positions:
+                self.duplicates.append(key)
+            else:
+                self._positions[key] = position
+
+    @classmethod
+    def for_df(cls, df: pd.DataFrame, id_fields: tuple[str, ...]) -> KeyIndex:
+        """ the index of df, which is built only if df doesn't have one already (or it has changed in size) """
+        cache_key: tuple[int, tuple[str, ...]] = (id(df), id_fields)
+        with cls._lock:
+            df_ref, index = cls._indices.get(cache_key, (None, None))
+            if df_ref is not None and df_ref() is df and index.size == df.shape[0]:
+                cls._indices.move_to_end(cache_key)
+                return index
+
+        index = KeyIndex(df, id_fields)
+        with cls._lock:
+            cls._indices[cache_key] = (weakref.ref(df), index)
+            while len(cls._indices) > cls.max_indices:
+                cls._indices.popitem(last=False)
+
+        return index
+
+    @staticmethod
+    def get_keys(df: pd.DataFrame, id_fields: tuple[str, ...]) -> list[Hashable]:
+        if len(id_fields) == 1:
+            return df[id_fields[0]].tolist()
+
+        return list(zip(*[df[id_field].tolist() for id_field in id_fields]))
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def get_position(self, key: Hashable) -> Optional[int]:
+        """ position (i.e. for iloc) of the row with the key, None if there isn't any """
+        return self._positions.get(key, None)
+
+    def get_row(self, df: pd.DataFrame, key: Hashable) -> Optional[pd.Series]:
+        """ df is expected to be the same DataFrame which the index was built for """
+        position: Optional[int] = self.get_position(key)
+        return None if position is None else df.iloc[position]
+
+    def find_duplicates(self, df: pd.DataFrame, released_keys: Iterable[Hashable] = ()) -> list[Hashable]:
+        """
+        Keys of the rows of df (e.g. new rows) which either repeat within df or already exist in the table
+        - released_keys are not considered existing, e.g. keys of rows being deleted along with these new rows
+        """
+        released: set = set(released_keys)
+        seen: set = set()
+        duplicates: dict[Hashable, None] = {}
+        for key in self.get_keys(df, self.id_fields):
+            if key in seen or (key in self._positions and key not in released):
+                duplicates[key] = None
+            seen.add(key)
+
+        return list(duplicates.keys())
+
+    def parse_key(self, df: pd.DataFrame, text: str) -> Optional[Hashable]:
+        """ key from a user input, e.g. '12' for an int id, values of a composite key are separated by ',' """
+        values: list[str] = [value.strip() for value in text.split(',')] if len(self.id_fields) > 1 else [text.strip()]
+        if len(values) != len(self.id_fields):
+            return None
+
+        try:
+            key: list[Any] = [self._parse_value(df[id_field].dtype, value) for id_field, value in
+                              zip(self.id_fields, values)]
+        except ValueError:
+            return None
+
+        return key[0] if len(key) == 1 else tuple(key)
+
+    @staticmethod
+    def _parse_value(dtype: Any, value: str) -> Any:
+        if pd.api.types.is_integer_dtype(dtype):
+            return int(value)
+
+        if pd.api.types.is_float_dtype(dtype):
+            return float(value)
+
+        return value
+
+    @classmethod
+    def clear(cls) -> None:
+        """ mostly helpful for testing """
+        with cls._lock:
+            cls._indices.clear()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import pandas as pd
+
+from core.table_compactor import TableCompactor
+from enums import Operation, State
+from util import Util
+
+
+class LocalWriteBack:
+    """
+    Once the changes (as calculated by UpdateCalculator) are persisted, the same changes are applied to the table
+    which the session already has, instead of fetching the whole table again
+    - rows of old state of edited rows and deleted rows are dropped (so editing an id works too)
+    - new state of edited rows and new rows are appended
+    - and then rows are sorted by id, same as Persistence._get_data_impl
+    It is only correct if all the changes have been persisted, and it can't know about changes made by others
+    """
+
+    @staticmethod
+    def apply(df: pd.DataFrame, changed_data: dict[Operation, pd.DataFrame], id_fields: tuple[str, ...]) \
+            -> pd.DataFrame:
+        """ df is not modified (as it might be shared), instead a new DataFrame is returned """
+        removed: list[pd.DataFrame] = []
+        added: list[pd.DataFrame] = []
+
+        edited_df: Optional[pd.DataFrame] = changed_data.get(Operation.Edited, None)
+        if not Util.is_none_or_empty_df(edited_df):
+            removed.append(edited_df.loc[edited_df[Util.STATE_STR] == State.Old.value, list(id_fields)])
+            added.append(edited_df.loc[edited_df[Util.STATE_STR] == State.New.value])
+
+        deleted_df: Optional[pd.DataFrame] = changed_data.get(Operation.Deleted, None)
+        if not Util.is_none_or_empty_df(deleted_df):
+            removed.append(deleted_df[list(id_fields)])
+
+        new_df: Optional[pd.DataFrame] = changed_data.get(Operation.New, None)
+        if not Util.is_none_or_empty_df(new_df):
+            added.append(new_df)
+
+        kept_df: pd.DataFrame = df.loc[~LocalWriteBack._is_in(df, removed, id_fields)] if removed else df
+        added_df: list[pd.DataFrame] = [added_df.reindex(columns=df.columns) for added_df in added]
+
+        # same dtypes as df (where possible), e.g. editor might have changed ints to floats, or df might be compact
+        result: pd.DataFrame = TableCompactor.conform_dtypes(pd.concat([kept_df] + added_df, ignore_index=True),
+                                                             df.dtypes.to_dict())
+        result.sort_values(by=list(id_fields), ascending=True, inplace=True)
+        result.reset_index(drop=True, inplace=True)
+        result.attrs = dict(df.attrs)  # e.g. version of the table, see IncrementalSync
+        return result
+
+    @staticmethod
+    def _is_in(df: pd.DataFrame, removed: list[pd.DataFrame], id_fields: tuple[str, ...]) -> pd.Series:
+        removed_df: pd.DataFrame = pd.concat(removed, ignore_index=True)
+        if len(id_fields) == 1:
+            return df[id_fields[0]].isin(removed_df[id_fields[0]])
+
+        keys: pd.MultiIndex = pd.MultiIndex.from_frame(removed_df[list(id_fields)])
+        return pd.Series(pd.MultiIndex.from_frame(df[list(id_fields)]).isin(keys), index=df.index)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, Optional
+from urllib.parse import urlsplit
+
+from streamlit.logger import get_logger
+
+logger = get_logger(__name__.split('.')[-1])
+
+# upper bounds of the buckets, the last (implicit) bucket is +Inf
+SECONDS_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS: tuple[float, ...] = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)  # not cumulative, one more than buckets (for +Inf)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        self.counts = self.counts or [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def get_quantile(self, quantile: float) -> Optional[float]:
+        """ upper bound of the bucket containing the quantile, i.e. an estimate (same as Prometheus, roughly) """
+        if not self.count:
+            return None
+
+        rank: float = quantile * self.count
+        cumulative: int = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+@dataclass(frozen=True)
+class MetricsSettings:
+    """
+    Read from [metrics] section of config.toml, e.g.
+        enabled = true  # disabled by default, then recording a metric is just a boolean check
+        export_file = "metrics.prom"  # Prometheus text format, rewritten at most every export_interval_seconds
+        export_interval_seconds = 10
+        port = 9100  # to serve the Prometheus text on http://localhost:<port>/metrics, 0 (default) means no server
+    """
+    enabled: bool = False
+    export_file: str = ""
+    export_interval_seconds: float = 10.0
+    port: int = 0
+
+    @classmethod
+    def from_dict(cls, metrics_dict: Optional[dict[str, Any]]) -> MetricsSettings:
+        metrics_dict = metrics_dict if metrics_dict else {}
+        default: MetricsSettings = cls()
+        return MetricsSettings(enabled=bool(metrics_dict.get("enabled", default.enabled)),
+                               export_file=str(metrics_dict.get("export_file", default.export_file)),
+                               export_interval_seconds=float(metrics_dict.get("export_interval_seconds",
+                                                                              default.export_interval_seconds)),
+                               port=int(metrics_dict.get("port", default.port)))
+
+
+class Metrics:
+    """
+    A process wide (i.e. shared by all the streamlit sessions) registry of counters and histograms, e.g.
+        Metrics.inc("persist_rows_total", 10, model="movies", operation="New")
+        with Metrics.timer("table_view_seconds", model="movies"):
+            ...
+    - metrics are identified by name and labels, names follow Prometheus conventions (e.g. _total, _seconds)
+    - if disabled (default), nothing is recorded and timer doesn't even read the clock
+    - endpoint labels are the registered end points (see register_end_point), so that ids in urls don't create
+    a metric for every id
+    """
+
+    _lock: threading.Lock = threading.Lock()
+    _settings: MetricsSettings = MetricsSettings()
+    enabled: bool = False
+    _counters: dict[tuple[str, Labels], float] = {}
+    _histograms: dict[tuple[str, Labels], Histogram] = {}
+    _end_points: list[str] = []
+    _last_export: float = 0.0
+    _server: Optional[ThreadingHTTPServer] = None
+
+    @classmethod
+    def configure(cls, settings: MetricsSettings) -> None:
+        with cls._lock:
+            cls._settings = settings
+            cls.enabled = settings.enabled
+
+        if settings.enabled and settings.port:
+            cls._start_server(settings.port)
+
+    @classmethod
+    def register_end_point(cls, url: str) -> None:
+        path: str = urlsplit(url).path
+        with cls._lock:
+            if path not in cls._end_points:
+                cls._end_points = sorted(cls._end_points + [path], key=len, reverse=True)
+
+    @classmethod
+    def get_end_point(cls, url: str) -> str:
+        """ the longest registered end point which the url starts with, otherwise the path of the url """
+        path: str = urlsplit(url).path
+        for end_point in cls._end_points:
+            if path.startswith(end_point):
+                return end_point
+        return path
+
+    @classmethod
+    def inc(cls, name: str, value: float = 1, **labels: Any) -> None:
+        if not cls.enabled:
+            return
+
+        key: tuple[str, Labels] = (name, cls._to_labels(labels))
+        with cls._lock:
+            cls._counters[key] = cls._counters.get(key, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, value: float, buckets: tuple[float, ...] = SECONDS_BUCKETS, **labels: Any) -> None:
+        if not cls.enabled:
+            return
+
+        key: tuple[str, Labels] = (name, cls._to_labels(labels))
+        with cls._lock:
+            histogram: Optional[Histogram] = cls._histograms.get(key, None)
+            if histogram is None:
+                histogram = cls._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @classmethod
+    def timer(cls, name: str, **labels: Any) -> ContextManager:
+        """ observes the time taken (in seconds) by the block, even if it raises """
+        if not cls.enabled:
+            return contextlib.nullcontext()
+        return cls._timer(name, labels)
+
+    @classmethod
+    @contextlib.contextmanager
+    def _timer(cls, name: str, labels: dict[str, Any]) -> Iterator[None]:
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.observe(name, time.perf_counter() - start, **labels)
+
+    @classmethod
+    def get_counters(cls) -> dict[tuple[str, Labels], float]:
+        with cls._lock:
+            return dict(cls._counters)
+
+    @classmethod
+    def get_histograms(cls) -> dict[tuple[str, Labels], Histogram]:
+        with cls._lock:
+            return {key: Histogram(h.buckets, list(h.counts), h.total, h.count) for key, h in cls._histograms.items()}
+
+    @classmethod
+    def to_prometheus(cls) -> str:
+        """ in Prometheus text exposition format """
+        lines: list[str] = []
+        counters: dict[tuple[str, Labels], float] = cls.get_counters()
+        for name in sorted(dict.fromkeys([name for name, _ in counters.keys()])):
+            lines.append(f'# TYPE {name} counter')
+            lines += [f'{name}{cls._format_labels(labels)} {value:g}'
+                      for (metric, labels), value in sorted(counters.items()) if metric == name]
+
+        histograms: dict[tuple[str, Labels], Histogram] = cls.get_histograms()
+        for name in sorted(dict.fromkeys([name for name, _ in histograms.keys()])):
+            lines.append(f'# TYPE {name} histogram')
+            for (metric, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+                if metric != name:
+                    continue
+
+                cumulative: int = 0
+                for bound, count in zip(list(histogram.buckets) + [float("inf")], histogram.counts):
+                    cumulative += count
+                    le: str = "+Inf" if bound == float("inf") else f'{bound:g}'
+                    lines.append(f'{name}_bucket{cls._format_labels(labels + (("le", le),))} {cumulative}')
+                lines.append(f'{name}_sum{cls._format_labels(labels)} {histogram.total:g}')
+                lines.append(f'{name}_count{cls._format_labels(labels)} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def export(cls, force: bool = False) -> None:
+        """ writes the Prometheus text to export_file (if configured), but not more often than configured """
+        settings: MetricsSettings = cls._settings
+        if not cls.enabled or not settings.export_file:
+            return
+
+        now: float = time.monotonic()
+        with cls._lock:
+            if not force and now - cls._last_export < settings.export_interval_seconds:
+                return
+            cls._last_export = now
+
+        path: Path = Path(settings.export_file)
+        temp_path: Path = path.with_name(f'{path.name}.tmp')
+        temp_path.write_text(cls.to_prometheus())
+        temp_path.replace(path)  # so that a scraper never reads a partially written file
+
+    @classmethod
+    def reset(cls) -> None:
+        """ Removes all the recorded metrics, but retains the settings and the end points """
+        with cls._lock:
+            cls._counters = {}
+            cls._histograms = {}
+
+    @classmethod
+    def _start_server(cls, port: int) -> None:
+        with cls._lock:
+            if cls._server is not None:
+                return
+            try:
+                cls._server = ThreadingHTTPServer(("localhost", port), _MetricsRequestHandler)
+            except OSError as err:
+                logger.warning(f'Could not serve metrics on port {port}: {err}')
+                return
+
+        threading.Thread(target=cls._server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f'Serving metrics on http://localhost:{port}/metrics')
+
+    @staticmethod
+    def _to_labels(labels: dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format_labels(labels: Labels) -> str:
+        if not labels:
+            return ''
+        escaped: list[str] = [f'{key}="{Metrics._escape(value)}"' for key, value in labels]
+        return '{' + ','.join(escaped) + '}'
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/metrics":
+            self.send_error(404)
+            return
+
+        content: bytes = Metrics.to_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # scraped every few seconds, so not worth logging
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import importlib
 import tomllib
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Type, Union
 
 from base.model import Model
 from base.model_list import ModelList
 from base.request_handler import RequestHandler
+from core.metrics import Metrics
+from core.session_pool import PoolSettings, SessionPool
 from enums import EndPoint
 
 
@@ -15,6 +18,8 @@ class ModelConfig:
     """
     A config class which is expected have to all the config details for a particular model.
     - if there are multiple models, then there is expected to be multiple instances of this class
+    - classes (model, model list, audit and request handler) are imported on first use, so that reading the configs
+    (e.g. to build the navigation) stays cheap, however many models there are
     """
 
     def __init__(self, filepath: Path, base_config: dict):
@@ -32,12 +37,34 @@ class ModelConfig:
 
         self.name = self.config.get("name", None)
 
-        self.model_class: Type[Model] = self._get_class_impl("model", Model)
-        self.model_list_class: Type[ModelList] = self._get_class_impl("model_list", ModelList)
-        self.model_audit_class: Type[Model] = self._get_class_impl("model_audit", Model)
-        self.request_handler_class: Type[RequestHandler] = self._get_class_impl("request", RequestHandler)
         self.host: str = self.config["apis"]["host"]
         self.port: int = self.config["apis"]["port"]
+        self.pool_settings: PoolSettings = PoolSettings.from_dict(self.config["apis"])
+        SessionPool.configure(f'{self.host}:{self.port}', self.pool_settings)
+        self._register_end_points()
+
+    def _register_end_points(self) -> None:
+        """ so that the metrics of requests are labelled by these, instead of the full urls (see Metrics) """
+        for group in ("model", "model_audit", "model_changes"):
+            for end_point in EndPoint:
+                if end_point.value in self.config["apis"].get(group, {}):
+                    Metrics.register_end_point(self._get_end_point_impl(group, end_point))
+
+    @cached_property
+    def model_class(self) -> Type[Model]:
+        return self._get_class_impl("model", Model)
+
+    @cached_property
+    def model_list_class(self) -> Type[ModelList]:
+        return self._get_class_impl("model_list", ModelList)
+
+    @cached_property
+    def model_audit_class(self) -> Type[Model]:
+        return self._get_class_impl("model_audit", Model)
+
+    @cached_property
+    def request_handler_class(self) -> Type[RequestHandler]:
+        return self._get_class_impl("request", RequestHandler)
 
     def get_value(self, key: str) -> Any:
         return self.config.get(key, None)
@@ -52,6 +79,9 @@ class ModelConfig:
     def get_model_end_point(self, end_point: EndPoint) -> str:
         return self._get_end_point_impl("model", end_point)
 
+    def get_model_changes_end_point(self, end_point: EndPoint) -> str:
+        return self._get_end_point_impl("model_changes", end_point)
+
     def _get_class_impl(self, group: str, class_type):
         module = importlib.import_module(self.config[group]["module"])
         model_class: Type[class_type] = getattr(module, self.config[group]["class"])
@@ -2,7 +2,9 @@ from typing import Any, Optional
 
 import pandas as pd
 
+from core.edit_window import EditWindow
 from core.editor_meta_data import EditorMetaDataMap, EditorMetaData
+from core.snapshot_store import SnapshotRef, SnapshotStore
 from enums import ModelSessionDataEnum, Operation
 
 
@@ -19,12 +21,16 @@ class ModelSessionData:
     It is also important to maintain key as well
     - e.g. there could be multiple editor data, if key is not different, streamlit will raise warning and won't work
     - if corresponding key is changed, then streamlit reloads the data! It helps if changes are discarded from front end
+
+    Table data is a snapshot shared with the other sessions (see SnapshotStore), which is released once it is replaced
+    or cleared (or this is garbage collected along with the session)
     """
 
     def __init__(self, model: str, session_data: dict[str, Any]):
         self.model = model
         self._key_map: dict[ModelSessionDataEnum, str] = EditorMetaData.get_key_map(self.model)
         self._session_data: dict[str, Any] = {}
+        self._table_snapshot: Optional[SnapshotRef] = None
 
         # it is better to store this locally instead of referring to streamlit.session_data every time
         # - as it helps with testing
@@ -33,10 +39,20 @@ class ModelSessionData:
 
         self._st_session_state[self.model] = self._session_data
 
-    def update_data(self, key_enum: ModelSessionDataEnum, value: pd.DataFrame):
+    def update_data(self, key_enum: ModelSessionDataEnum, value: pd.DataFrame | EditWindow):
+        """ value is a DataFrame, except for WindowData (i.e. an EditWindow) """
+        if key_enum == ModelSessionDataEnum.TableData:
+            self._release_table_snapshot()
+            self._table_snapshot = SnapshotStore.acquire(self.model, value)
+
         self._session_data[self._key_map[key_enum]] = value
 
-    def get_data(self, key_enum: ModelSessionDataEnum) -> Optional[pd.DataFrame]:
+    def _release_table_snapshot(self) -> None:
+        if self._table_snapshot is not None:
+            self._table_snapshot.release()
+            self._table_snapshot = None
+
+    def get_data(self, key_enum: ModelSessionDataEnum) -> Optional[pd.DataFrame | EditWindow]:
         return self._session_data.get(self._key_map[key_enum], None)
 
     def change_key(self, key_enum: ModelSessionDataEnum) -> str:
@@ -49,10 +65,13 @@ class ModelSessionData:
     def get_key(self, key_enum: ModelSessionDataEnum) -> str:
         return self._key_map[key_enum]
 
+    def get_editor_state(self) -> Optional[dict[str, Any]]:
+        """ all the editor data, as maintained by streamlit """
+        return self._st_session_state.get(self._key_map[ModelSessionDataEnum.EditorData])
+
     def get_editor_data(self, operation: Operation) -> Any:
         m: EditorMetaData = EditorMetaDataMap[operation]
-        session_key: str = self._key_map[ModelSessionDataEnum.EditorData]
-        editor_data: dict[str, Any] = self._st_session_state.get(session_key)
+        editor_data: Optional[dict[str, Any]] = self.get_editor_state()
         if editor_data is None:
             return m.default_value  # this is helpful for testing
 
@@ -61,6 +80,7 @@ class ModelSessionData:
     def clear_data(self, key_enum: ModelSessionDataEnum = None) -> None:
         if key_enum:
             if key_enum == ModelSessionDataEnum.TableData:
+                self._release_table_snapshot()
                 self._session_data.pop(self._key_map[key_enum], None)
                 return
 
@@ -68,6 +88,7 @@ class ModelSessionData:
                 self._st_session_state.pop(self._key_map[key_enum], None)
                 return
 
+        self._release_table_snapshot()
         self._session_data.clear()
         self._st_session_state.clear()
 
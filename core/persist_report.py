@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pandas as pd
+
+from core.response_data import ResponseData
+from enums import Operation
+
+
+@dataclass
+class BatchResult:
+    """ Response of a batch of rows, which were sent to the backend in a single request """
+    batch: int  # 0 based sequence of the batch within the operation
+    df: pd.DataFrame  # rows of the batch, as sent (e.g. for edited rows, only the new state of rows)
+    response: ResponseData
+
+    @property
+    def is_status_ok(self) -> bool:
+        return self.response.is_status_ok
+
+
+@dataclass
+class PersistReport:
+    """
+    Outcome of persisting all the rows of an operation, which might have been sent in multiple batches
+    - is_status_ok and error_msg behave like ResponseData, i.e. these consider all the batches
+    - succeeded and failed batches can be inspected separately, e.g. to retry only the failed rows
+    """
+    operation: Operation
+    batches: list[BatchResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> list[BatchResult]:
+        return [batch for batch in self.batches if batch.is_status_ok]
+
+    @property
+    def failed(self) -> list[BatchResult]:
+        return [batch for batch in self.batches if not batch.is_status_ok]
+
+    @property
+    def is_status_ok(self) -> bool:
+        return all([batch.is_status_ok for batch in self.batches])
+
+    @property
+    def error_msg(self) -> Optional[str]:
+        """ distinct error messages of the failed batches """
+        error_msgs: dict[str, None] = dict.fromkeys([batch.response.error_msg for batch in self.failed])
+        return '; '.join([msg for msg in error_msgs.keys() if msg]) if error_msgs else None
+
+    @property
+    def failed_df(self) -> pd.DataFrame:
+        return self._concat(self.failed)
+
+    @property
+    def succeeded_df(self) -> pd.DataFrame:
+        return self._concat(self.succeeded)
+
+    def merge_retry(self, retry_report: PersistReport) -> PersistReport:
+        """ Returns a new report, in which results of failed batches are replaced by those of retry_report """
+        retried: dict[int, BatchResult] = {batch.batch: batch for batch in retry_report.batches}
+        return PersistReport(self.operation, [retried.get(batch.batch, batch) for batch in self.batches])
+
+    def _concat(self, batches: list[BatchResult]) -> pd.DataFrame:
+        if not batches:
+            return self.batches[0].df.iloc[0:0] if self.batches else pd.DataFrame()
+
+        return pd.concat([batch.df for batch in batches])
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}(operation={self.operation}, batches={len(self.batches)}, '
+                f'failed={len(self.failed)}, error_msg={self.error_msg})')
@@ -1,70 +1,318 @@
+from __future__ import annotations
+
 import json
-from typing import Type, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Type, Optional
+from urllib.parse import urlencode
 
 import pandas as pd
+import requests
+from streamlit.logger import get_logger
 
 from base.model import Model
 from base.model_list import ModelList
 from base.request_handler import RequestHandler
+from core.data_cache import DataCache
+from core.incremental_sync import IncrementalSync
+from core.metrics import Metrics
 from core.model_config import ModelConfig
+from core.persist_report import BatchResult, PersistReport
 from core.response_data import ResponseData
+from core.snapshot_store import SnapshotStore
+from core.table_compactor import TableCompactor
+from core.table_filter import TableFilter
 from enums import Operation, EndPoint, State
 from util import Util
 
+logger = get_logger(__name__.split('.')[-1])
+
+
+@dataclass(frozen=True)
+class PersistenceSettings:
+    """
+    Read from [persistence] section of the child config, e.g.
+        concurrent = true  # to run New/Edited/Deleted requests at the same time
+        ordering = "auto"  # one of "none", "deletes_first" and "auto"
+    - none: all the operations run at the same time
+    - deletes_first: deletes are persisted before the new and edited rows (which still run at the same time)
+    - auto: same as deletes_first, but only if a deleted key is being reused by new/edited rows
+    Large changes can be sent in batches (0 means everything in one request), e.g.
+        post_batch_size = 1000  # similarly, put_batch_size and delete_batch_size
+        max_parallel_batches = 4  # batches of an operation sent at the same time
+        max_retries = 1  # failed batches are retried these many times, by UpdateHandler
+    Once everything is saved, UpdateHandler applies the changes to the table of the session (see LocalWriteBack)
+        write_back = true  # otherwise the whole table is fetched again (unless it can be synced, see IncrementalSync)
+    """
+    concurrent: bool = False
+    ordering: str = "auto"
+    post_batch_size: int = 0
+    put_batch_size: int = 0
+    delete_batch_size: int = 0
+    max_parallel_batches: int = 4
+    max_retries: int = 1
+    write_back: bool = True
+
+    ORDERINGS = ("none", "deletes_first", "auto")
+
+    def __post_init__(self):
+        if self.ordering not in self.ORDERINGS:
+            raise ValueError(f'Unsupported ordering [{self.ordering}], expected one of {self.ORDERINGS}')
+
+    @classmethod
+    def from_dict(cls, persistence_dict: Optional[dict[str, Any]]) -> PersistenceSettings:
+        persistence_dict = persistence_dict if persistence_dict else {}
+        default: PersistenceSettings = cls()
+        return PersistenceSettings(
+            concurrent=bool(persistence_dict.get("concurrent", default.concurrent)),
+            ordering=str(persistence_dict.get("ordering", default.ordering)),
+            post_batch_size=int(persistence_dict.get("post_batch_size", default.post_batch_size)),
+            put_batch_size=int(persistence_dict.get("put_batch_size", default.put_batch_size)),
+            delete_batch_size=int(persistence_dict.get("delete_batch_size", default.delete_batch_size)),
+            max_parallel_batches=max(1, int(persistence_dict.get("max_parallel_batches",
+                                                                 default.max_parallel_batches))),
+            max_retries=max(0, int(persistence_dict.get("max_retries", default.max_retries))),
+            write_back=bool(persistence_dict.get("write_back", default.write_back)))
+
+    def get_batch_size(self, operation: Operation) -> int:
+        """ 0 means all the rows are sent in a single request """
+        return {Operation.New: self.post_batch_size, Operation.Edited: self.put_batch_size,
+                Operation.Deleted: self.delete_batch_size}[operation]
+
+
+@dataclass(frozen=True)
+class PagingSettings:
+    """
+    Read from [apis.model] section of the child config, e.g.
+        page_size = 5000  # 0 (default) means the whole table is fetched in a single request
+        page_param = "page"  # name of the query parameter for (0 based) page number
+        size_param = "size"  # name of the query parameter for page size
+        max_parallel_pages = 4  # at most these many pages are fetched at the same time
+        first_page_fast = true  # to render the first page while the remaining pages are being fetched
+    """
+    page_size: int = 0
+    page_param: str = "page"
+    size_param: str = "size"
+    max_parallel_pages: int = 4
+    first_page_fast: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.page_size > 0
+
+    @classmethod
+    def from_dict(cls, model_apis_dict: Optional[dict[str, Any]]) -> PagingSettings:
+        model_apis_dict = model_apis_dict if model_apis_dict else {}
+        default: PagingSettings = cls()
+        return PagingSettings(page_size=int(model_apis_dict.get("page_size", default.page_size)),
+                              page_param=str(model_apis_dict.get("page_param", default.page_param)),
+                              size_param=str(model_apis_dict.get("size_param", default.size_param)),
+                              max_parallel_pages=max(1, int(model_apis_dict.get("max_parallel_pages",
+                                                                                default.max_parallel_pages))),
+                              first_page_fast=bool(model_apis_dict.get("first_page_fast", default.first_page_fast)))
+
+    @classmethod
+    def from_config(cls, config: ModelConfig) -> PagingSettings:
+        return cls.from_dict(config.config["apis"].get("model", None))
+
+
+@dataclass(frozen=True)
+class AuditSettings:
+    """
+    Read from [apis.model_audit] section of the child config, for histories of multiple ids, e.g.
+        max_parallel_ids = 8  # histories (or batches of ids) fetched at the same time
+        batch_param = "ids"  # i.e. GET {get}?ids=1,2,3 returns their histories, "" (default) means a GET per id
+        batch_size = 100  # ids per batch request
+    """
+    max_parallel_ids: int = 8
+    batch_param: str = ""
+    batch_size: int = 100
+
+    @property
+    def is_batch(self) -> bool:
+        return bool(self.batch_param)
+
+    @classmethod
+    def from_dict(cls, audit_apis_dict: Optional[dict[str, Any]]) -> AuditSettings:
+        audit_apis_dict = audit_apis_dict if audit_apis_dict else {}
+        default: AuditSettings = cls()
+        return AuditSettings(max_parallel_ids=max(1, int(audit_apis_dict.get("max_parallel_ids",
+                                                                              default.max_parallel_ids))),
+                             batch_param=str(audit_apis_dict.get("batch_param", default.batch_param)),
+                             batch_size=max(1, int(audit_apis_dict.get("batch_size", default.batch_size))))
+
+    @classmethod
+    def from_config(cls, config: ModelConfig) -> AuditSettings:
+        return cls.from_dict(config.config["apis"].get("model_audit", None))
+
 
 class Persistence:
     """
     As the name suggests, it persists changes:
     - It converts the DataFrame to json objects and calls model specific RequestHandler to persist teh data
+    - if configured, the independent operations are persisted concurrently (see PersistenceSettings)
+    - if configured, rows of an operation are sent in (parallel) batches, and the outcome of each batch is reported
+    separately in PersistReport, so that failed batches can be retried (see retry_failed)
+    - time taken by each operation is available in timings (in seconds) after persist is called
+
+    Tables fetched by get_model_data are cached in table_cache (shared by all the streamlit sessions)
+    - keyed by (model name, url) and all the entries of a model are invalidated once its changes are persisted
+    - if configured, tables are cached in smaller dtypes (see TableCompactor)
+    - a table version which a session already has is not held twice (see SnapshotStore)
+    - if filters are provided, only the matching rows are fetched (and cached separately, see TableFilter)
+    Similarly, audit data fetched by get_model_audit_data is cached in audit_cache
+    - keyed by (model name, id) and only the entries of the ids touched by persisted changes are invalidated
     """
 
     common_headers: dict[str, str] = {'Content-type': 'application/json', 'Accept': 'application/json'}
+    table_cache: DataCache = DataCache("table_cache")
+    audit_cache: DataCache = DataCache("audit_cache", ttl_seconds=300, max_size=64 * 1024 * 1024)
 
     def __init__(self, config: ModelConfig, changed_data: dict[Operation, pd.DataFrame]):
         self._changed_data: dict[Operation, pd.DataFrame] = changed_data
         self._config: ModelConfig = config
         self._model_list_class: Type[ModelList] = self._config.model_list_class
         self._request_handler_class: Type[RequestHandler] = self._config.request_handler_class
+        self.settings: PersistenceSettings = PersistenceSettings.from_dict(self._config.get_value("persistence"))
+        self.timings: dict[Operation, float] = {}
 
-    def persist(self) -> dict[Operation, Optional[ResponseData]]:
-        return {Operation.New: self._persist_new(),
-                Operation.Edited: self._persist_edited(),
-                Operation.Deleted: self._persist_deleted()}
+    def persist(self) -> dict[Operation, Optional[PersistReport]]:
+        """ Report of each operation, None if there wasn't anything to persist for that operation """
+        reports: dict[Operation, Optional[PersistReport]] = {}
+        for stage in self._get_stages():
+            if self.settings.concurrent and len(stage) > 1:
+                with ThreadPoolExecutor(max_workers=len(stage), thread_name_prefix="persist") as executor:
+                    futures = {op: executor.submit(self._timed, op, self._persist_operation, op) for op in stage}
+                    reports.update({op: future.result() for op, future in futures.items()})
+            else:
+                reports.update({op: self._timed(op, self._persist_operation, op) for op in stage})
 
-    def _persist_new(self) -> Optional[ResponseData]:
-        new_data_df: pd.DataFrame = self._changed_data.get(Operation.New, None)
-        if Util.is_none_or_empty_df(new_data_df):
-            return None  # there wasn't any new data
+        logger.info(f'Persisted [{self._config.name}] in: {self._format_timings()}')
+        self._invalidate_caches(reports)
 
-        model_list: ModelList = self._model_list_class.from_df(new_data_df)
-        return self._request_handler_class.handle_post(url=self._config.get_model_end_point(EndPoint.Post),
-                                                       json_data=model_list.model_dump_json(by_alias=True),
-                                                       headers=self.common_headers)
+        # to retain the order expected by the callers
+        return {op: reports[op] for op in (Operation.New, Operation.Edited, Operation.Deleted)}
+
+    def retry_failed(self,
+                     reports: dict[Operation, Optional[PersistReport]]) -> dict[Operation, Optional[PersistReport]]:
+        """ Sends only the failed batches (if any) again and returns the reports with the latest results """
+        retried_reports: dict[Operation, Optional[PersistReport]] = {}
+        for operation, report in reports.items():
+            if report is None or report.is_status_ok:
+                retried_reports[operation] = report
+                continue
+
+            logger.info(f'Retrying {len(report.failed)} failed batches of [{operation}] for [{self._config.name}]')
+            retry_report: PersistReport = self._send_batches(operation, [(b.batch, b.df) for b in report.failed])
+            retried_reports[operation] = report.merge_retry(retry_report)
 
-    def _persist_edited(self) -> Optional[ResponseData]:
-        new_data_df: pd.DataFrame = self._changed_data.get(Operation.Edited, None)
-        if Util.is_none_or_empty_df(new_data_df):
-            return None  # there wasn't any new data
+        self._invalidate_caches(retried_reports)
+        return retried_reports
+
+    def _invalidate_caches(self, reports: dict[Operation, Optional[PersistReport]]) -> None:
+        # even a partial success changes the table in backend, so cached data is no longer valid
+        persisted: list[Operation] = [op for op, report in reports.items() if report is not None and report.succeeded]
+        if persisted:
+            self.table_cache.invalidate(self._config.name)
+            self._invalidate_audit_cache(persisted)
+
+    def _invalidate_audit_cache(self, operations: list[Operation]) -> None:
+        for operation in operations:
+            data: pd.DataFrame = self._changed_data.get(operation, None)
+            if Util.is_none_or_empty_df(data):
+                continue
+
+            for model_id in set(self._model_list_class.get_ids(data)):
+                self.audit_cache.invalidate(*self._get_audit_cache_key(self._config, model_id))
+
+    def _get_stages(self) -> list[list[Operation]]:
+        """ Operations in a stage can run at the same time, but the stages must be run one after another """
+        if not self.settings.concurrent:
+            return [[Operation.New, Operation.Edited, Operation.Deleted]]
+
+        if self.settings.ordering == "deletes_first" or (self.settings.ordering == "auto" and self._is_key_reused()):
+            return [[Operation.Deleted], [Operation.New, Operation.Edited]]
+
+        return [[Operation.New, Operation.Edited, Operation.Deleted]]
+
+    def _is_key_reused(self) -> bool:
+        deleted_data: pd.DataFrame = self._changed_data.get(Operation.Deleted, None)
+        if Util.is_none_or_empty_df(deleted_data):
+            return False
+
+        deleted_ids: set = set(self._model_list_class.get_ids(deleted_data))
+        for operation in (Operation.New, Operation.Edited):
+            data: pd.DataFrame = self._changed_data.get(operation, None)
+            if not Util.is_none_or_empty_df(data) and deleted_ids.intersection(self._model_list_class.get_ids(data)):
+                return True
+
+        return False
+
+    def _timed(self, operation: Operation, persister: Callable[..., Any], *args) -> Any:
+        start: float = time.perf_counter()
+        try:
+            return persister(*args)
+        finally:
+            self.timings[operation] = time.perf_counter() - start
+            Metrics.observe("persist_seconds", self.timings[operation], model=self._config.name,
+                            operation=operation.value)
+
+    def _format_timings(self) -> str:
+        return ', '.join([f'{op}: {seconds * 1000:.1f}ms' for op, seconds in self.timings.items()])
+
+    def _persist_operation(self, operation: Operation) -> Optional[PersistReport]:
+        df: Optional[pd.DataFrame] = self._get_rows_to_send(operation)
+        if Util.is_none_or_empty_df(df):
+            return None  # there wasn't any data for this operation
+
+        Metrics.inc("persist_rows_total", df.shape[0], model=self._config.name, operation=operation.value)
+        batch_size: int = self.settings.get_batch_size(operation) or df.shape[0]
+        batches: list[tuple[int, pd.DataFrame]] = [(batch, df.iloc[start: start + batch_size]) for batch, start in
+                                                   enumerate(range(0, df.shape[0], batch_size))]
+        return self._send_batches(operation, batches)
+
+    def _get_rows_to_send(self, operation: Operation) -> Optional[pd.DataFrame]:
+        df: Optional[pd.DataFrame] = self._changed_data.get(operation, None)
+        if operation != Operation.Edited or Util.is_none_or_empty_df(df):
+            return df
 
         # remove the existing entries of df, only retain new entries for sending it over to db
-        new_data_df = new_data_df.loc[new_data_df[Util.STATE_STR] == State.New.value]
+        df = df.loc[df[Util.STATE_STR] == State.New.value]
 
         # intentionally not in_place, otherwise might have side effects later
-        new_data_df = new_data_df.drop(Util.STATE_STR, axis=1, inplace=False)
-        if Util.is_none_or_empty_df(new_data_df):
-            return None
+        return df.drop(Util.STATE_STR, axis=1, inplace=False)
+
+    def _send_batches(self, operation: Operation, batches: list[tuple[int, pd.DataFrame]]) -> PersistReport:
+        senders: dict[Operation, Callable[[pd.DataFrame], ResponseData]] = {Operation.New: self._send_new,
+                                                                            Operation.Edited: self._send_edited,
+                                                                            Operation.Deleted: self._send_deleted}
+        sender: Callable[[pd.DataFrame], ResponseData] = senders[operation]
+        if len(batches) == 1 or self.settings.max_parallel_batches == 1:
+            return PersistReport(operation, [BatchResult(batch, df, sender(df)) for batch, df in batches])
+
+        with ThreadPoolExecutor(max_workers=min(len(batches), self.settings.max_parallel_batches),
+                                thread_name_prefix=f"persist-{operation}") as executor:
+            responses: list[ResponseData] = list(executor.map(sender, [df for _, df in batches]))
+
+        return PersistReport(operation, [BatchResult(batch, df, response)
+                                         for (batch, df), response in zip(batches, responses)])
+
+    def _send_new(self, df: pd.DataFrame) -> ResponseData:
+        model_list: ModelList = self._model_list_class.from_df(df)
+        return self._request_handler_class.handle_post(url=self._config.get_model_end_point(EndPoint.Post),
+                                                       json_data=self._request_handler_class.to_json(model_list),
+                                                       headers=self.common_headers)
 
-        model_list: ModelList = self._model_list_class.from_df(new_data_df)
+    def _send_edited(self, df: pd.DataFrame) -> ResponseData:
+        model_list: ModelList = self._model_list_class.from_df(df)
         return self._request_handler_class.handle_put(url=self._config.get_model_end_point(EndPoint.Put),
-                                                      json_data=model_list.model_dump_json(by_alias=True),
+                                                      json_data=self._request_handler_class.to_json(model_list),
                                                       headers=self.common_headers)
 
-    def _persist_deleted(self) -> Optional[ResponseData]:
-        deleted_data: pd.DataFrame = self._changed_data.get(Operation.Deleted, None)
-        if Util.is_none_or_empty_df(deleted_data):
-            return None  # there wasn't any new data
-
-        deleted_ids: list = self._model_list_class.get_ids(deleted_data)
+    def _send_deleted(self, df: pd.DataFrame) -> ResponseData:
+        deleted_ids: list = self._model_list_class.get_ids(df)
         return self._request_handler_class.handle_delete(url=self._config.get_model_end_point(EndPoint.Delete),
                                                          json_data=json.dumps(deleted_ids),
                                                          headers=self.common_headers)
@@ -77,22 +325,241 @@ class Persistence:
         - Also, this method needs to be callable from the app (or whoever needs data)
         without creating an instance of this class
         """
-        response_data: ResponseData = request_handler.handle_get(url=url)
-        if response_data.is_valid() and not Util.is_none_or_empty_df(response_data.df):
-            response_data.df.sort_values(by=[model_class.get_id_field()], ascending=True, inplace=True)
+        return Persistence._sort(request_handler.handle_get(url=url, model_class=model_class), model_class)
+
+    @staticmethod
+    def _sort(response_data: ResponseData, model_class: Type[Model]) -> ResponseData:
+        if response_data.is_valid():
+            response_data.df.sort_values(by=list(model_class.get_meta_data().id_fields), ascending=True, inplace=True)
             response_data.df.reset_index(drop=True, inplace=True)
 
         return response_data
 
     @staticmethod
-    def get_model_data(config: ModelConfig) -> ResponseData:
-        return Persistence._get_data_impl(url=config.get_model_end_point(EndPoint.Get),
+    def get_model_data(config: ModelConfig, first_page: Optional[ResponseData] = None,
+                       filters: Optional[dict[str, Any]] = None) -> ResponseData:
+        """
+        Fetches the whole table, page by page if paging is configured (see PagingSettings)
+        - if first_page is provided (see get_model_data_page), only the remaining pages are fetched
+        - if filters (values by query parameter, see TableFilter) are provided, only the matching rows are fetched
+        """
+        query: str = TableFilter.to_query(filters)
+        cache_key: tuple[str, str] = Persistence._get_cache_key(config, query)
+        cached_df: Optional[pd.DataFrame] = Persistence.table_cache.get(cache_key)
+        if cached_df is not None:
+            return ResponseData(requests.codes.ok, df=cached_df)
+
+        # version is fetched before the data, so that a change made in between is synced again (rather than missed)
+        version: Optional[int] = IncrementalSync.get_version(first_page.df) if first_page is not None and \
+            first_page.is_valid() else Persistence._get_head_version(config)
+        response_data: ResponseData = Persistence._get_model_data_impl(config, first_page, query)
+        if response_data.is_valid():
+            df: pd.DataFrame = TableFilter.apply(TableFilter.set_values(response_data.df, filters), config)
+            if df.empty:  # i.e. none of the rows match the filters
+                return ResponseData(response_data.status_code, error_msg=ResponseData.NO_DATA)
+
+            if Persistence._is_compact(config):
+                df = TableCompactor.compact(df, config.model_class, config.name)
+            IncrementalSync.set_version(df, version)
+            if not query:  # a filtered table is not the same as the whole table of the same version
+                df = SnapshotStore.publish(config.name, df)
+            response_data = ResponseData(response_data.status_code, df=df)
+            Persistence.table_cache.put(cache_key, df)
+
+        return response_data
+
+    @staticmethod
+    def sync_model_data(config: ModelConfig, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Brings df up to date by fetching only the changes since df was loaded (see IncrementalSync)
+        - returns None if it can't be synced (e.g. not configured or a gap in changes), i.e. it must be reloaded
+        - df is not modified, instead a new DataFrame is returned (and cached)
+        - if df is filtered, then so is the synced table, as changes are of all the rows
+        """
+        if not IncrementalSync.is_enabled(config):
+            return None
+
+        synced_df: Optional[pd.DataFrame] = IncrementalSync.sync(config, df)
+        if synced_df is not None:
+            filters: dict[str, Any] = TableFilter.get_values(df)
+            synced_df = TableFilter.apply(TableFilter.set_values(synced_df, filters), config) if filters else \
+                SnapshotStore.publish(config.name, synced_df)
+            logger.info(f'Synced [{config.name}] from version {IncrementalSync.get_version(df)} to '
+                        f'{IncrementalSync.get_version(synced_df)}')
+            Persistence.table_cache.put(Persistence._get_cache_key(config, TableFilter.to_query(filters)), synced_df)
+
+        return synced_df
+
+    @staticmethod
+    def _is_compact(config: ModelConfig) -> bool:
+        """ compact = true in [model] section of the child config, to cache the table in smaller dtypes """
+        return bool(config.config["model"].get("compact", False))
+
+    @staticmethod
+    def _get_head_version(config: ModelConfig) -> Optional[int]:
+        return IncrementalSync.get_head_version(config) if IncrementalSync.is_enabled(config) else None
+
+    @staticmethod
+    def is_model_data_cached(config: ModelConfig, filters: Optional[dict[str, Any]] = None) -> bool:
+        return Persistence._get_cache_key(config, TableFilter.to_query(filters)) in Persistence.table_cache
+
+    @staticmethod
+    def _get_cache_key(config: ModelConfig, query: str = "") -> tuple[str, str]:
+        """ all the entries of a model (i.e. whole and filtered tables) share the model name, see _invalidate_caches """
+        return config.name, Persistence._get_model_url(config, query)
+
+    @staticmethod
+    def _get_model_url(config: ModelConfig, query: str = "") -> str:
+        url: str = config.get_model_end_point(EndPoint.Get)
+        return f'{url}?{query}' if query else url
+
+    @staticmethod
+    def _get_model_data_impl(config: ModelConfig, first_page: Optional[ResponseData], query: str) -> ResponseData:
+        paging: PagingSettings = PagingSettings.from_config(config)
+        if not paging.enabled:
+            return Persistence._get_data_impl(url=Persistence._get_model_url(config, query),
+                                              model_class=config.model_class,
+                                              request_handler=config.request_handler_class)
+
+        if first_page is None:
+            first_page = Persistence._get_page(config, paging, 0, query)
+
+        if not first_page.is_valid() or first_page.df.shape[0] < paging.page_size:
+            return first_page  # either an error or there is just one page
+
+        pages: list[pd.DataFrame] = [first_page.df]
+        next_page: int = 1
+        is_last_page_found: bool = False
+        with ThreadPoolExecutor(max_workers=paging.max_parallel_pages, thread_name_prefix="paging") as executor:
+            # total number of pages is not known, so pages are fetched in batches of max_parallel_pages
+            while not is_last_page_found:
+                page_numbers: range = range(next_page, next_page + paging.max_parallel_pages)
+                responses: list[ResponseData] = list(
+                    executor.map(lambda page: Persistence._get_page(config, paging, page, query), page_numbers))
+
+                for response in responses:
+                    if not response.is_status_ok:
+                        return response
+
+                    if not response.is_valid():  # i.e. 'No Data', so there are no more pages
+                        is_last_page_found = True
+                        break
+
+                    pages.append(response.df)
+                    if response.df.shape[0] < paging.page_size:
+                        is_last_page_found = True
+                        break
+
+                next_page += paging.max_parallel_pages
+
+        df: pd.DataFrame = pd.concat(pages, ignore_index=True)
+        logger.info(f'Fetched {df.shape[0]} rows of [{config.name}] in {len(pages)} pages')
+        return Persistence._sort(ResponseData(first_page.status_code, df=df), config.model_class)
+
+    @staticmethod
+    def get_model_data_page(config: ModelConfig, page: int, filters: Optional[dict[str, Any]] = None) -> ResponseData:
+        """ Fetches just one page of the table, but if paging is not configured, then it is the whole table """
+        paging: PagingSettings = PagingSettings.from_config(config)
+        if not paging.enabled:
+            return Persistence.get_model_data(config, filters=filters)
+
+        version: Optional[int] = Persistence._get_head_version(config)
+        response_data: ResponseData = Persistence._get_page(config, paging, page, TableFilter.to_query(filters))
+        if response_data.is_valid():
+            IncrementalSync.set_version(response_data.df, version)
+
+        return response_data
+
+    @staticmethod
+    def _get_page(config: ModelConfig, paging: PagingSettings, page: int, query: str = "") -> ResponseData:
+        page_query: str = urlencode({paging.page_param: page, paging.size_param: paging.page_size})
+        return Persistence._get_data_impl(url=Persistence._get_model_url(config, f'{query}&{page_query}' if query
+                                                                         else page_query),
                                           model_class=config.model_class,
                                           request_handler=config.request_handler_class)
 
     @staticmethod
     def get_model_audit_data(config: ModelConfig, model_id: int | str) -> ResponseData:
+        cache_key: tuple[str, str] = Persistence._get_audit_cache_key(config, model_id)
+        cached_df: Optional[pd.DataFrame] = Persistence.audit_cache.get(cache_key)
+        if cached_df is not None:
+            return ResponseData(requests.codes.ok, df=cached_df)
+
         url = f'{config.get_model_audit_end_point(EndPoint.Get)}{model_id}/'
-        return Persistence._get_data_impl(url=url,
-                                          model_class=config.model_audit_class,
-                                          request_handler=config.request_handler_class)
+        response_data: ResponseData = Persistence._get_data_impl(url=url,
+                                                                 model_class=config.model_audit_class,
+                                                                 request_handler=config.request_handler_class)
+        if response_data.is_valid():
+            Persistence.audit_cache.put(cache_key, response_data.df)
+
+        return response_data
+
+    @staticmethod
+    def get_model_audits_data(config: ModelConfig, model_ids: list[int | str]) -> ResponseData:
+        """
+        Histories of all the ids in a single frame, sorted by id and version
+        - the ids which are not cached are fetched concurrently, either one GET per id or in batches (see AuditSettings)
+        - ids without any history are just not in the frame, but if any request fails, then its error is returned
+        """
+        model_ids = list(dict.fromkeys(model_ids))  # without repetition, but in the same order
+        audits: list[pd.DataFrame] = []
+        missing_ids: list[int | str] = []
+        for model_id in model_ids:
+            cached_df: Optional[pd.DataFrame] = Persistence.audit_cache.get(
+                Persistence._get_audit_cache_key(config, model_id))
+            if cached_df is not None:
+                audits.append(cached_df)
+            else:
+                missing_ids.append(model_id)
+
+        settings: AuditSettings = AuditSettings.from_config(config)
+        with Metrics.timer("audit_bulk_seconds", model=config.name):
+            # a batch is either a list of ids or just an id
+            batches: list[list[int | str] | int | str] = missing_ids
+            fetch: Callable[[Any], ResponseData] = partial(Persistence.get_model_audit_data, config)
+            if settings.is_batch:
+                batches = [missing_ids[start: start + settings.batch_size] for start in
+                           range(0, len(missing_ids), settings.batch_size)]
+                fetch = partial(Persistence._get_model_audit_batch, config, settings)
+
+            responses: list[ResponseData] = []
+            if batches:
+                with ThreadPoolExecutor(max_workers=min(len(batches), settings.max_parallel_ids),
+                                        thread_name_prefix="audit") as executor:
+                    responses = list(executor.map(fetch, batches))
+
+        for response in responses:
+            if not response.is_status_ok:
+                return response
+            if response.is_valid():  # i.e. not 'No Data'
+                audits.append(response.df)
+
+        Metrics.inc("audit_bulk_ids_total", len(model_ids), model=config.name)
+        if not audits:
+            return ResponseData(requests.codes.ok, error_msg=ResponseData.NO_DATA)
+
+        df: pd.DataFrame = pd.concat(audits, ignore_index=True)
+        columns: list[str] = [column for column in config.model_audit_class.get_meta_data().id_fields + ("version",)
+                              if column in df.columns]
+        return ResponseData(requests.codes.ok, df=df.sort_values(by=columns, kind="stable", ignore_index=True))
+
+    @staticmethod
+    def _get_model_audit_batch(config: ModelConfig, settings: AuditSettings,
+                               model_ids: list[int | str]) -> ResponseData:
+        """ histories of a batch of ids in a single request, these are cached per id, same as get_model_audit_data """
+        query: str = urlencode({settings.batch_param: ','.join([str(model_id) for model_id in model_ids])})
+        response_data: ResponseData = Persistence._get_data_impl(
+            url=f'{config.get_model_audit_end_point(EndPoint.Get)}?{query}', model_class=config.model_audit_class,
+            request_handler=config.request_handler_class)
+        if response_data.is_valid():
+            id_field: str = config.model_audit_class.get_meta_data().id_fields[0]
+            for model_id, audit_df in response_data.df.groupby(response_data.df[id_field].astype(str), sort=False):
+                Persistence.audit_cache.put(Persistence._get_audit_cache_key(config, model_id),
+                                            audit_df.reset_index(drop=True))
+
+        return response_data
+
+    @staticmethod
+    def _get_audit_cache_key(config: ModelConfig, model_id: int | str) -> tuple[str, str]:
+        """ ids are converted to str, as 1 (from the input) and '1' (from a DataFrame) must have the same key """
+        return config.name, str(model_id)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Callable, Optional
 
 import pandas as pd
 import requests
@@ -7,26 +7,64 @@ from util import Util
 
 
 class ResponseData:
-    def __init__(self, status_code: int, *, df: Optional[pd.DataFrame] = None, error_msg: Optional[str] = None):
-        if Util.is_none_or_empty_df(df) and not error_msg:
-            raise ValueError("Either df or error_msg must be provided")
+    """
+    Outcome of a request, i.e. either a (non-empty) DataFrame or an error message
+    - instead of a df, a loader can be provided to build the df only when it is needed (e.g. by df or is_valid)
+        -- a loaded df which is None or empty is treated as 'No Data' error, same as an error response
+        -- hence, error responses (or callers only checking the status) never pay for building the df
+    - the df is loaded (and checked for emptiness) at most once
+    """
 
-        if not Util.is_none_or_empty_df(df) and error_msg:
-            raise ValueError("Both df and error_msg are valid, seems logical error!")
+    NO_DATA: str = "No Data"
 
+    def __init__(self, status_code: int, *, df: Optional[pd.DataFrame] = None, error_msg: Optional[str] = None,
+                 loader: Optional[Callable[[], Optional[pd.DataFrame]]] = None):
         self._status_code: int = status_code
         self._df: Optional[pd.DataFrame] = df
         self._error_msg: Optional[str] = error_msg.strip() if error_msg else None
+        self._loader: Optional[Callable[[], Optional[pd.DataFrame]]] = loader
+
+        if loader is not None:
+            if df is not None or error_msg:
+                raise ValueError("loader can't be provided with df or error_msg")
+            return
+
+        is_empty: bool = Util.is_none_or_empty_df(df)
+        if is_empty and not error_msg:
+            raise ValueError("Either df or error_msg must be provided")
+
+        if not is_empty and error_msg:
+            raise ValueError("Both df and error_msg are valid, seems logical error!")
+
+    def _load(self) -> None:
+        if self._loader is None:
+            return
+
+        loader, self._loader = self._loader, None
+        df: Optional[pd.DataFrame] = loader()
+        if Util.is_none_or_empty_df(df):
+            self._error_msg = self.NO_DATA
+        else:
+            self._df = df
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loader is None
 
     @property
     def df(self) -> Optional[pd.DataFrame]:
+        self._load()
         if not self._error_msg:
             return self._df
 
         raise ValueError(self._error_msg)
 
     def is_valid(self) -> bool:
-        return self.is_status_ok and not Util.is_none_or_empty_df(self._df)
+        if not self.is_status_ok:
+            return False
+
+        self._load()
+        return not self._error_msg  # i.e. there is a non-empty df
 
     @property
     def error_msg(self):
@@ -34,6 +72,10 @@ class ResponseData:
         By default, error message is logged with url (e.g. look at requests.models.Response.raise_for_status)
         but it might be better to not expose such details to the user
         """
+        self._load()
+        if self._error_msg is None:
+            return None
+
         url_details_index: int = self._error_msg.find("for url: ")
         if url_details_index != -1:
             return self._error_msg[:url_details_index].strip()
@@ -42,6 +84,7 @@ class ResponseData:
 
     @property
     def error_msg_full(self):
+        self._load()
         return self._error_msg
 
     @property
@@ -53,5 +96,6 @@ class ResponseData:
         return self._status_code == requests.codes.ok
 
     def __repr__(self):
+        df: str = str(self._df) if self.is_loaded else '<not loaded>'
         return (f'{self.__class__.__name__}'
-                f'(status_code={self._status_code}), df={self._df}, error_msg={self._error_msg})')
+                f'(status_code={self._status_code}), df={df}, error_msg={self._error_msg})')
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from streamlit.logger import get_logger
+
+logger = get_logger(__name__.split('.')[-1])
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """
+    Connection pool settings of a backend (i.e. host:port), these are read from [apis] section of the child config
+    e.g. pool_size = 10, pool_block = false, connect_timeout = 3.05, read_timeout = 30
+    """
+    pool_size: int = 10
+    pool_block: bool = False
+    connect_timeout: float = 3.05
+    read_timeout: float = 30.0
+
+    @classmethod
+    def from_dict(cls, apis_dict: dict[str, Any]) -> PoolSettings:
+        default: PoolSettings = cls()
+        return PoolSettings(pool_size=int(apis_dict.get("pool_size", default.pool_size)),
+                            pool_block=bool(apis_dict.get("pool_block", default.pool_block)),
+                            connect_timeout=float(apis_dict.get("connect_timeout", default.connect_timeout)),
+                            read_timeout=float(apis_dict.get("read_timeout", default.read_timeout)))
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """ As expected by requests, i.e. (connect timeout, read timeout) """
+        return self.connect_timeout, self.read_timeout
+
+
+class SessionPool:
+    """
+    A per-process pool of keep-alive http sessions, one per backend (keyed by 'scheme://host:port')
+    - it behaves like a singleton, i.e. all the state is at class level, so all the streamlit sessions share it
+    - each session keeps its own pool of connections (of size pool_size), so TCP/TLS handshakes are not repeated
+    - settings are expected to be registered (by ModelConfig) before first use, else default settings are used
+    """
+
+    _lock: threading.Lock = threading.Lock()
+    _settings: dict[str, PoolSettings] = {}
+    _sessions: dict[str, requests.Session] = {}
+    _hits: int = 0
+    _misses: int = 0
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}'
+
+    @classmethod
+    def configure(cls, base_url: str, settings: PoolSettings) -> None:
+        """ base_url is expected to be like 'http://localhost:8080' """
+        key: str = cls.get_key(base_url)
+        with cls._lock:
+            existing: Optional[PoolSettings] = cls._settings.get(key, None)
+            if existing is not None and existing != settings:
+                logger.warning(f'Pool settings for [{key}] are being overridden: {existing} -> {settings}')
+                # the session was created with old settings, next request will create a new one
+                session: Optional[requests.Session] = cls._sessions.pop(key, None)
+                if session is not None:
+                    session.close()
+
+            cls._settings[key] = settings
+
+    @classmethod
+    def get_settings(cls, url: str) -> PoolSettings:
+        return cls._settings.get(cls.get_key(url), PoolSettings())
+
+    @classmethod
+    def get_session(cls, url: str) -> requests.Session:
+        key: str = cls.get_key(url)
+        with cls._lock:
+            session: Optional[requests.Session] = cls._sessions.get(key, None)
+            if session is not None:
+                cls._hits += 1
+                return session
+
+            cls._misses += 1
+            settings: PoolSettings = cls._settings.get(key, PoolSettings())
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.pool_size, pool_block=settings.pool_block)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            cls._sessions[key] = session
+            logger.info(f'Created a new session for [{key}] with {settings}')
+            return session
+
+    @classmethod
+    def request(cls, method: str, url: str, **kwargs) -> requests.Response:
+        """ Same as requests.request, but using the pooled session and configured timeouts (unless provided) """
+        kwargs.setdefault('timeout', cls.get_settings(url).timeout)
+        return cls.get_session(url).request(method=method, url=url, **kwargs)
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        with cls._lock:
+            return {'hits': cls._hits, 'misses': cls._misses, 'sessions': len(cls._sessions)}
+
+    @classmethod
+    def reset(cls) -> None:
+        """ Closes all the sessions and resets the counters, mostly helpful for testing """
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+
+            cls._sessions.clear()
+            cls._settings.clear()
+            cls._hits = 0
+            cls._misses = 0
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+from streamlit.logger import get_logger
+
+from core.incremental_sync import IncrementalSync
+
+logger = get_logger(__name__.split('.')[-1])
+
+
+@dataclass
+class Snapshot:
+    model: str
+    version: Optional[int]
+    df_ref: weakref.ref
+    size: int  # in bytes
+    refs: int = 0
+    df: Optional[pd.DataFrame] = None  # held only while a session refers to it
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    model: str
+    version: Optional[int]
+    refs: int
+    size: int
+
+
+class SnapshotRef:
+    """ A session's reference to a snapshot, released by release() or once the session data is garbage collected """
+
+    def __init__(self, key: int, df: pd.DataFrame):
+        self.df: pd.DataFrame = df
+        self._finalizer: weakref.finalize = weakref.finalize(self, SnapshotStore._release, key)
+
+    def release(self) -> None:
+        self._finalizer()  # it runs at most once
+
+
+class SnapshotStore:
+    """
+    A process wide (i.e. shared by all the streamlit sessions) store of the tables held by sessions
+    - a table is never modified once it is loaded (e.g. LocalWriteBack and IncrementalSync create a new DataFrame),
+    so a session diverges from the others by replacing its table, which is the only time a copy is made
+    - publish returns the existing snapshot of a table version (see IncrementalSync), if there is one, so that
+    sessions loading the same version (e.g. after the table_cache has expired it) share the same DataFrame
+        -- a table without version (i.e. [apis.model_changes] is not configured) is identified by its content instead
+    - acquire counts the sessions referring to a table, and the store holds it only while the count is non-zero
+    """
+
+    _lock: threading.Lock = threading.Lock()
+    _snapshots: dict[int, Snapshot] = {}
+    _published: dict[tuple[str, int | str], int] = {}  # by version or content, see _get_published_key
+
+    @classmethod
+    def publish(cls, model: str, df: pd.DataFrame) -> pd.DataFrame:
+        """ df, or the DataFrame of the same version (or the same content) of the table if a session still has it """
+        version: Optional[int] = IncrementalSync.get_version(df)
+        published_key: Optional[int | str] = cls._get_published_key(df, version)
+        if published_key is None:
+            return df  # can't tell whether it is the same as any other table
+
+        with cls._lock:
+            snapshot: Optional[Snapshot] = cls._snapshots.get(cls._published.get((model, published_key), -1), None)
+            existing: Optional[pd.DataFrame] = snapshot.df_ref() if snapshot is not None else None
+            if existing is not None:
+                return existing
+
+        snapshot = cls._new_snapshot(model, df, version)
+        with cls._lock:
+            cls._prune()
+            cls._snapshots.setdefault(id(df), snapshot)
+            cls._published[(model, published_key)] = id(df)
+
+        return df
+
+    @classmethod
+    def _get_published_key(cls, df: pd.DataFrame, version: Optional[int]) -> Optional[int | str]:
+        """ version of the table, or a fingerprint of its content (with its columns and dtypes) if it has no version """
+        if version is not None:
+            return version
+
+        try:
+            row_hashes: pd.Series = pd.util.hash_pandas_object(df, index=False)
+        except TypeError:  # e.g. a column of lists
+            return None
+
+        fingerprint = hashlib.sha256(repr((df.shape, df.dtypes.to_dict())).encode())
+        fingerprint.update(row_hashes.to_numpy().tobytes())
+        return fingerprint.hexdigest()
+
+    @classmethod
+    def acquire(cls, model: str, df: pd.DataFrame) -> SnapshotRef:
+        with cls._lock:
+            snapshot: Optional[Snapshot] = cls._snapshots.get(id(df), None)
+            is_found: bool = snapshot is not None and snapshot.df_ref() is df
+
+        if not is_found:
+            snapshot = cls._new_snapshot(model, df, IncrementalSync.get_version(df))
+
+        with cls._lock:
+            if not is_found:
+                cls._prune()
+                snapshot = cls._snapshots.setdefault(id(df), snapshot)
+            snapshot.refs += 1
+            snapshot.df = df
+
+        return SnapshotRef(id(df), df)
+
+    @classmethod
+    def _release(cls, key: int) -> None:
+        with cls._lock:
+            snapshot: Optional[Snapshot] = cls._snapshots.get(key, None)
+            if snapshot is None or snapshot.refs == 0:
+                return
+
+            snapshot.refs -= 1
+            if snapshot.refs == 0:
+                snapshot.df = None  # it might still be alive, e.g. in the table_cache, hence it can still be published
+                cls._prune()
+
+    @classmethod
+    def _new_snapshot(cls, model: str, df: pd.DataFrame, version: Optional[int]) -> Snapshot:
+        # deep, as most of the memory is in the strings
+        return Snapshot(model, version, weakref.ref(df), int(df.memory_usage(index=True, deep=True).sum()))
+
+    @classmethod
+    def _prune(cls) -> None:
+        """ removes the snapshots which are no longer alive, expects the lock to be held """
+        dead_keys: list[int] = [key for key, snapshot in cls._snapshots.items() if snapshot.df_ref() is None]
+        for key in dead_keys:
+            cls._snapshots.pop(key)
+        cls._published = {version: key for version, key in cls._published.items() if key in cls._snapshots}
+
+    @classmethod
+    def get_snapshots(cls) -> list[SnapshotInfo]:
+        """ snapshots referred by at least one session """
+        with cls._lock:
+            return [SnapshotInfo(snapshot.model, snapshot.version, snapshot.refs, snapshot.size)
+                    for snapshot in cls._snapshots.values() if snapshot.refs > 0]
+
+    @classmethod
+    def clear(cls) -> None:
+        """ mostly helpful for testing """
+        with cls._lock:
+            cls._snapshots.clear()
+            cls._published.clear()
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, Optional, Type
+
+import numpy as np
+import pandas as pd
+from annotated_types import Ge, Gt, Le, Lt
+from streamlit.logger import get_logger
+
+from base.model import Model
+
+logger = get_logger(__name__.split('.')[-1])
+
+ARROW_STRING: str = "string[pyarrow]"
+CATEGORY: str = "category"
+INT_DTYPES: tuple[str, ...] = ("int8", "int16", "int32", "int64")
+
+
+@dataclass(frozen=True)
+class CompactionReport:
+    """ editor_bytes are of the columns converted for the editor (see for_editor), the rest is shared with the table """
+    model: str
+    rows: int
+    bytes_before: int
+    bytes_after: int
+    editor_bytes: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        """ including the editor copy, as it is held as long as the table """
+        return 1 - (self.bytes_after + self.editor_bytes) / self.bytes_before if self.bytes_before else 0.0
+
+
+class TableCompactor:
+    """
+    Converts a table (as decoded from the backend) to smaller dtypes, derived from the fields of its Model:
+    - str fields become arrow strings, Enum fields become categoricals
+    - int fields with bounds (e.g. Field(ge=0, le=100)) become the smallest int which fits the bounds
+    - Model.get_dtype_hints overrides these, e.g. 'category' for a str field with only a few distinct values
+    A column is left as it is if it can't be converted (e.g. it has missing ints)
+
+    Compact dtypes don't leak out of the table:
+    - to_list gives the same python values as the default dtypes would (e.g. 9.7, not 9.69999980 for a float32)
+    - for_editor replaces categoricals by arrow strings, as the editor would only allow the existing categories
+    - conform_dtypes restores the compact dtypes once rows are added to a table (see LocalWriteBack)
+    """
+
+    _lock: threading.Lock = threading.Lock()
+    _reports: dict[str, CompactionReport] = {}
+    _editor_dfs: dict[int, tuple[weakref.ref, pd.DataFrame]] = {}
+
+    @staticmethod
+    def get_dtypes(model_class: Type[Model]) -> dict[str, str]:
+        """ compact dtype of each column (i.e. alias of the field), columns without one are not converted """
+        dtypes: dict[str, str] = {}
+        for name, field_info in model_class.model_fields.items():
+            column: str = field_info.alias or name
+            annotation: Any = field_info.annotation
+            if isinstance(annotation, type) and issubclass(annotation, Enum):
+                dtypes[column] = CATEGORY
+            elif annotation is str:
+                dtypes[column] = ARROW_STRING
+            elif annotation is int:
+                dtype: Optional[str] = TableCompactor._get_int_dtype(field_info.metadata)
+                if dtype is not None:
+                    dtypes[column] = dtype
+
+        dtypes.update(model_class.get_meta_data().dtype_hints)
+        return dtypes
+
+    @staticmethod
+    def _get_int_dtype(metadata: list[Any]) -> Optional[str]:
+        lower: Optional[int] = None
+        upper: Optional[int] = None
+        for constraint in metadata:
+            if isinstance(constraint, Ge):
+                lower = constraint.ge
+            elif isinstance(constraint, Gt):
+                lower = constraint.gt + 1
+            elif isinstance(constraint, Le):
+                upper = constraint.le
+            elif isinstance(constraint, Lt):
+                upper = constraint.lt - 1
+
+        if lower is None or upper is None:
+            return None
+
+        return next((dtype for dtype in INT_DTYPES if np.iinfo(dtype).min <= lower and upper <= np.iinfo(dtype).max),
+                    None)
+
+    @staticmethod
+    def compact(df: pd.DataFrame, model_class: Type[Model], model: str = "") -> pd.DataFrame:
+        """ a compact copy of df (df itself is not modified), memory before and after is logged (see get_reports) """
+        bytes_before: int = TableCompactor.get_memory_usage(df)
+        result: pd.DataFrame = TableCompactor.conform_dtypes(df, TableCompactor.get_dtypes(model_class))
+        result.attrs = dict(df.attrs)
+
+        report: CompactionReport = CompactionReport(model or model_class.__name__, df.shape[0], bytes_before,
+                                                    TableCompactor.get_memory_usage(result))
+        TableCompactor._record(report)
+        return result
+
+    @staticmethod
+    def conform_dtypes(df: pd.DataFrame, dtypes: dict[str, Any]) -> pd.DataFrame:
+        """
+        A copy of df with the dtypes (where possible), e.g. after concatenating rows of default dtypes to a compact
+        table, or rows from the editor (which gives floats for new ints) to a table with ints
+        """
+        columns: dict[str, pd.Series] = {}
+        for column in df.columns:
+            series: pd.Series = df[column]
+            dtype: Any = dtypes.get(column, None)
+            columns[column] = series if dtype is None else TableCompactor._convert(series, dtype)
+
+        return pd.DataFrame(columns, index=df.index)
+
+    @staticmethod
+    def _convert(series: pd.Series, dtype: Any) -> pd.Series:
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = CATEGORY  # categories of a table don't include the values being added to it
+
+        if series.dtype == dtype:
+            return series
+
+        if pd.api.types.is_integer_dtype(dtype) and not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            return TableCompactor._convert_to_int(series, np.dtype(dtype))
+
+        try:
+            return series.astype(dtype)
+        except (TypeError, ValueError):
+            return series
+
+    @staticmethod
+    def _convert_to_int(series: pd.Series, dtype: np.dtype) -> pd.Series:
+        """ only if every value is a whole number which fits dtype, i.e. unlike astype, nothing is truncated """
+        if not pd.api.types.is_numeric_dtype(series.dtype) or series.hasnans:
+            return series
+
+        values: np.ndarray = series.to_numpy()
+        if values.size and (values.min() < np.iinfo(dtype).min or values.max() > np.iinfo(dtype).max):
+            return series
+
+        if pd.api.types.is_float_dtype(values.dtype) and not np.array_equal(values, np.trunc(values)):
+            return series
+
+        return series.astype(dtype)
+
+    @staticmethod
+    def to_list(series: pd.Series) -> list:
+        """
+        Same values as series.tolist() would give for the default dtypes, i.e.
+        - missing values are None (not pd.NA), for arrow strings and categoricals
+        - float32 values are the shortest decimals which round to them, e.g. 9.7 and not 9.699999809265137
+        """
+        if series.dtype == np.float32:
+            return series.to_numpy().astype(str).astype(np.float64).tolist()
+
+        if isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype)):
+            return series.to_numpy(dtype=object, na_value=None).tolist()
+
+        return series.tolist()
+
+    @staticmethod
+    def for_editor(df: pd.DataFrame, model: Optional[str] = None) -> pd.DataFrame:
+        """
+        df, but categoricals as arrow strings, so that any value can be entered in the editor
+        - the editor needs the same DataFrame on each rerun, hence it is built once per df (while df is alive)
+        - it is a shallow copy of df, i.e. only the converted columns are new, and these are added to the report of
+        model (if provided)
+        """
+        categories: list[str] = [column for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)]
+        if not categories:
+            return df
+
+        with TableCompactor._lock:
+            df_ref, editor_df = TableCompactor._editor_dfs.get(id(df), (None, None))
+            if df_ref is not None and df_ref() is df:
+                return editor_df
+
+        editor_df = df.copy(deep=False)
+        for column in categories:
+            editor_df[column] = TableCompactor._convert(df[column], ARROW_STRING)
+        editor_df.attrs = dict(df.attrs)
+        with TableCompactor._lock:
+            TableCompactor._editor_dfs = {key: value for key, value in TableCompactor._editor_dfs.items()
+                                          if value[0]() is not None}
+            TableCompactor._editor_dfs[id(df)] = (weakref.ref(df), editor_df)
+            report: Optional[CompactionReport] = TableCompactor._reports.get(model, None) if model else None
+            if report is not None:
+                TableCompactor._reports[model] = replace(report, editor_bytes=int(
+                    editor_df[categories].memory_usage(index=False, deep=True).sum()))
+
+        return editor_df
+
+    @staticmethod
+    def get_memory_usage(df: pd.DataFrame) -> int:
+        return int(df.memory_usage(index=True, deep=True).sum())
+
+    @staticmethod
+    def _record(report: CompactionReport) -> None:
+        with TableCompactor._lock:
+            TableCompactor._reports[report.model] = report
+
+        logger.info(f'Compacted {report.model} ({report.rows} rows) from {report.bytes_before:,} to '
+                    f'{report.bytes_after:,} bytes, i.e. {report.saved_ratio:.0%} saved')
+
+    @staticmethod
+    def get_reports() -> dict[str, CompactionReport]:
+        """ the latest compaction report of each model """
+        with TableCompactor._lock:
+            return dict(TableCompactor._reports)
+
+    @staticmethod
+    def clear() -> None:
+        """ mostly helpful for testing """
+        with TableCompactor._lock:
+            TableCompactor._reports.clear()
+            TableCompactor._editor_dfs.clear()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+from core.model_config import ModelConfig
+
+OPERATIONS: dict[str, str] = {"ge": "at least", "le": "at most", "eq": "is", "contains": "contains"}
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """
+    A filter of the data page, i.e. a query parameter of the GET end point, read from [apis.model.filters] section
+    of the child config, e.g.
+        minYear = { column = "year", op = "ge", label = "From year" }  # i.e. GET /movies/?minYear=2000
+    - op is one of ge, le, eq and contains (case-insensitive), the label is optional
+    """
+    param: str
+    column: str
+    op: str
+    label: str = ""
+
+    def __post_init__(self):
+        if self.op not in OPERATIONS:
+            raise ValueError(f'Unsupported op [{self.op}] of filter [{self.param}], expected one of '
+                             f'{tuple(OPERATIONS.keys())}')
+
+    def get_label(self) -> str:
+        return self.label or f'{self.column} {OPERATIONS[self.op]}'
+
+    @classmethod
+    def from_dict(cls, param: str, filter_dict: dict[str, Any]) -> FilterSpec:
+        return FilterSpec(param=param, column=str(filter_dict["column"]), op=str(filter_dict["op"]),
+                          label=str(filter_dict.get("label", "")))
+
+
+class TableFilter:
+    """
+    Filters are applied by the backend (only the matching rows are fetched), but these are also applied locally
+    - to the rows synced after a save (see IncrementalSync), as changes are not filtered by the backend
+    - in case the backend doesn't support a filter (i.e. it ignores the query parameter)
+    A filtered table has its filter values in its attrs, so that it is not mistaken for the whole table
+    """
+
+    ATTR: str = "filters"
+
+    @staticmethod
+    def get_specs(config: ModelConfig) -> list[FilterSpec]:
+        filters_dict: dict[str, Any] = config.config["apis"]["model"].get("filters", {})
+        return [FilterSpec.from_dict(param, filter_dict) for param, filter_dict in filters_dict.items()]
+
+    @staticmethod
+    def get_active(values: Optional[dict[str, Any]]) -> dict[str, Any]:
+        """ values which filter anything, i.e. not None or blank """
+        return {param: value.strip() if isinstance(value, str) else value for param, value in (values or {}).items()
+                if value is not None and not (isinstance(value, str) and not value.strip())}
+
+    @staticmethod
+    def to_query(values: Optional[dict[str, Any]]) -> str:
+        """ sorted by param, so that the same filters always give the same url (e.g. for the table_cache) """
+        return urlencode(sorted(TableFilter.get_active(values).items()))
+
+    @staticmethod
+    def get_values(df: pd.DataFrame) -> dict[str, Any]:
+        return df.attrs.get(TableFilter.ATTR, {})
+
+    @staticmethod
+    def set_values(df: pd.DataFrame, values: Optional[dict[str, Any]]) -> pd.DataFrame:
+        active: dict[str, Any] = TableFilter.get_active(values)
+        if active:
+            df.attrs[TableFilter.ATTR] = active
+        return df
+
+    @staticmethod
+    def apply(df: pd.DataFrame, config: ModelConfig) -> pd.DataFrame:
+        """ rows of df matching its filters (see set_values), df itself if all of them match """
+        values: dict[str, Any] = TableFilter.get_values(df)
+        if not values:
+            return df
+
+        is_match: pd.Series = pd.Series(True, index=df.index)
+        for spec in TableFilter.get_specs(config):
+            if spec.param in values and spec.column in df.columns:
+                is_match &= TableFilter._match(df[spec.column], spec.op, values[spec.param])
+
+        if is_match.all():
+            return df
+
+        result: pd.DataFrame = df.loc[is_match].reset_index(drop=True)
+        result.attrs = dict(df.attrs)
+        return result
+
+    @staticmethod
+    def _match(column: pd.Series, op: str, value: Any) -> pd.Series:
+        if op == "contains":
+            return column.astype(str).str.contains(str(value), case=False, regex=False).fillna(False).astype(bool)
+
+        if op == "eq" and not isinstance(value, (int, float)):
+            return (column.astype(str) == str(value)).fillna(False).astype(bool)
+
+        if column.dtype == np.float32:
+            column = column.astype(str).astype(np.float64)  # e.g. 7.1 and not 7.0999999, see TableCompactor.to_list
+
+        numbers: pd.Series = pd.to_numeric(column, errors="coerce")
+        if op == "eq":
+            return numbers == value
+        return numbers >= value if op == "ge" else numbers <= value
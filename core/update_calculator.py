@@ -1,8 +1,13 @@
 from itertools import chain
+from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 
+from core.edit_window import EditWindow
+from core.metrics import Metrics
 from core.model_session_data import ModelSessionData
+from core.table_compactor import TableCompactor
 from enums import Operation, State
 from util import Util
 
@@ -12,15 +17,82 @@ class UpdateCalculator:
     Used to calculate the edited/deleted and new rows based on:
      1. the diff with respect to original data frame
      2. the editor data provided by streamlit in streamlit.session_data
+     If the editor has just a window of the table (see EditWindow), then df is the whole table, and the editor data is
+     of all the windows (i.e. with positions in the table)
      """
 
-    def __init__(self, df: pd.DataFrame, session_data: ModelSessionData):
+    def __init__(self, df: pd.DataFrame, session_data: ModelSessionData, window: Optional[EditWindow] = None):
         self.original_df: pd.DataFrame = df
         self.session_data: ModelSessionData = session_data
+        self.window: Optional[EditWindow] = window
+
+    def _get_editor_data(self, operation: Operation) -> Any:
+        if self.window is None:
+            return self.session_data.get_editor_data(operation)
+        return self.window.get_editor_data(operation, self.session_data.get_editor_state())
 
     def _get_edited_rows(self) -> pd.DataFrame:
-        """ Creates two rows for changes in each row - one with original and one with new data """
-        edited_rows: dict[int, dict] = self.session_data.get_editor_data(Operation.Edited)
+        """
+        Creates two rows for changes in each row - one with original and one with new data
+        - same as _get_edited_rows_reference, but edits are applied (and compared) column by column
+        - unlike the reference, a missing value (None/NaN) edited to a missing value is not considered a change
+        """
+        edited_rows: dict[int, dict] = self._get_editor_data(Operation.Edited)
+        new_columns: list[str] = self.original_df.columns.to_list() + [Util.STATE_STR]
+        if not edited_rows:
+            return pd.DataFrame(data=[], columns=new_columns)
+
+        edited_row_indices: list[int] = [k for k in edited_rows.keys()]
+        changes: list[dict] = [v for v in edited_rows.values()]
+        impacted_df: pd.DataFrame = self.original_df.iloc[edited_row_indices]
+        edited_columns: dict[str, None] = dict.fromkeys([column for change in changes for column in change.keys()])
+
+        old_values_by_column: dict[str, np.ndarray] = {}
+        new_values_by_column: dict[str, np.ndarray] = {}
+        is_changed: np.ndarray = np.zeros(len(changes), dtype=bool)
+        for column in self.original_df.columns:
+            old_values: np.ndarray = np.fromiter(TableCompactor.to_list(impacted_df[column]), dtype=object,
+                                                 count=len(changes))
+            old_values_by_column[column] = old_values
+            if column not in edited_columns:
+                new_values_by_column[column] = old_values
+                continue
+
+            new_values: np.ndarray = old_values.copy()
+            has_change: np.ndarray = np.fromiter([column in change for change in changes], dtype=bool,
+                                                 count=len(changes))
+            new_values[has_change] = np.fromiter([change[column] for change in changes if column in change],
+                                                 dtype=object, count=int(has_change.sum()))
+            new_values_by_column[column] = new_values
+
+            is_missing: np.ndarray = pd.isna(old_values) & pd.isna(new_values)
+            is_changed |= (old_values != new_values) & ~is_missing
+
+        # editor is expected to have only the existing columns, if not, the reference counts it as a change
+        for column in edited_columns:
+            if column not in old_values_by_column:
+                is_changed |= np.fromiter([column in change for change in changes], dtype=bool, count=len(changes))
+
+        changed_count: int = int(is_changed.sum())
+        if changed_count == 0:
+            return pd.DataFrame(data=[], columns=new_columns)
+
+        data: dict[str, list] = {}
+        for column in self.original_df.columns:
+            interleaved: np.ndarray = np.empty(changed_count * 2, dtype=object)
+            interleaved[0::2] = old_values_by_column[column][is_changed]
+            interleaved[1::2] = new_values_by_column[column][is_changed]
+            data[column] = interleaved.tolist()  # so that pandas infers the dtype, same as the reference
+
+        data[Util.STATE_STR] = [State.Old.value, State.New.value] * changed_count
+        return pd.DataFrame(data=data, columns=new_columns)
+
+    def _get_edited_rows_reference(self) -> pd.DataFrame:
+        """
+        Creates two rows for changes in each row - one with original and one with new data
+        - it is row by row, hence slow for large edits, but retained as reference for _get_edited_rows
+        """
+        edited_rows: dict[int, dict] = self._get_editor_data(Operation.Edited)
         edited_row_indices: list[int] = [k for k in edited_rows.keys()]
         impacted_rows: list[dict] = self.original_df.iloc[edited_row_indices].to_dict('records')
 
@@ -37,16 +109,17 @@ class UpdateCalculator:
         return pd.DataFrame(data=diff, columns=new_columns)
 
     def _get_new_rows(self) -> pd.DataFrame:
-        new_rows: list[dict] = self.session_data.get_editor_data(Operation.New)
+        new_rows: list[dict] = self._get_editor_data(Operation.New)
         return pd.DataFrame(data=[row for row in new_rows], columns=self.original_df.columns)
 
     def _get_deleted_rows(self) -> pd.DataFrame:
         """ Although, st returns only the ids, but it makes sense to create the df using those ids"""
-        deleted_rows: list[int] = self.session_data.get_editor_data(Operation.Deleted)
+        deleted_rows: list[int] = self._get_editor_data(Operation.Deleted)
         return self.original_df.iloc[deleted_rows]
 
     def calculate_update(self) -> dict[Operation, pd.DataFrame]:
         """ Returns the diff for all 3 operations - addition, edit and deletion """
-        return {Operation.New: self._get_new_rows(),
-                Operation.Edited: self._get_edited_rows(),
-                Operation.Deleted: self._get_deleted_rows()}
+        with Metrics.timer("calculate_update_seconds", model=self.session_data.model):
+            return {Operation.New: self._get_new_rows(),
+                    Operation.Edited: self._get_edited_rows(),
+                    Operation.Deleted: self._get_deleted_rows()}
@@ -1,16 +1,20 @@
-from typing import Optional, Type
+from typing import Hashable, Optional, Type
 
 import pandas as pd
 import streamlit as sl
 
 from base.model import Model
+from core.edit_window import EditWindow
 from core.model_config import ModelConfig
+from core.key_index import KeyIndex
+from core.local_write_back import LocalWriteBack
 from core.model_session_data import ModelSessionData
+from core.persist_report import PersistReport
 from core.persistence import Persistence
-from core.response_data import ResponseData
 from core.session_data_mgr import SessionDataMgr
+from core.table_filter import TableFilter
 from core.update_calculator import UpdateCalculator
-from enums import Operation, ModelSessionDataEnum
+from enums import Operation, ModelSessionDataEnum, State
 from util import Util
 
 
@@ -23,11 +27,13 @@ class UpdateHandler:
 
      An instance of this class is passed to streamlit as on_change handler, and hence, its __call__ method becomes
      the entry point
+     If the editor has just a window of the table (see EditWindow), then df is still the whole table
      """
 
-    def __init__(self, df: pd.DataFrame, config: ModelConfig):
+    def __init__(self, df: pd.DataFrame, config: ModelConfig, window: Optional[EditWindow] = None):
         self.df: pd.DataFrame = df
         self.config: ModelConfig = config
+        self.window: Optional[EditWindow] = window
         self._data_updates: dict[Operation, pd.DataFrame] = {}
         self._model_class: Type[Model] = self.config.model_class
 
@@ -37,9 +43,9 @@ class UpdateHandler:
             if not Util.is_none_or_empty_df(state_data):
                 sl.subheader(Util.colored_text(f"{state} rows", state))
                 sl.dataframe(state_data, hide_index=True,
-                             column_config=self._model_class.get_column_config(), use_container_width=True)
+                             column_config=self._model_class.get_meta_data().column_config, use_container_width=True)
 
-    def _update_widgets(self):
+    def _update_widgets(self, can_apply: bool = True):
         """ As soon as there is some change, two buttons should appear - to either apply or discard the changes """
         if any([not Util.is_none_or_empty_df(df) for df in self._data_updates.values()]):
             col1, _, col2, __ = sl.columns([4, 1, 4, 20])
@@ -48,13 +54,43 @@ class UpdateHandler:
                 sl.button('Discard', on_click=self._discard_changes)
 
             with col2:
-                sl.button('Apply Changes', type="primary", on_click=self._persist_changes)
+                sl.button('Apply Changes', type="primary", on_click=self._persist_changes, disabled=not can_apply)
 
     def __call__(self, *args, **kwargs):
         model_session_data: ModelSessionData = SessionDataMgr.get_instance().get_model_data(self.config.name)
-        self._data_updates = UpdateCalculator(self.df, model_session_data).calculate_update()
+        self._data_updates = UpdateCalculator(self.df, model_session_data, self.window).calculate_update()
         self._update_data_view()
-        self._update_widgets()
+
+        # backend would reject these anyway, but only after sending (and may be persisting) the rest of the changes
+        duplicate_keys: list[Hashable] = self._find_duplicate_keys()
+        if duplicate_keys:
+            duplicates_str: str = ', '.join([str(key) for key in duplicate_keys[:10]])
+            sl.error(f'Ids of the new (or edited) rows must be unique, but these already exist (or are repeated): '
+                     f'{duplicates_str}{", ..." if len(duplicate_keys) > 10 else ""}', icon="🚨")
+
+        self._update_widgets(can_apply=not duplicate_keys)
+
+    def _find_duplicate_keys(self) -> list[Hashable]:
+        """ Keys of the new rows which repeat, or exist in the table (unless deleted/edited away in the same change) """
+        new_df: Optional[pd.DataFrame] = self._data_updates.get(Operation.New, None)
+        id_fields: tuple[str, ...] = self._model_class.get_meta_data().id_fields
+        if Util.is_none_or_empty_df(new_df) or not set(id_fields).issubset(self.df.columns):
+            return []
+
+        released_keys: list[Hashable] = []
+        deleted_df: Optional[pd.DataFrame] = self._data_updates.get(Operation.Deleted, None)
+        if not Util.is_none_or_empty_df(deleted_df):
+            released_keys += KeyIndex.get_keys(deleted_df, id_fields)
+
+        edited_df: Optional[pd.DataFrame] = self._data_updates.get(Operation.Edited, None)
+        if not Util.is_none_or_empty_df(edited_df):
+            released_keys += KeyIndex.get_keys(edited_df.loc[edited_df[Util.STATE_STR] == State.Old.value], id_fields)
+            # new state of the edited rows takes the key, same as a new row would
+            new_df = pd.concat([edited_df.loc[edited_df[Util.STATE_STR] == State.New.value, list(id_fields)],
+                                new_df[list(id_fields)]])
+
+        return KeyIndex.for_df(self.df, id_fields).find_duplicates(new_df.dropna(subset=list(id_fields)),
+                                                                   released_keys)
 
     def _discard_changes(self) -> None:
         """ Although, can't undo the changes in data grid, this does remove the diff created from changes """
@@ -65,17 +101,62 @@ class UpdateHandler:
         sl.toast(f'All changes have been discarded', icon=":material/mood_bad:")
 
     def _persist_changes(self):
-        """ Expected to be called by 'Apply changes' button """
+        """
+        Expected to be called by 'Apply changes' button
+        - if only some batches fail, those are retried (as configured), and if these still fail, only the failed
+        rows are discarded, as rest of the rows have been persisted already
+        """
         persistence = Persistence(self.config, self._data_updates)
-        persistence_response: dict[Operation, Optional[ResponseData]] = persistence.persist()
-        for operation, response in persistence_response.items():
-            if response and not response.is_status_ok:
-                Util.flash_message(sl.error, f'There was some issue in handling [{operation.value}]'
-                                             f' data: {response.error_msg}')
-                self._discard_changes()
-                return
-
-        # Not sure if this is really needed
-        SessionDataMgr.get_instance().get_model_data(self.config.name).clear_data()
+        persistence_reports: dict[Operation, Optional[PersistReport]] = persistence.persist()
+        for _ in range(persistence.settings.max_retries):
+            if all([report is None or report.is_status_ok for report in persistence_reports.values()]):
+                break
+            persistence_reports = persistence.retry_failed(persistence_reports)
+
+        failed_reports: dict[Operation, PersistReport] = {op: report for op, report in persistence_reports.items()
+                                                          if report and not report.is_status_ok}
+        if failed_reports:
+            Util.flash_message(sl.error, '\n\n'.join([self._get_failure_message(op, report)
+                                                       for op, report in failed_reports.items()]))
+            self._discard_changes()
+            return
+
+        self._refresh_table_data(persistence.settings.write_back)
         sl.toast(f'All changes have been saved', icon=":material/sentiment_satisfied:")
 
+    def _refresh_table_data(self, write_back: bool) -> None:
+        """
+        Brings the table of the session up to date after a successful save, in order of preference:
+        1. fetches only the changes since the table was loaded (see IncrementalSync), as it has changes of others too
+        2. if configured, applies the saved changes to the table itself (see LocalWriteBack)
+        3. otherwise, the table is reloaded on the next run
+        - a filtered table stays filtered, i.e. rows which no longer match its filters are dropped (see TableFilter)
+        """
+        session_data: ModelSessionData = SessionDataMgr.get_instance().get_model_data(self.config.name)
+        table_df: Optional[pd.DataFrame] = session_data.get_data(ModelSessionDataEnum.TableData)
+        if Util.is_none_or_empty_df(table_df):
+            session_data.clear_data()
+            return
+
+        refreshed_df: Optional[pd.DataFrame] = Persistence.sync_model_data(self.config, table_df)
+        if refreshed_df is None and write_back:
+            refreshed_df = LocalWriteBack.apply(table_df, self._data_updates,
+                                                self._model_class.get_meta_data().id_fields)
+
+        if refreshed_df is None:
+            session_data.clear_data()
+            return
+
+        refreshed_df = TableFilter.apply(TableFilter.set_values(refreshed_df, TableFilter.get_values(table_df)),
+                                         self.config)
+        session_data.update_data(ModelSessionDataEnum.TableData, refreshed_df)
+        session_data.change_key(ModelSessionDataEnum.EditorData)
+
+    def _get_failure_message(self, operation: Operation, report: PersistReport) -> str:
+        if len(report.failed) == len(report.batches):
+            return f'There was some issue in handling [{operation.value}] data: {report.error_msg}'
+
+        failed_ids: list = self.config.model_list_class.get_ids(report.failed_df)
+        failed_ids_str: str = ', '.join([str(i) for i in failed_ids[:10]]) + (', ...' if len(failed_ids) > 10 else '')
+        return (f'{len(report.failed)} of {len(report.batches)} batches of [{operation.value}] data could not be '
+                f'saved (ids: {failed_ids_str}), rest of the rows have been saved: {report.error_msg}')
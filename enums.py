@@ -46,6 +46,7 @@ class ModelSessionDataEnum(Enum):
     TableData = "TableData"
     AuditData = "AuditData"
     EditorData = "EditorData"
+    WindowData = "WindowData"  # see EditWindow
 
     def __str__(self):
         return self.value
@@ -2,16 +2,14 @@ from __future__ import annotations
 
 from datetime import date
 from itertools import chain
-from typing import List, Optional, Any
+from typing import Any, ClassVar, Type
 
-import pandas as pd
 import streamlit as st
 from pydantic import Field, ConfigDict
 
 from base.model import Model
 from base.model_list import ModelList
 from enums import Operation
-from util import Util
 
 
 class Movie(Model):
@@ -38,35 +36,27 @@ class Movie(Model):
             "genres": st.column_config.TextColumn("Genres", max_chars=100, validate="^[a-zA-z ,-]+$", required=True),
         }
 
+    @classmethod
+    def get_dtype_hints(cls) -> dict[str, str]:
+        # genres are combinations of a few genres, and ratings have just one decimal
+        return {"year": "int16", "rating": "float32", "genres": "category"}
+
 
 class MoviesList(ModelList):
     model_config = ConfigDict(populate_by_name=True)
+    item_class: ClassVar[Type[Model]] = Movie
     movies: list[Movie] = Field(serialization_alias='movieEntities')
 
-    @classmethod
-    def from_df(cls, df: pd.DataFrame) -> Optional[MoviesList]:
-        if Util.is_none_or_empty_df(df):
-            return None
-
-        return MoviesList(movies=[Movie.model_validate(m) for m in df.to_dict('records')])
-
-    @classmethod
-    def get_ids(cls, df: pd.DataFrame) -> list:
-        if Util.is_none_or_empty_df(df):
-            return []
-
-        return [m.title_id for m in MoviesList.from_df(df).movies]
-
 
 class MovieAudit(Movie):
     model_config = ConfigDict(populate_by_name=True)
 
-    version: str = Field(alias='version')
+    version: int = Field(alias='version')
     operation: Operation = Field(alias='operation')
 
     @classmethod
     def get_column_config(cls) -> dict[str, Any]:
-        return dict(chain(Movie.get_column_config().items(), {
+        return dict(chain(Movie.get_meta_data().column_config.items(), {
             "version": st.column_config.NumberColumn("Version #", min_value=0,
                                                      max_value=1000),
             "operation": st.column_config.TextColumn("Operation")
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Optional
+
+import streamlit as st
+from streamlit.navigation.page import StreamlitPage
+
+from core.model_config import ModelConfig
+from nav_pages.page_util import PageUtil
+
+
+@dataclass(frozen=True)
+class PageSettings:
+    """
+    Read from [page] section of the child config, e.g.
+        title = "Movies"  # title of the navigation section of the model, name of the model by default
+        url_path = "movies"  # pages are at /movies-data and /movies-audit, name of the model by default
+    """
+    title: str
+    url_path: str
+
+    @classmethod
+    def from_dict(cls, name: str, page_dict: Optional[dict[str, Any]]) -> PageSettings:
+        page_dict = page_dict if page_dict else {}
+        return PageSettings(title=str(page_dict.get("title", name)), url_path=str(page_dict.get("url_path", name)))
+
+    @classmethod
+    def from_config(cls, config: ModelConfig) -> PageSettings:
+        return cls.from_dict(config.name, config.config.get("page", None))
+
+
+class PageRegistry:
+    """
+    Navigation of the app, i.e. Data and Audit pages of each child config (in the order of child_configs) followed by
+    the Diagnostics pages
+    - pages are callables, so nothing of a model (e.g. its classes, see ModelConfig) is loaded until its page runs
+    """
+
+    DIAGNOSTICS: str = "Diagnostics"
+
+    @staticmethod
+    def get_pages(configs: dict[str, ModelConfig]) -> dict[str, list[StreamlitPage]]:
+        pages: dict[str, list[StreamlitPage]] = {}
+        for config in configs.values():
+            settings: PageSettings = PageSettings.from_config(config)
+            if settings.title in pages:
+                raise ValueError(f'Page title [{settings.title}] of [{config.name}] is not unique')
+
+            audit_page: StreamlitPage = st.Page(partial(PageUtil.update_table_audit_view, config), title="Audit",
+                                                url_path=f"{settings.url_path}-audit")
+            data_page: StreamlitPage = st.Page(partial(PageUtil.update_table_view, config, audit_page=audit_page),
+                                               title="Data", url_path=f"{settings.url_path}-data")
+            pages[settings.title] = [data_page, audit_page]
+
+        pages[PageRegistry.DIAGNOSTICS] = [st.Page(PageUtil.update_performance_view, title="Performance",
+                                                   url_path="performance")]
+        return pages
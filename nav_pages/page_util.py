@@ -1,61 +1,358 @@
-from typing import Type
+from dataclasses import asdict
+from typing import Any, Hashable, Optional, Type
 
 import pandas as pd
 import streamlit as st
+from streamlit.navigation.page import StreamlitPage
 
+from base.model import ModelMetaData
+from core.audit_diff import AuditDiff
+from core.data_cache import CacheStats
+from core.edit_window import EditWindow, WindowSettings
+from core.key_index import KeyIndex
+from core.metrics import Metrics
 from core.model_config import ModelConfig
 from core.model_session_data import ModelSessionData
-from core.persistence import Persistence
+from core.persistence import Persistence, PagingSettings
 from core.response_data import ResponseData
 from core.session_data_mgr import SessionDataMgr
+from core.session_pool import SessionPool
+from core.snapshot_store import SnapshotStore
+from core.table_compactor import TableCompactor
+from core.table_filter import FilterSpec, TableFilter
 from core.update_handler import UpdateHandler
 from enums import ModelSessionDataEnum
 from util import Util
 
 
 class PageUtil:
+    MAX_AUDIT_IDS: int = 1000  # ids whose histories can be shown at the same time
 
     @classmethod
-    def update_table_view(cls, config: ModelConfig):
+    def update_table_view(cls, config: ModelConfig, audit_page: Optional[str | StreamlitPage] = None):
+        """ if audit_page (i.e. its path or page) is provided, history of a row can be opened from the table as well """
+        with Metrics.timer("table_view_seconds", model=config.name):
+            df: pd.DataFrame = cls._update_table_view(config)
+        Metrics.export()
+
+        if audit_page:
+            cls._update_audit_jump(config, df, audit_page)
+
+    @classmethod
+    def _update_table_view(cls, config: ModelConfig) -> pd.DataFrame:
         model_data: ModelSessionData = SessionDataMgr.get_instance().get_model_data(config.name)
         df: pd.DataFrame = model_data.get_data(ModelSessionDataEnum.TableData)
 
+        filters: dict[str, Any] = cls._update_filter_bar(config)
+        if not Util.is_none_or_empty_df(df) and TableFilter.get_values(df) != filters:
+            # filters have changed, so the table (and the editor with unsaved changes) is of the previous filters
+            model_data.clear_data(ModelSessionDataEnum.TableData)
+            model_data.change_key(ModelSessionDataEnum.EditorData)
+            df = None
+
         if Util.is_none_or_empty_df(df):
-            data: ResponseData = Persistence.get_model_data(config)
+            data: ResponseData = cls._load_table(config, filters)
             if not data.is_valid():
                 # just use empty frame to allow adding new data
-                df = pd.DataFrame(columns=[column for column in config.model_class.get_column_config().keys()])
+                df = pd.DataFrame(columns=list(config.model_class.get_meta_data().column_order))
             else:
                 df = data.df
                 model_data.update_data(ModelSessionDataEnum.TableData, df)
 
-        update_handler: UpdateHandler = UpdateHandler(df, config)
-        st.data_editor(df, on_change=update_handler, key=model_data.get_key(ModelSessionDataEnum.EditorData),
-                       hide_index=True, num_rows="dynamic", use_container_width=True,
-                       column_config=config.model_class.get_column_config())
+        editor_df: pd.DataFrame = TableCompactor.for_editor(df, config.name)
+        window: Optional[EditWindow] = cls._get_edit_window(config, model_data, editor_df)
+        update_handler: UpdateHandler = UpdateHandler(editor_df, config, window)
+        if window is not None:
+            cls._update_window_bar(config, model_data, window, editor_df, update_handler)
+
+        st.data_editor(editor_df if window is None else window.get_window_df(editor_df), on_change=update_handler,
+                       key=model_data.get_key(ModelSessionDataEnum.EditorData), hide_index=True, num_rows="dynamic",
+                       use_container_width=True, column_config=config.model_class.get_meta_data().column_config)
+        return df
+
+    @staticmethod
+    def _get_edit_window(config: ModelConfig, model_data: ModelSessionData,
+                         editor_df: pd.DataFrame) -> Optional[EditWindow]:
+        """ None if the whole table fits in the editor, see WindowSettings """
+        settings: WindowSettings = WindowSettings.from_config(config)
+        if not settings.enabled or editor_df.shape[0] <= settings.window_size:
+            return None
+
+        window: EditWindow = EditWindow.for_table(model_data.get_data(ModelSessionDataEnum.WindowData), editor_df,
+                                                  settings.window_size)
+        model_data.update_data(ModelSessionDataEnum.WindowData, window)
+        return window
+
+    @classmethod
+    def _update_window_bar(cls, config: ModelConfig, model_data: ModelSessionData, window: EditWindow,
+                           editor_df: pd.DataFrame, update_handler: UpdateHandler):
+        """ Previous and Next windows of the table, edits of the current window are kept as pending edits """
+        window_number: int = window.start // window.size + 1
+        window_count: int = window.get_window_count(editor_df)
+        col1, col2, col3 = st.columns([2, 2, 12])
+        with col1:
+            st.button("Previous", key=f"{config.name}-window_previous", disabled=window_number == 1,
+                      on_click=cls._move_window, args=(model_data, window, editor_df, window.start - window.size,
+                                                       update_handler))
+        with col2:
+            st.button("Next", key=f"{config.name}-window_next", disabled=window_number == window_count,
+                      on_click=cls._move_window, args=(model_data, window, editor_df, window.start + window.size,
+                                                       update_handler))
+        with col3:
+            pending: str = ", changes of the other windows are kept until applied or discarded" if window.has_pending \
+                else ""
+            st.caption(f'Window {window_number} of {window_count}, i.e. rows {window.start + 1:,} to '
+                       f'{min(window.start + window.size, editor_df.shape[0]):,} of {editor_df.shape[0]:,}{pending}')
+
+    @staticmethod
+    def _move_window(model_data: ModelSessionData, window: EditWindow, editor_df: pd.DataFrame, start: int,
+                     update_handler: UpdateHandler):
+        window.move(editor_df, start, model_data.get_editor_state())
+        # a new editor for the new window, as the edits of the current one are pending edits now
+        model_data.change_key(ModelSessionDataEnum.EditorData)
+        if window.has_pending:
+            update_handler()  # changes of all the windows, along with Apply/Discard buttons
+
+    @staticmethod
+    def _update_filter_bar(config: ModelConfig) -> dict[str, Any]:
+        """ Filters (see TableFilter) of the table, by query parameter, only the active ones (i.e. not empty) """
+        specs: list[FilterSpec] = TableFilter.get_specs(config)
+        if not specs:
+            return {}
+
+        field_types: dict[str, Any] = {field_info.alias or name: field_info.annotation for name, field_info in
+                                       config.model_class.model_fields.items()}
+        values: dict[str, Any] = {}
+        # widgets in a form don't trigger a rerun until submitted, so a partial value doesn't reload the table
+        with st.form(key=f"{config.name}-filter_form", border=False):
+            for column, spec in zip(st.columns(len(specs)), specs):
+                key: str = f"{config.name}-filter-{spec.param}"
+                with column:
+                    if field_types.get(spec.column) in (int, float) and spec.op != "contains":
+                        step: int | float = 1 if field_types[spec.column] is int else 0.1
+                        values[spec.param] = st.number_input(spec.get_label(), value=None, step=step, key=key)
+                    else:
+                        values[spec.param] = st.text_input(spec.get_label(), key=key)
+
+            st.form_submit_button("Apply Filters", help="Only the matching rows are loaded, unsaved changes are lost")
+
+        return TableFilter.get_active(values)
+
+    @classmethod
+    def _update_audit_jump(cls, config: ModelConfig, df: pd.DataFrame, audit_page: str | StreamlitPage):
+        """ Opens the audit page for an id, but only if the id exists in the table (looked up in its KeyIndex) """
+        id_fields: tuple[str, ...] = config.model_class.get_meta_data().id_fields
+        if len(id_fields) != 1 or Util.is_none_or_empty_df(df):
+            return  # audit is by a single id
+
+        with st.form(key=f"{config.name}-audit_jump_form", border=False):
+            text: str = st.text_input("Show history of Id", key=f"{config.name}-audit_jump_input")
+            is_submitted: bool = st.form_submit_button("Show History")
+
+        if not is_submitted or not text.strip():
+            return
+
+        key_index: KeyIndex = KeyIndex.for_df(df, id_fields)
+        key: Optional[Hashable] = key_index.parse_key(df, text)
+        if key is None or key not in key_index:
+            st.error(f'Id [{text.strip()}] is not in the table', icon="🚨")
+            return
+
+        # audit page picks the id from its input widget's state
+        st.session_state[cls._get_audit_input_key(config, int if isinstance(key, int) else str)] = key
+        st.switch_page(audit_page)
+
+    @staticmethod
+    def _get_id_type(config: ModelConfig) -> Type[int | str]:
+        id_field: str = config.model_class.get_meta_data().id_fields[0]
+        for name, field_info in config.model_class.model_fields.items():
+            if id_field in (name, field_info.alias):
+                return int if field_info.annotation is int else str
+
+        return str
+
+    @staticmethod
+    def _get_audit_input_key(config: ModelConfig, id_type: Type[int | str]) -> str:
+        return f"{config.name}-number_input" if id_type is int else f"{config.name}-string_input"
+
+    @classmethod
+    def _load_table(cls, config: ModelConfig, filters: dict[str, Any]) -> ResponseData:
+        """ If configured, the first page is rendered (read only) while the remaining pages are being fetched """
+        paging: PagingSettings = PagingSettings.from_config(config)
+        if not paging.enabled or not paging.first_page_fast or Persistence.is_model_data_cached(config, filters):
+            return Persistence.get_model_data(config, filters=filters)
+
+        first_page: ResponseData = Persistence.get_model_data_page(config, 0, filters)
+        if not first_page.is_valid():
+            return first_page
+
+        if first_page.df.shape[0] < paging.page_size:
+            # just one page, but it is still filtered, compacted and cached as the whole table
+            return Persistence.get_model_data(config, first_page=first_page, filters=filters)
+
+        placeholder = st.empty()
+        with placeholder.container():
+            st.caption("Loading remaining rows, the table will be editable once all of them are loaded...")
+            st.dataframe(first_page.df, hide_index=True, use_container_width=True,
+                         column_config=config.model_class.get_meta_data().column_config)
+
+        data: ResponseData = Persistence.get_model_data(config, first_page=first_page, filters=filters)
+        placeholder.empty()
+        return data
+
+    @classmethod
+    def update_table_audit_view(cls, config: ModelConfig, id_type: Optional[Type[int | str]] = None):
+        """ id_type is the type of the id field of the model, by default """
+        id_type = id_type if id_type is not None else cls._get_id_type(config)
+        changes_only: bool = st.toggle("Changes only", value=True, key=f"{config.name}-audit_changes_only",
+                                       help="Only the fields changed by each version, colored by its operation")
+        single_tab, multiple_tab = st.tabs(["Single Id", "Multiple Ids"])
+        with single_tab:
+            cls._update_audit_view(config, id_type, changes_only)
+        with multiple_tab:
+            cls._update_audits_view(config, id_type, changes_only)
 
     @classmethod
-    def update_table_audit_view(cls, config: ModelConfig, id_type: Type[int | str]):
-        if id_type is int:
-            model_id: int = int(st.number_input("Please enter Id", min_value=0, max_value=100_000_000, step=1,
-                                                key=f"{config.name}-number_input"))
+    def _update_audit_view(cls, config: ModelConfig, id_type: Type[int | str], changes_only: bool):
+        # widgets in a form don't trigger a rerun until submitted, so partial ids don't reach the backend
+        with st.form(key=f"{config.name}-audit_form", border=False):
+            if id_type is int:
+                model_id: int = int(st.number_input("Please enter Id", min_value=0, max_value=100_000_000, step=1,
+                                                    key=cls._get_audit_input_key(config, int)))
 
-            if model_id <= 0:
-                return
+            elif id_type is str:
+                model_id: str = st.text_input("Please enter Id", key=cls._get_audit_input_key(config, str)).strip()
 
-        elif id_type is str:
-            model_id: str = st.text_input("Please enter Id", key=f"{config.name}-string_input")
-            if not model_id:
-                return
+            else:
+                raise TypeError(f"Unsupported id type {id_type}")
+
+            st.form_submit_button("Show History")
 
-        else:
-            raise TypeError(f"Unsupported id type {id_type}")
+        if not model_id:  # i.e. 0 or an empty string
+            return
 
         data: ResponseData = Persistence.get_model_audit_data(config, model_id=model_id)
         if not data.is_valid():
             st.error(data.error_msg, icon="🚨")
             return
 
-        st.dataframe(data.df, use_container_width=True,
-                     column_order=config.model_audit_class.get_column_config().keys(),
-                     column_config=config.model_audit_class.get_column_config())
+        cls._update_audit_df_view(config, data.df, changes_only)
+
+    @classmethod
+    def _update_audits_view(cls, config: ModelConfig, id_type: Type[int | str], changes_only: bool):
+        """ Histories of multiple ids (e.g. 1, 5, 10-20), in a single frame """
+        with st.form(key=f"{config.name}-audits_form", border=False):
+            help_text: str = "e.g. 1, 5, 10-20" if id_type is int else "separated by commas or new lines"
+            text: str = st.text_area(f"Please enter Ids (at most {cls.MAX_AUDIT_IDS:,})", help=help_text,
+                                     key=f"{config.name}-audits_input")
+            is_submitted: bool = st.form_submit_button("Show Histories")
+
+        if not is_submitted or not text.strip():
+            return
+
+        try:
+            model_ids: list[int | str] = cls._parse_ids(text, id_type)
+        except ValueError as err:
+            st.error(str(err), icon="🚨")
+            return
+
+        data: ResponseData = Persistence.get_model_audits_data(config, model_ids)
+        if not data.is_valid():
+            st.error(data.error_msg, icon="🚨")
+            return
+
+        meta_data: ModelMetaData = config.model_audit_class.get_meta_data()
+        found_ids: set[str] = set(data.df[meta_data.id_fields[0]].astype(str))
+        missing_ids: list[str] = [str(model_id) for model_id in model_ids if str(model_id) not in found_ids]
+        st.caption(f'{data.df.shape[0]:,} changes of {len(model_ids) - len(missing_ids):,} ids' +
+                   (f', no history of: {", ".join(missing_ids[:20])}{", ..." if len(missing_ids) > 20 else ""}'
+                    if missing_ids else ''))
+        cls._update_audit_df_view(config, data.df, changes_only)
+
+    @staticmethod
+    def _update_audit_df_view(config: ModelConfig, df: pd.DataFrame, changes_only: bool):
+        """ if changes_only, then versions are shown as diffs, see AuditDiff """
+        meta_data: ModelMetaData = config.model_audit_class.get_meta_data()
+        st.dataframe(AuditDiff.get_view(df, meta_data.id_fields, meta_data.column_config) if changes_only else df,
+                     use_container_width=True, column_order=meta_data.column_order,
+                     column_config=meta_data.column_config)
+
+    @classmethod
+    def _parse_ids(cls, text: str, id_type: Type[int | str]) -> list[int | str]:
+        """ ids are separated by commas (or new lines), and for int ids, a range (e.g. 10-20) includes both ends """
+        model_ids: list[int | str] = []
+        for token in [token.strip() for token in text.replace('\n', ',').split(',') if token.strip()]:
+            if id_type is not int:
+                model_ids.append(token)
+                continue
+
+            first, _, last = token.partition('-')
+            if not first.strip().isdigit() or (last and not last.strip().isdigit()):
+                raise ValueError(f'[{token}] is neither an id nor a range of ids (e.g. 10-20)')
+
+            start, end = int(first), int(last) if last else int(first)
+            if end < start or end - start >= cls.MAX_AUDIT_IDS:
+                raise ValueError(f'Range [{token}] is either reversed or has more than {cls.MAX_AUDIT_IDS:,} ids')
+            model_ids.extend(range(start, end + 1))
+
+        model_ids = list(dict.fromkeys(model_ids))
+        if len(model_ids) > cls.MAX_AUDIT_IDS:
+            raise ValueError(f'There are {len(model_ids):,} ids, but at most {cls.MAX_AUDIT_IDS:,} can be shown')
+        return model_ids
+
+    @classmethod
+    def update_performance_view(cls):
+        if not Metrics.enabled:
+            st.info("Metrics are disabled, set enabled = true in [metrics] section of config.toml to record these")
+
+        col1, col2, _ = st.columns([2, 2, 12])
+        with col1:
+            st.download_button("Prometheus text", data=Metrics.to_prometheus(), file_name="metrics.prom")
+        with col2:
+            st.button("Reset", on_click=Metrics.reset)
+
+        st.subheader("Latencies and sizes")
+        st.dataframe(cls._get_histograms_df(), hide_index=True, use_container_width=True)
+
+        st.subheader("Counters")
+        st.dataframe(pd.DataFrame([{"metric": name, "labels": cls._format_labels(labels), "value": value}
+                                   for (name, labels), value in sorted(Metrics.get_counters().items())],
+                                  columns=["metric", "labels", "value"]), hide_index=True, use_container_width=True)
+
+        st.subheader("Caches")
+        cache_stats: dict[str, CacheStats] = {cache.name: cache.get_stats() for cache in
+                                              (Persistence.table_cache, Persistence.audit_cache)}
+        st.dataframe(pd.DataFrame([dict(cache=name, hit_ratio=stats.hit_ratio, **asdict(stats))
+                                   for name, stats in cache_stats.items()]), hide_index=True, use_container_width=True)
+
+        st.subheader("Table memory")
+        st.dataframe(pd.DataFrame([dict(asdict(report), saved_ratio=report.saved_ratio)
+                                   for report in TableCompactor.get_reports().values()],
+                                  columns=["model", "rows", "bytes_before", "bytes_after", "editor_bytes",
+                                           "saved_ratio"]),
+                     hide_index=True, use_container_width=True)
+
+        st.subheader("Table snapshots")
+        st.dataframe(pd.DataFrame([asdict(snapshot) for snapshot in SnapshotStore.get_snapshots()],
+                                  columns=["model", "version", "refs", "size"]), hide_index=True,
+                     use_container_width=True)
+
+        st.subheader("Connection pool")
+        st.dataframe(pd.DataFrame([SessionPool.get_stats()]), hide_index=True, use_container_width=True)
+
+    @classmethod
+    def _get_histograms_df(cls) -> pd.DataFrame:
+        """ seconds are shown in milliseconds, and quantiles are upper bounds of their buckets """
+        rows: list[dict] = []
+        for (name, labels), histogram in sorted(Metrics.get_histograms().items()):
+            scale: float = 1000 if name.endswith("_seconds") else 1
+            rows.append({"metric": name.replace("_seconds", "_ms"), "labels": cls._format_labels(labels),
+                         "count": histogram.count, "mean": histogram.total / histogram.count * scale,
+                         "p50": histogram.get_quantile(0.5) * scale, "p95": histogram.get_quantile(0.95) * scale,
+                         "total": histogram.total * scale})
+
+        return pd.DataFrame(rows, columns=["metric", "labels", "count", "mean", "p50", "p95", "total"])
+
+    @staticmethod
+    def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+        return ', '.join([f'{key}={value}' for key, value in labels])
@@ -0,0 +1,6 @@
+"""
+A local (stdlib only) stand-in for the MoviesDB backend, to measure the app end to end on a single machine
+e.g. python -m stub_backend.server --port 8080 --rows 100000 --latency-ms 20 --error-rate 0.01
+- endpoints are read from the child configs, so the app can be pointed to it without any change
+- it is not a replacement of the backend, e.g. data is in memory and there is hardly any validation
+"""
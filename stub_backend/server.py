@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import tomllib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from stub_backend.store import DEFAULT_CSV, MODEL_SPECS, ModelStore, StoreError
+
+CONFIG_DIR: Path = Path(__file__).parent.parent / "configs"
+CHILD_CONFIGS: tuple[str, ...] = ("movies.toml", "super_hero.toml")
+
+
+@dataclass(frozen=True)
+class FaultSettings:
+    """
+    Injected into every request, to see how the app behaves with a slow (or flaky) backend
+    - latency_ms (+ a random jitter up to jitter_ms) is added before responding
+    - error_rate is the probability of responding with 500 instead of handling the request
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class Route:
+    kind: str  # "model", "audit" or "changes"
+    store: ModelStore
+    filters: tuple[tuple[str, str, str], ...] = ()  # (param, column, op) of [apis.model.filters]
+    batch_param: str = "ids"  # of [apis.model_audit], the backend might not support it, but the stub always does
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """ Routes are matched by the longest prefix, e.g. /superhero/all/1/ is audit, not /superhero/ """
+    server: StubServer
+    protocol_version = "HTTP/1.1"  # keep-alive, same as the backend
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        if self.server.backend.inject_faults():
+            return self._send(500, "Injected error")
+
+        url = urlsplit(self.path)
+        route, remainder = self.server.backend.get_route(url.path)
+        if route is None:
+            return self._send(404, f"No route for {url.path}")
+
+        try:
+            payload: Optional[list] = self._dispatch(method, route, remainder.strip('/'), parse_qs(url.query), body)
+        except StoreError as err:
+            return self._send(err.status, str(err))
+        except (ValueError, KeyError, TypeError) as err:
+            return self._send(400, f"Bad request: {err}")
+
+        self._send(200, None if payload is None else json.dumps(payload))
+
+    def _dispatch(self, method: str, route: Route, remainder: str, query: dict[str, list[str]],
+                  body: bytes) -> Optional[list]:
+        if route.kind == "audit" and method == "GET" and remainder:
+            return route.store.get_audit(remainder)
+
+        if route.kind == "audit" and method == "GET" and route.batch_param in query:
+            return route.store.get_audits([model_id.strip() for model_id in query[route.batch_param][0].split(',')])
+
+        if route.kind == "changes" and method == "GET" and remainder:
+            return route.store.get_latest_change() if remainder == "latest" else route.store.get_changes(int(remainder))
+
+        if route.kind != "model" or remainder:
+            raise StoreError(404, f"No route for {method} {self.path}")
+
+        if method == "GET":
+            filters: list[tuple[str, str, str]] = [(column, op, query[param][0]) for param, column, op in route.filters
+                                                   if param in query]
+            if "page" in query and "size" in query:
+                return route.store.get_rows(int(query["page"][0]), int(query["size"][0]), filters)
+            return route.store.get_rows(filters=filters)
+
+        data: Any = json.loads(body or b"null")
+        if method == "DELETE":
+            route.store.delete(data)
+        elif method == "POST":
+            route.store.add(data[route.store.spec.list_field])
+        else:
+            route.store.update(data[route.store.spec.list_field])
+        return None
+
+    def _send(self, status: int, text: Optional[str]) -> None:
+        content: bytes = text.encode() if text else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json" if status == 200 else "text/plain")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.backend.verbose:
+            super().log_message(format, *args)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], backend: StubBackend):
+        super().__init__(address, StubRequestHandler)
+        self.backend: StubBackend = backend
+
+
+class StubBackend:
+    """
+    Serves the endpoints of the child configs (same payloads as the backend) from in memory stores, i.e.
+    - [apis.model]: GET (whole table or a page with page and size query params), POST, PUT and DELETE
+        -- GET also accepts the query params of [apis.model.filters], i.e. only the matching rows are returned
+    - [apis.model_audit]: GET {get}{id}/, and GET {get}?ids=1,2,3 for histories of multiple ids (see AuditSettings)
+    - [apis.model_changes]: GET {get}{version}/ and {get}latest/, even if it is not configured (see ModelSpec), as
+    the configs leave it out for the backend
+    e.g. to use it in a test:
+        with StubBackend.from_configs(rows=1000) as backend:
+            config.port = backend.port
+    """
+
+    def __init__(self, routes: dict[str, Route], faults: FaultSettings = FaultSettings(), host: str = "localhost",
+                 port: int = 0, verbose: bool = False):
+        self.routes: dict[str, Route] = routes
+        self.faults: FaultSettings = faults
+        self.verbose: bool = verbose
+        self._prefixes: list[str] = sorted(routes.keys(), key=len, reverse=True)
+        self._random: random.Random = random.Random(faults.seed)
+        self._random_lock: threading.Lock = threading.Lock()
+        self._server: StubServer = StubServer((host, port), self)
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_configs(cls, rows: int = 1000, faults: FaultSettings = FaultSettings(), host: str = "localhost",
+                     port: int = 0, config_paths: Optional[list[Path]] = None, csv_path: Path = DEFAULT_CSV,
+                     seed: int = 0, verbose: bool = False) -> StubBackend:
+        """ port 0 means any free port, see port """
+        routes: dict[str, Route] = {}
+        for config_path in config_paths or [CONFIG_DIR / name for name in CHILD_CONFIGS]:
+            with config_path.open("rb") as fp:
+                config: dict = tomllib.load(fp)
+
+            spec = MODEL_SPECS[config["name"]]
+            store: ModelStore = ModelStore(spec, spec.generator(rows, csv_path, seed))
+            apis: dict = config["apis"]
+            filters: tuple[tuple[str, str, str], ...] = tuple(
+                (param, spec["column"], spec["op"]) for param, spec in apis["model"].get("filters", {}).items())
+            routes[apis["model"]["get"]] = Route("model", store, filters)
+            routes[apis["model_audit"]["get"]] = Route("audit", store,
+                                                       batch_param=apis["model_audit"].get("batch_param") or "ids")
+            routes[apis.get("model_changes", {}).get("get", spec.changes_path)] = Route("changes", store)
+
+        return cls(routes, faults, host, port, verbose)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f'http://{self._server.server_address[0]}:{self.port}'
+
+    def get_route(self, path: str) -> tuple[Optional[Route], str]:
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self.routes[prefix], path[len(prefix):]
+        return None, path
+
+    def inject_faults(self) -> bool:
+        """ sleeps for the configured latency, and returns True if the request must fail """
+        with self._random_lock:
+            jitter: float = self._random.uniform(0, self.faults.jitter_ms) if self.faults.jitter_ms else 0.0
+            is_error: bool = self._random.random() < self.faults.error_rate
+
+        if self.faults.latency_ms or jitter:
+            time.sleep((self.faults.latency_ms + jitter) / 1000)
+        return is_error
+
+    def serve_forever(self) -> None:
+        """ blocks the calling thread, see start to serve in the background instead """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> StubBackend:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> StubBackend:
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the backend endpoints of the child configs from memory")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rows", type=int, default=1000, help="rows of each table, the csv is repeated as needed")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="e.g. 0.01 means 1%% of requests fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    faults: FaultSettings = FaultSettings(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                          error_rate=args.error_rate, seed=args.seed)
+    backend: StubBackend = StubBackend.from_configs(rows=args.rows, faults=faults, host=args.host, port=args.port,
+                                                    csv_path=args.csv, seed=args.seed, verbose=args.verbose)
+    print(f'Serving {args.rows} rows of each table on {backend.url}, routes: {list(backend.routes.keys())}')
+    try:
+        backend.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import csv
+import random
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+DEFAULT_CSV: Path = Path(__file__).parent.parent / "data" / "good_movies.csv"
+AWARDS: list[str] = ["Oscar", "Golden Globe", "BAFTA", "Emmy", "Saturn Award", "MTV Movie Award"]
+
+
+class StoreError(Exception):
+    """ Rejected request, with the http status code to be sent back """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status: int = status
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """ How the backend identifies the rows of a model and what it expects in the body of POST/PUT requests """
+    id_field: str  # by alias, e.g. 'id'
+    list_field: str  # e.g. 'movieEntities'
+    generator: Callable[[int, Path, int], list[dict[str, Any]]]  # rows, csv path and seed
+    changes_path: str  # of the changes end point, unless the config has [apis.model_changes]
+
+
+class ModelStore:
+    """
+    In memory table of a model, along with its audit log
+    - every change is appended to the log with the next version, i.e. versions are a global sequence of changes
+    - rows loaded at the start have version 0 in their audit, but these are not part of the log (see get_changes)
+    Ids are compared as str, as ids in urls are str but the same ids in request bodies might be int
+    """
+
+    def __init__(self, spec: ModelSpec, rows: list[dict[str, Any]]):
+        self.spec: ModelSpec = spec
+        self._lock: threading.Lock = threading.Lock()
+        self._rows: dict[str, dict[str, Any]] = {self._key(row): row for row in rows}
+        self._initial: dict[str, dict[str, Any]] = dict(self._rows)
+        self._log: list[dict[str, Any]] = []
+        self._log_by_id: dict[str, list[int]] = {}
+        self._sorted: Optional[list[dict[str, Any]]] = None
+
+    def _key(self, row: dict[str, Any]) -> str:
+        if self.spec.id_field not in row:
+            raise StoreError(400, f'[{self.spec.id_field}] is missing in {row}')
+        return str(row[self.spec.id_field])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_rows(self, page: Optional[int] = None, size: Optional[int] = None,
+                 filters: Optional[list[tuple[str, str, str]]] = None) -> list[dict[str, Any]]:
+        """
+        sorted by id, all the rows if page (0 based) and size are not provided
+        - filters are (column, op, value), and a page is of the matching rows, see TableFilter for the ops
+        """
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self._rows.values(), key=lambda row: row[self.spec.id_field])
+            rows: list[dict[str, Any]] = self._sorted
+
+        if filters:
+            rows = [row for row in rows if all(_match(row.get(column), op, value) for column, op, value in filters)]
+
+        if page is None or size is None:
+            return rows
+        return rows[page * size: (page + 1) * size]
+
+    def get_audit(self, model_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            initial: list[dict[str, Any]] = [dict(self._initial[model_id], version=0, operation="New")] \
+                if model_id in self._initial else []
+            return initial + [self._log[index] for index in self._log_by_id.get(model_id, [])]
+
+    def get_audits(self, model_ids: list[str]) -> list[dict[str, Any]]:
+        """ histories of all the ids, one after the other """
+        return [row for model_id in dict.fromkeys(model_ids) for row in self.get_audit(model_id)]
+
+    def get_changes(self, since: int) -> list[dict[str, Any]]:
+        """ audit rows of all the changes after version since """
+        with self._lock:
+            return self._log[max(since, 0):]
+
+    def get_latest_change(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return self._log[-1:]
+
+    def add(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            keys: list[str] = [self._key(row) for row in rows]
+            existing: list[str] = [key for key in keys if key in self._rows]
+            if existing or len(set(keys)) != len(keys):
+                raise StoreError(409, f'Rows already exist (or are repeated): {existing[:10]}')
+            self._write(keys, rows, "New")
+
+    def update(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            keys: list[str] = [self._key(row) for row in rows]
+            missing: list[str] = [key for key in keys if key not in self._rows]
+            if missing:
+                raise StoreError(404, f'Rows do not exist: {missing[:10]}')
+            self._write(keys, rows, "Edited")
+
+    def delete(self, ids: list[Any]) -> None:
+        with self._lock:
+            keys: list[str] = [str(model_id) for model_id in ids]
+            missing: list[str] = [key for key in keys if key not in self._rows]
+            if missing:
+                raise StoreError(404, f'Rows do not exist: {missing[:10]}')
+            self._write(keys, [self._rows[key] for key in keys], "Deleted")
+
+    def _write(self, keys: list[str], rows: list[dict[str, Any]], operation: str) -> None:
+        """ Expected to be called with lock held, and after the whole request is validated """
+        for key, row in zip(keys, rows):
+            if operation == "Deleted":
+                self._rows.pop(key)
+            else:
+                self._rows[key] = row
+
+            self._log.append(dict(row, version=len(self._log) + 1, operation=operation))
+            self._log_by_id.setdefault(key, []).append(len(self._log) - 1)
+
+        self._sorted = None
+
+
+def _match(value: Any, op: str, expected: str) -> bool:
+    if value is None:
+        return False
+    if op == "contains":
+        return expected.lower() in str(value).lower()
+    if op == "eq":
+        return str(value) == expected
+    return float(value) >= float(expected) if op == "ge" else float(value) <= float(expected)
+
+
+def _read_csv(csv_path: Path) -> list[dict[str, str]]:
+    with csv_path.open(newline="") as fp:
+        return [{key.strip(): value for key, value in row.items()} for row in csv.DictReader(fp, skipinitialspace=True)]
+
+
+def load_movies(rows: int, csv_path: Path = DEFAULT_CSV, seed: int = 0) -> list[dict[str, Any]]:
+    """ rows of the csv, repeated (with some noise) as many times as needed, by alias """
+    base: list[dict[str, str]] = _read_csv(csv_path)
+    rnd: random.Random = random.Random(seed)
+    movies: list[dict[str, Any]] = []
+    for i in range(rows):
+        row: dict[str, str] = base[i % len(base)]
+        copy_number: int = i // len(base)
+        votes: int = int(row["votes"]) + (rnd.randint(0, 1000) if copy_number else 0)
+        movies.append({"id": i + 1, "title": row["title"] if not copy_number else f'{row["title"]} {copy_number}',
+                       "year": int(row["year"]), "votes": votes, "rating": float(row["rating"]),
+                       "genres": row["genres"]})
+    return movies
+
+
+def load_super_heros(rows: int, csv_path: Path = DEFAULT_CSV, seed: int = 0) -> list[dict[str, Any]]:
+    """ imdb links are from the csv, awards are a list (as the backend maintains these), by alias """
+    base: list[dict[str, str]] = _read_csv(csv_path)
+    rnd: random.Random = random.Random(seed)
+    return [{"superHeroId": f"hero{i + 1}", "name": f"Hero {i + 1}", "imdbLink": base[i % len(base)]["link"],
+             "awards": rnd.sample(AWARDS, rnd.randint(1, 3))} for i in range(rows)]
+
+
+# by the name in the child config
+MODEL_SPECS: dict[str, ModelSpec] = {
+    "movies": ModelSpec(id_field="id", list_field="movieEntities", generator=load_movies,
+                        changes_path="/movies-changes/"),
+    "super_hero": ModelSpec(id_field="superHeroId", list_field="superHeroDtoList", generator=load_super_heros,
+                            changes_path="/superhero/changes/"),
+}
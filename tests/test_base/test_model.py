@@ -0,0 +1,47 @@
+from typing import Any
+from unittest import TestCase
+
+from base.model import Model, ModelMetaData
+from impl.movie import Movie, MovieAudit
+from impl.super_hero import SuperHero, SuperHeroAudit
+
+
+column_config_calls: list[type] = []
+
+
+class CountingModel(Model):
+
+    @classmethod
+    def get_column_config(cls) -> dict[str, Any]:
+        column_config_calls.append(cls)
+        return {"id": {"label": "Id"}, "name": {"label": "Name"}}
+
+    @classmethod
+    def get_id_fields(cls) -> tuple[str, ...]:
+        return 'id', 'name'
+
+
+class TestModel(TestCase):
+
+    def test_meta_data_is_built_once(self):
+        meta_data: ModelMetaData = CountingModel.get_meta_data()
+        self.assertIs(meta_data, CountingModel.get_meta_data())
+        self.assertEqual([CountingModel], column_config_calls)
+        self.assertEqual(("id", "name"), meta_data.id_fields)
+        self.assertEqual(("id", "name"), meta_data.column_order)
+
+    def test_meta_data_is_read_only(self):
+        meta_data: ModelMetaData = Movie.get_meta_data()
+        with self.assertRaises(TypeError):
+            meta_data.column_config["id"] = None
+        with self.assertRaises(TypeError):
+            meta_data.dtype_hints["id"] = "int32"
+
+    def test_meta_data_per_class(self):
+        self.assertEqual(("superHeroId",), SuperHero.get_meta_data().id_fields)
+        self.assertEqual({"awards": "category"}, dict(SuperHero.get_meta_data().dtype_hints))
+        self.assertEqual(SuperHero.get_meta_data().column_order + ("version", "operation"),
+                         SuperHeroAudit.get_meta_data().column_order)
+
+        # audit classes reuse the column configs of their models
+        self.assertIs(Movie.get_meta_data().column_config["title"], MovieAudit.get_meta_data().column_config["title"])
@@ -0,0 +1,65 @@
+from typing import ClassVar, Type
+from unittest import TestCase
+
+import pandas as pd
+from pydantic import ValidationError
+
+from base.model import Model
+from base.model_list import ModelList
+from impl.movie import Movie, MoviesList
+from impl.super_hero import SuperHeroList
+
+
+class CompositeKeyModel(Model):
+    first: str
+    second: int
+    value: float
+
+    @classmethod
+    def get_id_fields(cls) -> tuple[str, ...]:
+        return 'first', 'second'
+
+
+class CompositeKeyModelList(ModelList):
+    item_class: ClassVar[Type[Model]] = CompositeKeyModel
+    items: list[CompositeKeyModel]
+
+
+class TestModelList(TestCase):
+
+    def setUp(self):
+        self.movies: pd.DataFrame = pd.DataFrame([
+            {"id": 2, "title": "Title 2", "year": 2000, "votes": 10, "rating": 5.5, "genres": "Drama"},
+            {"id": 1, "title": "Title 1", "year": 2001, "votes": 20, "rating": 7, "genres": "Action"},
+        ])
+
+    def test_from_df(self):
+        movies_list: MoviesList = MoviesList.from_df(self.movies)
+        self.assertEqual([Movie.model_validate(m) for m in self.movies.to_dict('records')], movies_list.movies)
+        self.assertEqual(MoviesList(movies=movies_list.movies).model_dump_json(by_alias=True),
+                         movies_list.model_dump_json(by_alias=True))
+        self.assertIsNone(MoviesList.from_df(self.movies.iloc[0:0]))
+
+    def test_from_df_validates(self):
+        self.movies.loc[1, "title"] = None
+        with self.assertRaises(ValidationError):
+            MoviesList.from_df(self.movies)
+
+    def test_get_ids(self):
+        self.assertEqual([2, 1], MoviesList.get_ids(self.movies))
+        self.assertEqual([], MoviesList.get_ids(self.movies.iloc[0:0]))
+        heroes: pd.DataFrame = pd.DataFrame([{"superHeroId": "hero", "name": "Hero", "imdbLink": "link",
+                                              "awards": "Oscar"}])
+        self.assertEqual(["hero"], SuperHeroList.get_ids(heroes))
+
+    def test_composite_key(self):
+        df: pd.DataFrame = pd.DataFrame([{"first": "a", "second": 1, "value": 0.5},
+                                         {"first": "a", "second": 2, "value": 1.5}])
+        self.assertEqual([("a", 1), ("a", 2)], CompositeKeyModelList.get_ids(df))
+        self.assertEqual(2, len(CompositeKeyModelList.from_df(df).items))
+
+    def test_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            ModelList.from_df(self.movies)
+        with self.assertRaises(NotImplementedError):
+            ModelList.get_ids(self.movies)
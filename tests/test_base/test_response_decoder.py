@@ -0,0 +1,62 @@
+import json
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from base.response_decoder import PandasJsonDecoder, SchemaJsonDecoder
+from impl.movie import Movie, MovieAudit
+from impl.super_hero import SuperHero
+
+
+class TestResponseDecoder(TestCase):
+
+    def setUp(self):
+        self.movies: list[dict] = [
+            {"id": 2, "title": "1984", "year": 1984, "votes": 10, "rating": 7, "genres": "Drama"},
+            {"id": 1, "title": "Title", "year": 2000, "votes": 20, "rating": 5.5, "genres": "Action,Drama"},
+        ]
+
+    def test_get_dtypes(self):
+        self.assertEqual({"id": int, "title": str, "year": int, "votes": int, "rating": float, "genres": str},
+                         SchemaJsonDecoder.get_dtypes(Movie))
+        self.assertEqual(int, SchemaJsonDecoder.get_dtypes(MovieAudit)["version"])
+        self.assertEqual(str, SchemaJsonDecoder.get_dtypes(MovieAudit)["operation"])
+        self.assertEqual(["superHeroId", "name", "imdbLink", "awards"], list(SchemaJsonDecoder.get_dtypes(SuperHero)))
+
+    def test_decode_as_per_schema(self):
+        df: pd.DataFrame = SchemaJsonDecoder.decode(json.dumps(self.movies).encode(), Movie)
+        self.assertEqual(list(self.movies[0].keys()), df.columns.to_list())
+        self.assertEqual(self.movies, df.to_dict("records"))
+        self.assertEqual(np.int64, df["id"].dtype)
+        self.assertEqual(np.float64, df["rating"].dtype)  # even though first value is an int
+
+    def test_decode_with_missing_values(self):
+        self.movies[1]["votes"] = None
+        del self.movies[1]["genres"]
+        df: pd.DataFrame = SchemaJsonDecoder.decode(json.dumps(self.movies).encode(), Movie)
+        self.assertEqual(np.float64, df["votes"].dtype)
+        self.assertTrue(np.isnan(df.loc[1, "votes"]))
+        self.assertIsNone(df.loc[1, "genres"])
+
+    def test_decode_list_values(self):
+        heroes: list[dict] = [{"superHeroId": "1", "name": "Hero", "imdbLink": "link", "awards": ["A", "B"]},
+                              {"superHeroId": "2", "name": "Hero", "imdbLink": "link", "awards": ["C", "D"]}]
+        df: pd.DataFrame = SchemaJsonDecoder.decode(json.dumps(heroes).encode(), SuperHero)
+        self.assertEqual([["A", "B"], ["C", "D"]], df["awards"].to_list())
+
+    def test_decode_string_ids(self):
+        heroes: list[dict] = [{"superHeroId": "007", "name": "Bond", "imdbLink": "link", "awards": []}]
+        content: bytes = json.dumps(heroes).encode()
+        self.assertEqual("007", SchemaJsonDecoder.decode(content, SuperHero).loc[0, "superHeroId"])
+
+        # pandas, on the other hand, guesses it to be a number
+        self.assertEqual(7, PandasJsonDecoder.decode(content).loc[0, "superHeroId"])
+
+    def test_decode_without_schema(self):
+        df: pd.DataFrame = SchemaJsonDecoder.decode(json.dumps(self.movies).encode())
+        self.assertEqual(self.movies, df.to_dict("records"))
+
+    def test_decode_empty(self):
+        self.assertIsNone(SchemaJsonDecoder.decode(b"", Movie))
+        self.assertTrue(SchemaJsonDecoder.decode(b"[]", Movie).empty)
@@ -0,0 +1,25 @@
+from unittest import TestCase
+
+from benchmarks.suite import CASES, Comparison, compare, run, to_json
+
+
+class TestSuite(TestCase):
+
+    def test_run(self):
+        results = run(list(CASES.keys()), [100], repeat=1)
+        self.assertEqual(list(CASES.keys()), [result.case for result in results])
+        self.assertTrue(all([result.seconds > 0 for result in results]))
+
+        data = to_json(results, repeat=1)
+        self.assertEqual({"case", "rows", "seconds"}, set(data["results"][0].keys()))
+        self.assertIn("pandas", data["environment"])
+
+    def test_compare(self):
+        baseline = {"results": [{"case": "a", "rows": 10, "seconds": 1.0}, {"case": "b", "rows": 10, "seconds": 1.0}]}
+        current = {"results": [{"case": "a", "rows": 10, "seconds": 1.5}, {"case": "c", "rows": 10, "seconds": 1.0}]}
+        self.assertEqual([Comparison("a", 10, 1.0, 1.5)], compare(baseline, current))
+
+    def test_is_regression(self):
+        self.assertTrue(Comparison("a", 10, 1.0, 1.3).is_regression(tolerance=0.25, min_seconds=0.001))
+        self.assertFalse(Comparison("a", 10, 1.0, 1.2).is_regression(tolerance=0.25, min_seconds=0.001))
+        self.assertFalse(Comparison("a", 10, 0.0001, 0.001).is_regression(tolerance=0.25, min_seconds=0.01))
@@ -0,0 +1,77 @@
+import time
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.io.formats.style import Styler
+
+from streamlit import dataframe_util
+from streamlit.elements.lib.pandas_styler_utils import marshall_styler
+from streamlit.proto.Arrow_pb2 import Arrow as ArrowProto
+
+from core.audit_diff import AuditDiff
+
+VERSIONS: int = 10_000
+BUDGET_SECONDS: float = 1.0  # for VERSIONS versions of an id, it is ~10 ms
+
+
+class TestAuditDiff(TestCase):
+
+    def setUp(self):
+        # versions are not in order, as these might not be in the response
+        self.df: pd.DataFrame = pd.DataFrame({
+            "id": [1, 2, 1, 1, 2],
+            "title": ["a", "x", "b", "b", "x"],
+            "rating": [np.nan, 5.0, np.nan, 6.0, 5.0],
+            "version": [0, 1, 2, 3, 4],
+            "operation": ["New", "New", "Edited", "Deleted", "Edited"],
+        }).iloc[[4, 0, 3, 2, 1]]
+
+    def test_changed(self):
+        df: pd.DataFrame = AuditDiff.sort(self.df, ("id",))
+        self.assertEqual([0, 2, 3, 1, 4], df["version"].to_list())
+
+        changed: pd.DataFrame = AuditDiff.get_changed(df, ("id",))
+        # 1st version of an id is all changes, and a missing value to a missing one is not a change
+        self.assertEqual([[True, True], [True, False], [False, True], [True, True], [False, False]],
+                         changed[["title", "rating"]].values.tolist())
+        self.assertFalse(changed[["id", "version", "operation"]].values.any())
+
+    def test_view(self):
+        view: Styler = AuditDiff.get_view(self.df, ("id",))
+        self.assertTrue(view.data.loc[4, ["title", "rating"]].isna().all())
+        self.assertEqual([2, 4, "Edited"], view.data.loc[4, ["id", "version", "operation"]].to_list())
+        self.assertEqual("b", view.data.loc[1, "title"])
+        # dtypes are retained, and ints are nullable rather than floats
+        self.assertEqual(["Int64", "object", "float64", "Int64", "object"], [str(dtype) for dtype in view.data.dtypes])
+
+        styles: dict[tuple[int, int], list] = view._compute().ctx  # by (row, column) position
+        self.assertEqual([("color", "orange")], styles[(1, 1)])  # i.e. title of the Edited version
+        self.assertEqual([("color", "red")], styles[(2, 4)])  # i.e. operation of the Deleted version
+
+    def test_display_values(self):
+        """ as rendered by streamlit, i.e. the display values of the Styler replace the values of the frame """
+        df: pd.DataFrame = pd.concat([self.df, pd.DataFrame([{"id": 2, "title": "y", "rating": 7.1, "version": 5,
+                                                              "operation": "Edited"}])], ignore_index=True)
+        column_config: dict = {"rating": {"label": "Rating", "type_config": {"type": "number", "format": "%.2f"}}}
+        for config, ratings in ((column_config, ["5.00", "7.10", "6.00"]), (None, ["5.0", "7.1", "6.0"])):
+            proto: ArrowProto = ArrowProto()
+            marshall_styler(proto, AuditDiff.get_view(df, ("id",), config), "uuid")
+            display_df: pd.DataFrame = dataframe_util.convert_arrow_bytes_to_pandas_df(proto.styler.display_values)
+
+            # i.e. versions 1, 4 and 5 of id 2, where unchanged fields are blank (and not None or nan)
+            self.assertEqual([["2", "x", ratings[0], "1"], ["2", "", "", "4"], ["2", "y", ratings[1], "5"]],
+                             display_df[["id", "title", "rating", "version"]].iloc[3:].values.tolist())
+            self.assertEqual(["", ratings[2]], display_df["rating"].iloc[[0, 2]].to_list())
+
+    def test_many_versions(self):
+        df: pd.DataFrame = pd.DataFrame({"id": 1, "title": np.arange(VERSIONS) // 2, "rating": 5.0,
+                                         "version": np.arange(VERSIONS), "operation": "Edited"})
+        start: float = time.perf_counter()
+        changed: pd.DataFrame = AuditDiff.get_changed(AuditDiff.sort(df, ("id",)), ("id",))
+        self.assertLess(time.perf_counter() - start, BUDGET_SECONDS)
+        self.assertEqual(VERSIONS // 2, int(changed["title"].sum()))
+        self.assertEqual(1, int(changed["rating"].sum()))
+
+        # too many cells to be styled, but still only the changes
+        self.assertIsInstance(AuditDiff.get_view(pd.concat([df] * 5, ignore_index=True), ("id",)), pd.DataFrame)
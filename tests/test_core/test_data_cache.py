@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from core.data_cache import DataCache, CacheStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDataCache(TestCase):
+
+    def setUp(self):
+        self.clock: FakeClock = FakeClock()
+        self.df: pd.DataFrame = pd.DataFrame(data=[[1, 2], [3, 4]], columns=["A", "B"])
+        self.size: int = int(self.df.memory_usage(index=True, deep=True).sum())
+        self.cache: DataCache = DataCache("test", ttl_seconds=10, max_size=self.size * 2, clock=self.clock)
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get(("model", "url")))
+        self.cache.put(("model", "url"), self.df)
+        self.assertIs(self.df, self.cache.get(("model", "url")))
+        self.assertIn(("model", "url"), self.cache)
+
+        stats: CacheStats = self.cache.get_stats()
+        self.assertEqual((1, 1, 1, self.size), (stats.hits, stats.misses, stats.entries, stats.size))
+        self.assertEqual(0.5, stats.hit_ratio)
+
+    def test_ttl(self):
+        self.cache.put(("model", "url"), self.df)
+        self.clock.now = 9.9
+        self.assertIs(self.df, self.cache.get(("model", "url")))
+
+        self.clock.now = 10
+        self.assertNotIn(("model", "url"), self.cache)
+        self.assertIsNone(self.cache.get(("model", "url")))
+        self.assertEqual(1, self.cache.get_stats().expirations)
+        self.assertEqual(0, self.cache.get_stats().size)
+
+    def test_lru_eviction(self):
+        self.cache.put(("model", 1), self.df)
+        self.cache.put(("model", 2), self.df.copy())
+        self.cache.get(("model", 1))  # 2 is now the least recently used one
+        self.cache.put(("model", 3), self.df.copy())
+
+        self.assertIn(("model", 1), self.cache)
+        self.assertNotIn(("model", 2), self.cache)
+        self.assertIn(("model", 3), self.cache)
+        self.assertEqual(1, self.cache.get_stats().evictions)
+        self.assertEqual(self.size * 2, self.cache.get_stats().size)
+
+        # an entry larger than the budget must not be cached at all
+        self.cache.put(("model", 4), pd.concat([self.df] * 10))
+        self.assertNotIn(("model", 4), self.cache)
+
+    def test_invalidate(self):
+        self.cache.configure(max_size=self.size * 10)
+        self.cache.put(("movies", "url", 1), self.df)
+        self.cache.put(("movies", "url", 2), self.df)
+        self.cache.put(("super_hero", "url", 1), self.df)
+
+        self.assertEqual(1, self.cache.invalidate("movies", "url", 1))
+        self.assertNotIn(("movies", "url", 1), self.cache)
+        self.assertIn(("movies", "url", 2), self.cache)
+
+        self.assertEqual(1, self.cache.invalidate("movies"))
+        self.assertIn(("super_hero", "url", 1), self.cache)
+        self.assertEqual(1, self.cache.invalidate())
+        self.assertEqual(0, self.cache.get_stats().entries)
+
+    def test_disabled(self):
+        self.cache.configure(ttl_seconds=0)
+        self.assertFalse(self.cache.enabled)
+        self.cache.put(("model", "url"), self.df)
+        self.assertNotIn(("model", "url"), self.cache)
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from core.edit_window import EditWindow, WindowSettings
+from core.model_session_data import ModelSessionData
+from core.update_calculator import UpdateCalculator
+from enums import ModelSessionDataEnum, Operation, State
+
+
+class TestEditWindow(TestCase):
+
+    def setUp(self):
+        self.df: pd.DataFrame = pd.DataFrame({"id": list(range(1, 11)), "title": [f"t{i}" for i in range(1, 11)]})
+        self.window: EditWindow = EditWindow(self.df, 4)
+
+    def test_settings(self):
+        self.assertFalse(WindowSettings.from_dict(None).enabled)
+        self.assertEqual(WindowSettings(5000), WindowSettings.from_dict({"window_size": 5000}))
+        self.assertFalse(WindowSettings.from_dict({"window_size": -1}).enabled)
+
+    def test_windows(self):
+        self.assertEqual(3, self.window.get_window_count(self.df))
+        self.assertEqual([1, 2, 3, 4], self.window.get_window_df(self.df)["id"].to_list())
+
+        self.window.set_start(self.df, 8)
+        self.assertEqual([9, 10], self.window.get_window_df(self.df)["id"].to_list())
+        self.window.set_start(self.df, 100)  # i.e. the last window
+        self.assertEqual(8, self.window.start)
+
+    def test_pending_edits(self):
+        # edits of the 1st window are kept while the 2nd one is being edited
+        self.window.move(self.df, 4, {"edited_rows": {1: {"title": "edited"}}, "deleted_rows": [3],
+                                      "added_rows": [{"id": 11, "title": "t11"}]})
+        self.assertTrue(self.window.has_pending)
+        editor_data: dict = {"edited_rows": {0: {"title": "edited too"}}, "deleted_rows": [2]}
+        self.assertEqual({1: {"title": "edited"}, 4: {"title": "edited too"}},
+                         self.window.get_editor_data(Operation.Edited, editor_data))
+        self.assertEqual([3, 6], self.window.get_editor_data(Operation.Deleted, editor_data))
+        self.assertEqual([{"id": 11, "title": "t11"}], self.window.get_editor_data(Operation.New, editor_data))
+
+        # back to the 1st window, it shows the pending edits, but not the deleted row
+        self.window.move(self.df, 0, None)
+        window_df: pd.DataFrame = self.window.get_window_df(self.df)
+        self.assertEqual([1, 2, 3], window_df["id"].to_list())
+        self.assertEqual("edited", window_df["title"].iloc[1])
+        self.assertEqual("t2", self.df["title"].iloc[1])
+
+        # positions in the window are not the positions in the table anymore, i.e. 3rd row is the 3rd id
+        self.assertEqual({1: {"title": "edited again"}, 2: {"title": "edited"}},
+                         self.window.get_editor_data(Operation.Edited, {"edited_rows": {1: {"title": "edited again"},
+                                                                                        2: {"title": "edited"}}}))
+        # edits of a deleted row are dropped
+        self.assertEqual({}, self.window.get_editor_data(Operation.Edited, {"deleted_rows": [1]}))
+
+    def test_for_table(self):
+        self.window.move(self.df, 4, {"edited_rows": {0: {"title": "edited"}}})
+        self.assertIs(self.window, EditWindow.for_table(self.window, self.df, 4))
+        self.assertFalse(EditWindow.for_table(self.window, self.df.copy(), 4).has_pending)
+        self.assertEqual(5, EditWindow.for_table(self.window, self.df, 5).size)
+
+    def test_update_of_all_windows(self):
+        session_state: dict = {}
+        session_data: ModelSessionData = ModelSessionData("model", session_state)
+        self.window.move(self.df, 8, {"edited_rows": {0: {"title": "edited"}}, "deleted_rows": [1]})
+        session_state[session_data.get_key(ModelSessionDataEnum.EditorData)] = {"edited_rows": {1: {"title": "last"}}}
+
+        updates: dict[Operation, pd.DataFrame] = UpdateCalculator(self.df, session_data, self.window).calculate_update()
+        self.assertEqual([{"id": 1, "title": "t1", "state": State.Old.value},
+                          {"id": 1, "title": "edited", "state": State.New.value},
+                          {"id": 10, "title": "t10", "state": State.Old.value},
+                          {"id": 10, "title": "last", "state": State.New.value}],
+                         updates[Operation.Edited].to_dict(orient="records"))
+        self.assertEqual([2], updates[Operation.Deleted]["id"].to_list())
+        self.assertTrue(updates[Operation.New].empty)
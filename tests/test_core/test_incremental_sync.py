@@ -0,0 +1,124 @@
+from pathlib import Path
+from typing import Optional, Type
+from unittest import TestCase
+
+import pandas as pd
+
+from base.model import Model
+from base.request_handler import RequestHandler
+from core.incremental_sync import IncrementalSync
+from core.model_config import ModelConfig
+from core.persistence import Persistence
+from core.response_data import ResponseData
+from enums import Operation
+
+CONFIG_DIR: Path = Path(__file__).parent.parent.parent / "configs"
+
+
+def movie(movie_id: int, title: str = "Title", **kwargs) -> dict:
+    return dict({"id": movie_id, "title": title, "year": 2000, "votes": 10, "rating": 5.0, "genres": "Drama"}, **kwargs)
+
+
+class ChangeLogRequestHandler(RequestHandler):
+    """ Serves the table and its change log, as the backend would """
+    table: pd.DataFrame = pd.DataFrame()
+    changes: pd.DataFrame = pd.DataFrame()
+    urls: list[str] = []
+
+    @classmethod
+    def handle_get(cls, url: str, headers: Optional[dict[str, str]] = None,
+                   model_class: Optional[Type[Model]] = None) -> ResponseData:
+        cls.urls.append(url)
+        if "/movies-changes/" not in url:
+            return ResponseData(200, df=cls.table.copy())
+
+        since: str = url.rstrip('/').rsplit('/', 1)[-1]
+        df: pd.DataFrame = cls.changes.tail(1) if since == "latest" else \
+            cls.changes[cls.changes["version"] > int(since)]
+        if df.empty:
+            return ResponseData(200, error_msg="No Data")
+        return ResponseData(200, df=df.reset_index(drop=True))
+
+    @classmethod
+    def change(cls, operation: Operation, row: dict) -> None:
+        """ Applies the change to the table and appends it to the change log """
+        version: int = 1 if cls.changes.empty else int(cls.changes["version"].max()) + 1
+        cls.table = cls.table[cls.table["id"] != row["id"]]
+        if operation != Operation.Deleted:
+            cls.table = pd.concat([cls.table, pd.DataFrame([row])], ignore_index=True)
+        cls.changes = pd.concat([cls.changes, pd.DataFrame([dict(row, version=version, operation=operation.value)])],
+                                ignore_index=True)
+
+
+class TestIncrementalSync(TestCase):
+
+    def setUp(self):
+        Persistence.table_cache.clear()
+        ChangeLogRequestHandler.urls = []
+        ChangeLogRequestHandler.table = pd.DataFrame([movie(i) for i in range(1, 6)])
+        ChangeLogRequestHandler.changes = pd.DataFrame()
+        for i in range(1, 6):
+            ChangeLogRequestHandler.change(Operation.New, movie(i))
+
+        self.config: ModelConfig = ModelConfig(CONFIG_DIR / "movies.toml", {})
+        self.config.request_handler_class = ChangeLogRequestHandler
+        self.config.config["apis"]["model_changes"] = {"get": "/movies-changes/"}  # not configured by default
+
+    def test_is_enabled(self):
+        self.assertFalse(IncrementalSync.is_enabled(ModelConfig(CONFIG_DIR / "movies.toml", {})))
+        self.assertTrue(IncrementalSync.is_enabled(self.config))
+        self.config.config["apis"].pop("model_changes")
+        self.assertFalse(IncrementalSync.is_enabled(self.config))
+        self.assertIsNone(Persistence.sync_model_data(self.config, ChangeLogRequestHandler.table))
+
+        # i.e. a backend without the changes end point isn't asked for these
+        self.assertTrue(Persistence.get_model_data(self.config).is_valid())
+        self.assertEqual([], [url for url in ChangeLogRequestHandler.urls if "/movies-changes/" in url])
+
+    def test_full_load_records_version(self):
+        data: ResponseData = Persistence.get_model_data(self.config)
+        self.assertEqual(5, IncrementalSync.get_version(data.df))
+        self.assertEqual(5, IncrementalSync.get_head_version(self.config))
+
+    def test_sync(self):
+        df: pd.DataFrame = Persistence.get_model_data(self.config).df.copy()
+        ChangeLogRequestHandler.change(Operation.Edited, movie(2, "Edited"))
+        ChangeLogRequestHandler.change(Operation.Deleted, movie(4))
+        ChangeLogRequestHandler.change(Operation.New, movie(7, "New"))
+        ChangeLogRequestHandler.change(Operation.Edited, movie(2, "Edited again"))
+        ChangeLogRequestHandler.urls = []
+
+        synced_df: Optional[pd.DataFrame] = Persistence.sync_model_data(self.config, df)
+        self.assertEqual(["http://localhost:8080/movies-changes/5/"], ChangeLogRequestHandler.urls)
+        self.assertEqual(9, IncrementalSync.get_version(synced_df))
+        self.assertEqual([1, 2, 3, 5, 7], synced_df["id"].to_list())
+        self.assertEqual(["Title", "Edited again", "Title", "Title", "New"], synced_df["title"].to_list())
+        self.assertEqual(df.columns.to_list(), synced_df.columns.to_list())
+        self.assertEqual(df.dtypes.to_list(), synced_df.dtypes.to_list())
+        self.assertEqual(5, df.shape[0])  # original frame is not modified
+
+        # synced frame replaces the cached one
+        self.assertIs(synced_df, Persistence.get_model_data(self.config).df)
+
+    def test_sync_without_changes(self):
+        df: pd.DataFrame = Persistence.get_model_data(self.config).df
+        self.assertIs(df, Persistence.sync_model_data(self.config, df))
+
+    def test_sync_with_gap(self):
+        df: pd.DataFrame = Persistence.get_model_data(self.config).df
+        ChangeLogRequestHandler.change(Operation.Edited, movie(2, "Edited"))
+        ChangeLogRequestHandler.change(Operation.Edited, movie(3, "Edited"))
+        ChangeLogRequestHandler.changes = ChangeLogRequestHandler.changes[ChangeLogRequestHandler.changes["version"]
+                                                                          != 6]
+        self.assertIsNone(Persistence.sync_model_data(self.config, df))
+
+    def test_sync_without_version(self):
+        self.assertIsNone(Persistence.sync_model_data(self.config, ChangeLogRequestHandler.table))
+
+    def test_merge_composite_ids(self):
+        df: pd.DataFrame = pd.DataFrame({"a": [1, 1, 2], "b": ["x", "y", "x"], "value": [1.0, 2.0, 3.0]})
+        changes: pd.DataFrame = pd.DataFrame({"a": [1, 2], "b": ["y", "y"], "value": [20.0, 4.0], "version": [11, 12],
+                                              "operation": [Operation.Deleted.value, Operation.New.value]})
+        merged: pd.DataFrame = IncrementalSync.merge(df, changes, ("a", "b"), version=10)
+        self.assertEqual([(1, "x", 1.0), (2, "x", 3.0), (2, "y", 4.0)], list(merged.itertuples(index=False)))
+        self.assertEqual(12, IncrementalSync.get_version(merged))
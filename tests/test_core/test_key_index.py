@@ -0,0 +1,85 @@
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from core.key_index import KeyIndex
+from core.local_write_back import LocalWriteBack
+from core.model_config import ModelConfig
+from core.update_handler import UpdateHandler
+from enums import Operation, State
+from util import Util
+
+CONFIG_DIR: Path = Path(__file__).parent.parent.parent / "configs"
+
+
+class TestKeyIndex(TestCase):
+
+    def setUp(self):
+        KeyIndex.clear()
+        self.df: pd.DataFrame = pd.DataFrame({"id": [3, 1, 2], "title": ["c", "a", "b"]})
+        self.composite_df: pd.DataFrame = pd.DataFrame({"a": [1, 1, 2], "b": ["x", "y", "x"]})
+
+    def test_lookup(self):
+        index: KeyIndex = KeyIndex(self.df, ("id",))
+        self.assertEqual(3, len(index))
+        self.assertEqual(1, index.get_position(1))
+        self.assertEqual(1, index.get_position(np.int64(1)))
+        self.assertIsNone(index.get_position(4))
+        self.assertEqual("b", index.get_row(self.df, 2)["title"])
+        self.assertIn(3, index)
+        self.assertEqual([], index.duplicates)
+
+    def test_composite_lookup(self):
+        index: KeyIndex = KeyIndex(self.composite_df, ("a", "b"))
+        self.assertEqual(2, index.get_position((2, "x")))
+        self.assertNotIn((2, "y"), index)
+
+    def test_duplicates_in_table(self):
+        self.assertEqual([1], KeyIndex(pd.DataFrame({"id": [1, 2, 1]}), ("id",)).duplicates)
+
+    def test_for_df(self):
+        index: KeyIndex = KeyIndex.for_df(self.df, ("id",))
+        self.assertIs(index, KeyIndex.for_df(self.df, ("id",)))
+        self.assertIsNot(index, KeyIndex.for_df(self.df.copy(), ("id",)))
+
+        # a locally updated table is a new DataFrame, hence a new index
+        new_df: pd.DataFrame = pd.DataFrame({"id": [0], "title": ["z"]})
+        updated_df: pd.DataFrame = LocalWriteBack.apply(self.df, {Operation.New: new_df}, ("id",))
+        updated_index: KeyIndex = KeyIndex.for_df(updated_df, ("id",))
+        self.assertEqual(0, updated_index.get_position(0))
+        self.assertEqual(3, updated_index.get_position(3))
+
+    def test_find_duplicates(self):
+        index: KeyIndex = KeyIndex(self.df, ("id",))
+        new_df: pd.DataFrame = pd.DataFrame({"id": [4.0, 5.0, 4.0, 1.0, 2.0]})  # editor gives floats for new ints
+        self.assertEqual([4.0, 1.0, 2.0], index.find_duplicates(new_df))
+        self.assertEqual([4.0, 1.0], index.find_duplicates(new_df, released_keys=[2]))
+
+        composite_index: KeyIndex = KeyIndex(self.composite_df, ("a", "b"))
+        self.assertEqual([(1, "x")], composite_index.find_duplicates(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})))
+
+    def test_parse_key(self):
+        index: KeyIndex = KeyIndex(self.df, ("id",))
+        self.assertEqual(2, index.parse_key(self.df, " 2 "))
+        self.assertIsNone(index.parse_key(self.df, "two"))
+
+        composite_index: KeyIndex = KeyIndex(self.composite_df, ("a", "b"))
+        self.assertEqual((1, "y"), composite_index.parse_key(self.composite_df, "1, y"))
+        self.assertIsNone(composite_index.parse_key(self.composite_df, "1"))
+
+    def test_update_handler_finds_duplicates(self):
+        config: ModelConfig = ModelConfig(CONFIG_DIR / "movies.toml", {})
+        handler: UpdateHandler = UpdateHandler(self.df, config)
+        handler._data_updates = {
+            Operation.New: pd.DataFrame({"id": [1.0, 4.0, None], "title": ["x", "y", "z"]}),
+            Operation.Edited: pd.DataFrame({"id": [3, 4], "title": ["c", "c"],
+                                            Util.STATE_STR: [State.Old.value, State.New.value]}),
+            Operation.Deleted: pd.DataFrame({"id": [1], "title": ["a"]}),
+        }
+        # 1 is deleted (so it can be reused) but 4 is taken by both a new row and an edited row
+        self.assertEqual([4.0], handler._find_duplicate_keys())
+
+        handler._data_updates.pop(Operation.Deleted)
+        self.assertEqual([1.0, 4.0], handler._find_duplicate_keys())
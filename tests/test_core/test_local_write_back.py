@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from core.local_write_back import LocalWriteBack
+from enums import Operation, State
+from util import Util
+
+
+def movie(movie_id: int, title: str = "Title", **kwargs) -> dict:
+    return dict({"id": movie_id, "title": title, "year": 2000, "votes": 10, "rating": 5.0}, **kwargs)
+
+
+class TestLocalWriteBack(TestCase):
+
+    def setUp(self):
+        self.df: pd.DataFrame = pd.DataFrame([movie(i) for i in range(1, 6)])
+        self.df.attrs["sync_version"] = 5
+
+    def test_apply(self):
+        changed_data: dict[Operation, pd.DataFrame] = {
+            Operation.New: pd.DataFrame([movie(9, "Nine"), movie(0, "Zero")]),
+            Operation.Edited: pd.DataFrame([movie(2, **{Util.STATE_STR: State.Old.value}),
+                                            movie(2, "Two", **{Util.STATE_STR: State.New.value})]),
+            Operation.Deleted: pd.DataFrame([movie(4)]),
+        }
+        result: pd.DataFrame = LocalWriteBack.apply(self.df, changed_data, ("id",))
+        self.assertEqual([0, 1, 2, 3, 5, 9], result["id"].to_list())
+        self.assertEqual(["Zero", "Title", "Two", "Title", "Title", "Nine"], result["title"].to_list())
+        self.assertEqual(list(range(6)), result.index.to_list())
+        self.assertEqual(self.df.columns.to_list(), result.columns.to_list())
+        self.assertEqual(self.df.dtypes.to_list(), result.dtypes.to_list())
+        self.assertEqual(5, result.attrs["sync_version"])
+        self.assertEqual(5, self.df.shape[0])  # original frame is not modified
+
+    def test_apply_edited_id(self):
+        changed_data: dict[Operation, pd.DataFrame] = {
+            Operation.Edited: pd.DataFrame([movie(3, **{Util.STATE_STR: State.Old.value}),
+                                            movie(30, **{Util.STATE_STR: State.New.value})]),
+        }
+        result: pd.DataFrame = LocalWriteBack.apply(self.df, changed_data, ("id",))
+        self.assertEqual([1, 2, 4, 5, 30], result["id"].to_list())
+
+    def test_apply_new_rows_from_editor(self):
+        # editor gives new rows as floats (and without the columns which weren't touched)
+        changed_data: dict[Operation, pd.DataFrame] = {
+            Operation.New: pd.DataFrame([{"id": 6.0, "title": "Six", "year": 2001.0, "votes": 1.0, "rating": 1.0}]),
+        }
+        result: pd.DataFrame = LocalWriteBack.apply(self.df, changed_data, ("id",))
+        self.assertEqual(self.df.dtypes.to_list(), result.dtypes.to_list())
+        self.assertEqual(6, result["id"].iloc[-1])
+
+    def test_apply_composite_ids(self):
+        df: pd.DataFrame = pd.DataFrame({"a": [1, 1, 2], "b": ["x", "y", "x"], "value": [1.0, 2.0, 3.0]})
+        changed_data: dict[Operation, pd.DataFrame] = {
+            Operation.Deleted: pd.DataFrame({"a": [1], "b": ["y"], "value": [2.0]}),
+            Operation.New: pd.DataFrame({"a": [0], "b": ["y"], "value": [4.0]}),
+        }
+        result: pd.DataFrame = LocalWriteBack.apply(df, changed_data, ("a", "b"))
+        self.assertEqual([(0, "y", 4.0), (1, "x", 1.0), (2, "x", 3.0)], list(result.itertuples(index=False)))
+
+    def test_apply_nothing(self):
+        result: pd.DataFrame = LocalWriteBack.apply(self.df, {}, ("id",))
+        self.assertTrue(self.df.equals(result))
+        self.assertIsNot(self.df, result)
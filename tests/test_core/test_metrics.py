@@ -0,0 +1,115 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import requests
+
+from core.metrics import Histogram, Metrics, MetricsSettings
+from core.model_config import ModelConfig
+from core.persistence import Persistence
+from stub_backend.server import StubBackend
+
+CONFIG_DIR: Path = Path(__file__).parent.parent.parent / "configs"
+
+
+class TestMetrics(TestCase):
+
+    def setUp(self):
+        Metrics.configure(MetricsSettings(enabled=True))
+        Metrics.reset()
+
+    def tearDown(self):
+        Metrics.configure(MetricsSettings())
+        Metrics.reset()
+
+    def test_disabled(self):
+        Metrics.configure(MetricsSettings(enabled=False))
+        Metrics.inc("requests_total")
+        Metrics.observe("request_seconds", 0.1)
+        with Metrics.timer("block_seconds"):
+            pass
+        self.assertEqual({}, Metrics.get_counters())
+        self.assertEqual({}, Metrics.get_histograms())
+
+    def test_counters(self):
+        Metrics.inc("rows_total", 10, model="movies", operation="New")
+        Metrics.inc("rows_total", 5, operation="New", model="movies")
+        Metrics.inc("rows_total", model="super_hero", operation="New")
+        self.assertEqual({("rows_total", (("model", "movies"), ("operation", "New"))): 15,
+                          ("rows_total", (("model", "super_hero"), ("operation", "New"))): 1},
+                         Metrics.get_counters())
+
+    def test_histogram(self):
+        histogram: Histogram = Histogram((1, 10, 100))
+        for value in (0.5, 1, 5, 50, 50, 500):
+            histogram.observe(value)
+        self.assertEqual([2, 1, 2, 1], histogram.counts)
+        self.assertEqual(6, histogram.count)
+        self.assertEqual(606.5, histogram.total)
+        self.assertEqual(10, histogram.get_quantile(0.5))
+        self.assertEqual(float("inf"), histogram.get_quantile(0.99))
+        self.assertIsNone(Histogram((1,)).get_quantile(0.5))
+
+    def test_timer(self):
+        with self.assertRaises(ValueError):
+            with Metrics.timer("block_seconds", model="movies"):
+                raise ValueError()
+        self.assertEqual(1, Metrics.get_histograms()[("block_seconds", (("model", "movies"),))].count)
+
+    def test_to_prometheus(self):
+        Metrics.inc("rows_total", 3, model='a"b')
+        Metrics.observe("request_seconds", 0.02, status=200)
+        text: str = Metrics.to_prometheus()
+        self.assertIn('# TYPE rows_total counter\nrows_total{model="a\\"b"} 3\n', text)
+        self.assertIn('request_seconds_bucket{status="200",le="0.01"} 0\n', text)
+        self.assertIn('request_seconds_bucket{status="200",le="0.025"} 1\n', text)
+        self.assertIn('request_seconds_bucket{status="200",le="+Inf"} 1\n', text)
+        self.assertIn('request_seconds_count{status="200"} 1\n', text)
+
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "metrics.prom"
+            Metrics.configure(MetricsSettings(enabled=True, export_file=str(path), export_interval_seconds=60))
+            Metrics.inc("rows_total")
+            Metrics.export(force=True)
+            self.assertEqual(Metrics.to_prometheus(), path.read_text())
+
+            # not rewritten before the interval
+            Metrics.inc("rows_total")
+            Metrics.export()
+            self.assertIn("rows_total 1\n", path.read_text())
+
+    def test_requests_by_end_point(self):
+        Persistence.table_cache.clear()
+        Persistence.audit_cache.clear()
+        with StubBackend.from_configs(rows=10) as backend:
+            config: ModelConfig = ModelConfig(CONFIG_DIR / "movies.toml", {})
+            config.port = backend.port
+            config._register_end_points()
+            Persistence.get_model_data(config)
+            Persistence.get_model_audit_data(config, 1)
+            Persistence.get_model_audit_data(config, 2)
+
+        histograms = Metrics.get_histograms()
+        self.assertEqual(2, histograms[("http_request_seconds", (("end_point", "/movies-audit/"), ("method", "GET"),
+                                                                 ("status", "200")))].count)
+        self.assertEqual(1, histograms[("http_request_seconds", (("end_point", "/movies/"), ("method", "GET"),
+                                                                 ("status", "200")))].count)
+        self.assertGreater(histograms[("http_response_bytes", (("end_point", "/movies/"), ("method", "GET")))].total,
+                           0)
+
+    def test_server(self):
+        Metrics.inc("rows_total", 7)
+        Metrics.configure(MetricsSettings(enabled=True, port=0))  # 0 means no server
+        self.assertIsNone(Metrics._server)
+
+        Metrics._start_server(0)
+        try:
+            port: int = Metrics._server.server_address[1]
+            response: requests.Response = requests.get(f'http://localhost:{port}/metrics', timeout=5)
+            self.assertEqual(200, response.status_code)
+            self.assertIn("rows_total 7", response.text)
+        finally:
+            Metrics._server.shutdown()
+            Metrics._server.server_close()
+            Metrics._server = None
@@ -0,0 +1,286 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Type
+from unittest import TestCase
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from base.model import Model
+from base.request_handler import RequestHandler
+from core.model_config import ModelConfig
+from core.persist_report import PersistReport
+from core.persistence import AuditSettings, Persistence, PersistenceSettings, PagingSettings
+from core.response_data import ResponseData
+from enums import Operation, State
+from util import Util
+
+CONFIG_DIR: Path = Path(__file__).parent.parent.parent / "configs"
+
+
+class RecordingRequestHandler(RequestHandler):
+    """ Records the calls instead of sending them to the backend """
+    delay: float = 0.1
+    calls: list[tuple[str, float, float]] = []
+    lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def _record(cls, verb: str) -> ResponseData:
+        start: float = time.perf_counter()
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.calls.append((verb, start, time.perf_counter()))
+        return ResponseData(200, error_msg="No Data")
+
+    @classmethod
+    def handle_post(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
+        return cls._record("post")
+
+    @classmethod
+    def handle_put(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
+        return cls._record("put")
+
+    @classmethod
+    def handle_delete(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
+        return cls._record("delete")
+
+
+class PagedRequestHandler(RequestHandler):
+    """ Serves the pages of the table (in reverse order of ids) """
+    table: pd.DataFrame = pd.DataFrame()
+    requested_pages: list[int] = []
+
+    @classmethod
+    def handle_get(cls, url: str, headers: Optional[dict[str, str]] = None,
+                   model_class: Optional[Type[Model]] = None) -> ResponseData:
+        query: dict[str, list[str]] = parse_qs(urlsplit(url).query)
+        if not query:
+            return ResponseData(200, df=cls.table.copy())
+
+        page, size = int(query["page"][0]), int(query["size"][0])
+        cls.requested_pages.append(page)
+        df: pd.DataFrame = cls.table.iloc[page * size: (page + 1) * size].reset_index(drop=True)
+        if df.empty:
+            return ResponseData(200, error_msg="No Data")
+        return ResponseData(200, df=df)
+
+
+class FlakyRequestHandler(RequestHandler):
+    """ Fails the requests with any of the failing_ids, but only for the first 'failures' times """
+    failing_ids: set[int] = set()
+    failures: int = 1
+    requests: list[list[int]] = []
+    lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def _handle(cls, ids: list[int]) -> ResponseData:
+        with cls.lock:
+            cls.requests.append(ids)
+            if cls.failing_ids.intersection(ids) and cls.failures > 0:
+                cls.failures -= 1
+                return ResponseData(500, error_msg="Internal Server Error")
+        return ResponseData(200, error_msg="No Data")
+
+    @classmethod
+    def handle_post(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
+        return cls._handle([movie["id"] for movie in json.loads(json_data)["movieEntities"]])
+
+    @classmethod
+    def handle_delete(cls, url: str, json_data: str, headers: dict[str, str]) -> ResponseData:
+        return cls._handle(json.loads(json_data))
+
+
+class TestPersistence(TestCase):
+
+    def setUp(self):
+        Persistence.table_cache.clear()
+        Persistence.audit_cache.clear()
+        RecordingRequestHandler.calls = []
+        self.config: ModelConfig = ModelConfig(CONFIG_DIR / "movies.toml", {})
+        self.config.request_handler_class = RecordingRequestHandler
+        row: dict = {"id": 1, "title": "Title", "year": 2000, "votes": 10, "rating": 5.0, "genres": "Drama"}
+        self.changed_data: dict[Operation, pd.DataFrame] = {
+            Operation.New: pd.DataFrame([dict(row, id=2)]),
+            Operation.Edited: pd.DataFrame([dict(row, id=3, **{Util.STATE_STR: State.Old.value}),
+                                            dict(row, id=3, title="New", **{Util.STATE_STR: State.New.value})]),
+            Operation.Deleted: pd.DataFrame([row]),
+        }
+
+    def _persist(self, concurrent: bool, ordering: str) -> dict[Operation, PersistReport]:
+        self.config.config["persistence"] = {"concurrent": concurrent, "ordering": ordering}
+        persistence: Persistence = Persistence(self.config, self.changed_data)
+        responses = persistence.persist()
+        self.assertEqual([Operation.New, Operation.Edited, Operation.Deleted], list(responses.keys()))
+        self.assertEqual(set(responses.keys()), set(persistence.timings.keys()))
+        return responses
+
+    def _overlaps(self, verb1: str, verb2: str) -> bool:
+        calls = {verb: (start, end) for verb, start, end in RecordingRequestHandler.calls}
+        return calls[verb1][0] < calls[verb2][1] and calls[verb2][0] < calls[verb1][1]
+
+    def test_settings(self):
+        self.assertEqual(PersistenceSettings(), PersistenceSettings.from_dict(None))
+        self.assertTrue(PersistenceSettings.from_dict({"concurrent": True}).concurrent)
+        with self.assertRaises(ValueError):
+            PersistenceSettings.from_dict({"ordering": "random"})
+
+    def test_persist_sequentially(self):
+        self._persist(concurrent=False, ordering="none")
+        self.assertEqual(["post", "put", "delete"], [verb for verb, _, __ in RecordingRequestHandler.calls])
+        self.assertFalse(self._overlaps("post", "put"))
+        self.assertFalse(self._overlaps("put", "delete"))
+
+    def test_persist_concurrently(self):
+        self._persist(concurrent=True, ordering="none")
+        self.assertTrue(self._overlaps("post", "put"))
+        self.assertTrue(self._overlaps("post", "delete"))
+
+    def test_persist_deletes_first(self):
+        self._persist(concurrent=True, ordering="deletes_first")
+        self.assertEqual("delete", RecordingRequestHandler.calls[0][0])
+        self.assertFalse(self._overlaps("delete", "post"))
+        self.assertTrue(self._overlaps("post", "put"))
+
+    def test_persist_auto_ordering(self):
+        # no key is reused, so everything can run at the same time
+        self._persist(concurrent=True, ordering="auto")
+        self.assertTrue(self._overlaps("post", "delete"))
+
+        # now, a deleted key is being reused by the new row
+        RecordingRequestHandler.calls = []
+        self.changed_data[Operation.New].loc[0, "id"] = 1
+        self._persist(concurrent=True, ordering="auto")
+        self.assertEqual("delete", RecordingRequestHandler.calls[0][0])
+        self.assertFalse(self._overlaps("delete", "post"))
+
+    def _set_up_paging(self, rows: int, page_size: int):
+        Persistence.table_cache.clear()
+        PagedRequestHandler.requested_pages = []
+        PagedRequestHandler.table = pd.DataFrame({"id": range(rows, 0, -1), "title": "Title", "year": 2000,
+                                                  "votes": 10, "rating": 5.0, "genres": "Drama"})
+        self.config.request_handler_class = PagedRequestHandler
+        self.config.config["apis"]["model"].update({"page_size": page_size, "max_parallel_pages": 3})
+
+    def test_paging_settings(self):
+        self.assertFalse(PagingSettings.from_dict(None).enabled)
+        self.assertTrue(PagingSettings.from_dict({"page_size": 10}).enabled)
+        self.assertEqual(1, PagingSettings.from_dict({"max_parallel_pages": 0}).max_parallel_pages)
+
+    def test_audit_settings(self):
+        self.assertFalse(AuditSettings.from_dict(None).is_batch)
+        self.assertTrue(AuditSettings.from_dict({"batch_param": "ids"}).is_batch)
+        self.assertEqual(1, AuditSettings.from_dict({"max_parallel_ids": 0, "batch_size": 0}).batch_size)
+
+    def test_get_model_data_without_paging(self):
+        self._set_up_paging(rows=25, page_size=0)
+        data: ResponseData = Persistence.get_model_data(self.config)
+        self.assertEqual(list(range(1, 26)), data.df["id"].to_list())
+        self.assertEqual([], PagedRequestHandler.requested_pages)
+
+    def test_get_model_data_with_paging(self):
+        for rows, expected_pages in ((25, 4), (30, 4), (5, 1), (10, 4), (45, 7)):
+            self._set_up_paging(rows=rows, page_size=10)
+            data: ResponseData = Persistence.get_model_data(self.config)
+            self.assertEqual(list(range(1, rows + 1)), data.df["id"].to_list())
+            self.assertEqual(list(range(data.df.index.size)), data.df.index.to_list())
+
+            # pages are fetched in batches of max_parallel_pages after the first page
+            self.assertEqual(expected_pages, len(PagedRequestHandler.requested_pages))
+
+    def test_get_model_data_with_first_page(self):
+        self._set_up_paging(rows=25, page_size=10)
+        first_page: ResponseData = Persistence.get_model_data_page(self.config, 0)
+        self.assertEqual(10, first_page.df.shape[0])
+
+        data: ResponseData = Persistence.get_model_data(self.config, first_page=first_page)
+        self.assertEqual(list(range(1, 26)), data.df["id"].to_list())
+        self.assertEqual(1, PagedRequestHandler.requested_pages.count(0))
+
+    def test_get_model_data_is_cached(self):
+        self._set_up_paging(rows=25, page_size=10)
+        data: ResponseData = Persistence.get_model_data(self.config)
+        self.assertTrue(Persistence.is_model_data_cached(self.config))
+
+        # the second call must be served from the cache
+        PagedRequestHandler.requested_pages = []
+        self.assertIs(data.df, Persistence.get_model_data(self.config).df)
+        self.assertEqual([], PagedRequestHandler.requested_pages)
+        self.assertEqual(1, Persistence.table_cache.get_stats().hits)
+
+    def test_persist_invalidates_cache(self):
+        self._set_up_paging(rows=25, page_size=10)
+        Persistence.get_model_data(self.config)
+        self.assertTrue(Persistence.is_model_data_cached(self.config))
+
+        self.config.request_handler_class = RecordingRequestHandler
+        RecordingRequestHandler.delay = 0
+        try:
+            self._persist(concurrent=False, ordering="none")
+        finally:
+            RecordingRequestHandler.delay = 0.1
+        self.assertFalse(Persistence.is_model_data_cached(self.config))
+
+    def test_persist_invalidates_audit_cache(self):
+        PagedRequestHandler.table = pd.DataFrame({"id": [1, 1], "title": ["Old", "New"], "year": 2000, "votes": 10,
+                                                  "rating": 5.0, "genres": "Drama", "version": [1, 2],
+                                                  "operation": ["New", "Edited"]})
+        self.config.request_handler_class = PagedRequestHandler
+        for model_id in (1, 4):
+            self.assertTrue(Persistence.get_model_audit_data(self.config, model_id).is_valid())
+
+        # now served from the cache
+        self.assertIs(Persistence.get_model_audit_data(self.config, 1).df,
+                      Persistence.get_model_audit_data(self.config, 1).df)
+        self.assertEqual(2, Persistence.audit_cache.get_stats().hits)
+
+        # deleted row has id 1, so only its entry should be gone
+        self.config.request_handler_class = RecordingRequestHandler
+        RecordingRequestHandler.delay = 0
+        try:
+            self._persist(concurrent=False, ordering="none")
+        finally:
+            RecordingRequestHandler.delay = 0.1
+        self.assertNotIn(("movies", "1"), Persistence.audit_cache)
+        self.assertIn(("movies", "4"), Persistence.audit_cache)
+
+    def _set_up_batches(self, rows: int, failing_ids: set[int], failures: int = 1):
+        FlakyRequestHandler.failing_ids, FlakyRequestHandler.failures, FlakyRequestHandler.requests = \
+            failing_ids, failures, []
+        self.config.request_handler_class = FlakyRequestHandler
+        self.config.config["persistence"] = {"post_batch_size": 3, "delete_batch_size": 4, "max_parallel_batches": 2}
+        row: dict = {"title": "Title", "year": 2000, "votes": 10, "rating": 5.0, "genres": "Drama"}
+        self.changed_data = {Operation.New: pd.DataFrame([dict(row, id=i) for i in range(1, rows + 1)]),
+                             Operation.Deleted: pd.DataFrame([dict(row, id=i) for i in range(101, 101 + rows)])}
+
+    def test_persist_in_batches(self):
+        self._set_up_batches(rows=10, failing_ids=set())
+        reports: dict[Operation, PersistReport] = Persistence(self.config, self.changed_data).persist()
+        self.assertIsNone(reports[Operation.Edited])
+        self.assertEqual(4, len(reports[Operation.New].batches))
+        self.assertEqual(3, len(reports[Operation.Deleted].batches))
+        self.assertTrue(all([report.is_status_ok for report in reports.values() if report]))
+        self.assertEqual(sorted([[1, 2, 3], [4, 5, 6], [7, 8, 9], [10], [101, 102, 103, 104], [105, 106, 107, 108],
+                                 [109, 110]]), sorted(FlakyRequestHandler.requests))
+
+    def test_persist_reports_failed_batches(self):
+        self._set_up_batches(rows=10, failing_ids={5, 9}, failures=10)
+        report: PersistReport = Persistence(self.config, self.changed_data).persist()[Operation.New]
+        self.assertFalse(report.is_status_ok)
+        self.assertEqual([0, 3], [batch.batch for batch in report.succeeded])
+        self.assertEqual([4, 5, 6, 7, 8, 9], report.failed_df["id"].to_list())
+        self.assertEqual("Internal Server Error", report.error_msg)
+
+    def test_retry_failed(self):
+        self._set_up_batches(rows=10, failing_ids={5}, failures=1)
+        persistence: Persistence = Persistence(self.config, self.changed_data)
+        reports: dict[Operation, PersistReport] = persistence.persist()
+        self.assertEqual([1], [batch.batch for batch in reports[Operation.New].failed])
+
+        # only the failed batch should be sent again
+        FlakyRequestHandler.requests = []
+        reports = persistence.retry_failed(reports)
+        self.assertEqual([[4, 5, 6]], FlakyRequestHandler.requests)
+        self.assertTrue(reports[Operation.New].is_status_ok)
+        self.assertEqual(4, len(reports[Operation.New].batches))
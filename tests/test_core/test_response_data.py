@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from core.response_data import ResponseData
+from util import Util
+
+
+class TestResponseData(TestCase):
+
+    def setUp(self):
+        self.loads: int = 0
+
+    def _loader(self, df):
+        def load():
+            self.loads += 1
+            return df
+        return load
+
+    def test_eager(self):
+        df: pd.DataFrame = pd.DataFrame({"id": [1, 2]})
+        self.assertIs(df, ResponseData(200, df=df).df)
+        self.assertTrue(ResponseData(200, df=df).is_valid())
+        self.assertFalse(ResponseData(500, error_msg="Error for url: http://localhost").is_valid())
+        self.assertEqual("Error", ResponseData(500, error_msg="Error for url: http://localhost").error_msg)
+
+        with self.assertRaises(ValueError):
+            ResponseData(200, df=pd.DataFrame())
+        with self.assertRaises(ValueError):
+            ResponseData(200, df=df, error_msg="Error")
+        with self.assertRaises(ValueError):
+            ResponseData(200, df=df, loader=lambda: df)
+
+    def test_lazy(self):
+        df: pd.DataFrame = pd.DataFrame({"id": [1, 2]})
+        data: ResponseData = ResponseData(200, loader=self._loader(df))
+        self.assertTrue(data.is_status_ok)
+        self.assertFalse(data.is_loaded)
+        self.assertEqual(0, self.loads)
+
+        self.assertTrue(data.is_valid())
+        self.assertIs(df, data.df)
+        self.assertIsNone(data.error_msg)
+        self.assertEqual(1, self.loads)
+
+    def test_lazy_no_data(self):
+        for df in (None, pd.DataFrame(), pd.DataFrame({"id": [None, np.nan]})):
+            data: ResponseData = ResponseData(200, loader=self._loader(df))
+            self.assertFalse(data.is_valid())
+            self.assertEqual(ResponseData.NO_DATA, data.error_msg)
+            with self.assertRaises(ValueError):
+                _ = data.df
+
+    def test_lazy_error_is_not_loaded(self):
+        data: ResponseData = ResponseData(500, loader=self._loader(pd.DataFrame({"id": [1]})))
+        self.assertFalse(data.is_valid())
+        self.assertEqual(0, self.loads)
+
+    def test_is_none_or_empty_df(self):
+        self.assertTrue(Util.is_none_or_empty_df(None))
+        self.assertTrue(Util.is_none_or_empty_df(pd.DataFrame(columns=["id"])))
+        self.assertTrue(Util.is_none_or_empty_df(pd.DataFrame({"id": [np.nan], "title": [None]})))
+        self.assertTrue(Util.is_none_or_empty_df(pd.DataFrame({"id": pd.array([None], dtype="Int64")})))
+        self.assertTrue(Util.is_none_or_empty_df(pd.DataFrame(index=[0, 1])))
+        self.assertFalse(Util.is_none_or_empty_df(pd.DataFrame({"id": [1]})))
+        self.assertFalse(Util.is_none_or_empty_df(pd.DataFrame({"id": [np.nan, np.nan], "title": [None, "a"]})))
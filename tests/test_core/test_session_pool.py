@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+
+from core.session_pool import PoolSettings, SessionPool
+
+
+class TestSessionPool(TestCase):
+
+    def setUp(self):
+        SessionPool.reset()
+
+    def tearDown(self):
+        SessionPool.reset()
+
+    def test_get_key(self):
+        self.assertEqual("http://localhost:8080", SessionPool.get_key("http://localhost:8080/movies/"))
+        self.assertEqual("https://host:443", SessionPool.get_key("https://host:443/superhero/all/1/"))
+
+    def test_pool_settings_from_dict(self):
+        self.assertEqual(PoolSettings(), PoolSettings.from_dict({"host": "http://localhost", "port": 8080}))
+        settings: PoolSettings = PoolSettings.from_dict({"pool_size": 4, "connect_timeout": 1, "read_timeout": 2})
+        self.assertEqual(4, settings.pool_size)
+        self.assertEqual((1.0, 2.0), settings.timeout)
+
+    def test_get_session(self):
+        session: requests.Session = SessionPool.get_session("http://localhost:8080/movies/")
+        self.assertEqual({'hits': 0, 'misses': 1, 'sessions': 1}, SessionPool.get_stats())
+
+        # same host:port must share the session
+        self.assertIs(session, SessionPool.get_session("http://localhost:8080/superhero/"))
+        self.assertEqual({'hits': 1, 'misses': 1, 'sessions': 1}, SessionPool.get_stats())
+
+        # but a different port must not
+        self.assertIsNot(session, SessionPool.get_session("http://localhost:8081/movies/"))
+        self.assertEqual({'hits': 1, 'misses': 2, 'sessions': 2}, SessionPool.get_stats())
+
+    def test_get_session_concurrently(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sessions = list(executor.map(SessionPool.get_session, ["http://localhost:8080/movies/"] * 100))
+
+        self.assertEqual(1, len({id(session) for session in sessions}))
+        self.assertEqual({'hits': 99, 'misses': 1, 'sessions': 1}, SessionPool.get_stats())
+
+    def test_configure(self):
+        settings: PoolSettings = PoolSettings(pool_size=2, connect_timeout=1, read_timeout=5)
+        SessionPool.configure("http://localhost:8080", settings)
+        self.assertEqual(settings, SessionPool.get_settings("http://localhost:8080/movies/"))
+        self.assertEqual(PoolSettings(), SessionPool.get_settings("http://localhost:8081/movies/"))
+
+        # changing the settings must drop the existing session
+        session: requests.Session = SessionPool.get_session("http://localhost:8080/movies/")
+        SessionPool.configure("http://localhost:8080", PoolSettings(pool_size=3))
+        self.assertIsNot(session, SessionPool.get_session("http://localhost:8080/movies/"))
+
+    def test_request_uses_configured_timeout(self):
+        SessionPool.configure("http://localhost:8080", PoolSettings(connect_timeout=1, read_timeout=5))
+        with patch.object(requests.Session, "request") as mock_request:
+            SessionPool.request("GET", url="http://localhost:8080/movies/", headers=None)
+            mock_request.assert_called_once_with(method="GET", url="http://localhost:8080/movies/",
+                                                 headers=None, timeout=(1.0, 5.0))
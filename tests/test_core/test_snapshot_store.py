@@ -0,0 +1,84 @@
+import gc
+from unittest import TestCase
+
+import pandas as pd
+
+from core.incremental_sync import IncrementalSync
+from core.local_write_back import LocalWriteBack
+from core.model_session_data import ModelSessionData
+from core.snapshot_store import SnapshotInfo, SnapshotStore
+from enums import ModelSessionDataEnum, Operation
+
+
+class TestSnapshotStore(TestCase):
+
+    def setUp(self):
+        SnapshotStore.clear()
+        self.df: pd.DataFrame = IncrementalSync.set_version(pd.DataFrame({"id": [1, 2], "title": ["a", "b"]}), 3)
+        self.sessions: list[ModelSessionData] = [ModelSessionData("movies", {}) for _ in range(3)]
+
+    def tearDown(self):
+        SnapshotStore.clear()
+
+    def test_publish(self):
+        self.assertIs(self.df, SnapshotStore.publish("movies", self.df))
+        self.sessions[0].update_data(ModelSessionDataEnum.TableData, self.df)
+
+        # same version loaded again (e.g. table_cache has expired) is not held twice
+        reloaded_df: pd.DataFrame = self.df.copy()
+        self.assertIs(self.df, SnapshotStore.publish("movies", reloaded_df))
+        self.assertIs(reloaded_df, SnapshotStore.publish("super_hero", reloaded_df))
+
+        next_df: pd.DataFrame = IncrementalSync.set_version(self.df.copy(), 4)
+        self.assertIs(next_df, SnapshotStore.publish("movies", next_df))
+
+    def test_publish_unversioned(self):
+        # without a version (i.e. changes are not configured), the same content is not held twice either
+        df: pd.DataFrame = pd.DataFrame({"id": [1, 2], "title": ["a", "b"]})
+        self.assertIs(df, SnapshotStore.publish("movies", df))
+        self.sessions[0].update_data(ModelSessionDataEnum.TableData, df)
+        self.assertIs(df, SnapshotStore.publish("movies", df.copy()))
+
+        for changed_df in (df.assign(title=["a", "c"]), df.iloc[::-1].reset_index(drop=True), df.astype({"id": float}),
+                           df.rename(columns={"title": "name"})):
+            self.assertIs(changed_df, SnapshotStore.publish("movies", changed_df))
+
+        list_df: pd.DataFrame = pd.DataFrame({"id": [1], "titles": [["a"]]})  # can't be hashed, hence not shared
+        self.assertIs(list_df, SnapshotStore.publish("movies", list_df))
+        self.assertIsNot(list_df, SnapshotStore.publish("movies", list_df.copy()))
+
+    def test_reference_counting(self):
+        SnapshotStore.publish("movies", self.df)
+        for index in range(len(self.sessions)):
+            self.sessions[index].update_data(ModelSessionDataEnum.TableData, self.df)
+        self.assertEqual([SnapshotInfo("movies", 3, 3, self.df.memory_usage(index=True, deep=True).sum())],
+                         SnapshotStore.get_snapshots())
+
+        # a session diverges by replacing its table
+        changed_data: dict[Operation, pd.DataFrame] = {Operation.New: pd.DataFrame({"id": [3], "title": ["c"]})}
+        self.sessions[0].update_data(ModelSessionDataEnum.TableData,
+                                     LocalWriteBack.apply(self.df, changed_data, ("id",)))
+        self.sessions[1].clear_data(ModelSessionDataEnum.TableData)
+        self.assertEqual([1, 1], [snapshot.refs for snapshot in SnapshotStore.get_snapshots()])
+
+        # released once the last session referring to it is gone
+        self.sessions.pop(2)
+        gc.collect()
+        self.assertEqual([1], [snapshot.refs for snapshot in SnapshotStore.get_snapshots()])
+
+        self.sessions[0].clear_data()
+        self.assertEqual([], SnapshotStore.get_snapshots())
+
+    def test_released_snapshot_can_be_published_while_alive(self):
+        SnapshotStore.publish("movies", self.df)
+        self.sessions[0].update_data(ModelSessionDataEnum.TableData, self.df)
+        self.sessions[0].clear_data()
+        self.assertEqual([], SnapshotStore.get_snapshots())
+        self.assertIs(self.df, SnapshotStore.publish("movies", self.df.copy()))  # e.g. it is still in table_cache
+
+        df_id: int = id(self.df)
+        del self.df
+        gc.collect()
+        self.assertIn(df_id, SnapshotStore._snapshots)  # not dropped until the next publish/acquire
+        SnapshotStore.publish("movies", IncrementalSync.set_version(pd.DataFrame({"id": [1]}), 3))
+        self.assertEqual(1, len(SnapshotStore._snapshots))
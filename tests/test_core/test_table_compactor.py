@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pydantic import Field
+
+from base.model import Model
+from core.editor_meta_data import EditorMetaData, EditorMetaDataMap
+from core.incremental_sync import IncrementalSync
+from core.local_write_back import LocalWriteBack
+from core.model_session_data import ModelSessionData
+from core.table_compactor import CompactionReport, TableCompactor
+from core.update_calculator import UpdateCalculator
+from enums import ModelSessionDataEnum, Operation
+from impl.movie import Movie, MoviesList
+
+
+class Rating(Model):
+    rating_id: int = Field(alias='id')
+    stars: int = Field(alias='stars', ge=0, le=5)
+    operation: Operation = Field(alias='operation')
+
+
+class TestTableCompactor(TestCase):
+
+    def setUp(self):
+        TableCompactor.clear()
+        self.df: pd.DataFrame = pd.DataFrame({"id": [1, 2, 3, 4], "title": ["a", "b", "c", "d"],
+                                              "year": [1999, 2000, 2001, 2024], "votes": [10, 20, 30, 8_000_000_000],
+                                              "rating": [9.7, 5.1, 6.0, 0.3],
+                                              "genres": ["Drama", "Comedy", "Drama", "Drama"]})
+        self.df.attrs["sync_version"] = 7
+        self.compact_df: pd.DataFrame = TableCompactor.compact(self.df, Movie, "movies")
+
+    def test_get_dtypes(self):
+        self.assertEqual({"title": "string[pyarrow]", "genres": "category", "year": "int16", "rating": "float32"},
+                         TableCompactor.get_dtypes(Movie))
+        self.assertEqual({"stars": "int8", "operation": "category"}, TableCompactor.get_dtypes(Rating))
+
+    def test_compact(self):
+        self.assertEqual(["int64", "string", "int16", "int64", "float32", "category"],
+                         [str(dtype) for dtype in self.compact_df.dtypes])
+        self.assertEqual(7, self.compact_df.attrs["sync_version"])
+        self.assertEqual("object", str(self.df["title"].dtype))  # df itself is not modified
+
+        report: CompactionReport = TableCompactor.get_reports()["movies"]
+        self.assertEqual(4, report.rows)
+        self.assertEqual(TableCompactor.get_memory_usage(self.df), report.bytes_before)
+        self.assertLess(report.bytes_after, report.bytes_before)
+
+    def test_values_are_not_changed(self):
+        self.assertEqual(self.df["rating"].tolist(), TableCompactor.to_list(self.compact_df["rating"]))
+        self.assertEqual(MoviesList.from_df(self.df).model_dump(), MoviesList.from_df(self.compact_df).model_dump())
+        self.assertEqual([None, "x"], TableCompactor.to_list(pd.Series([None, "x"], dtype="string[pyarrow]")))
+
+    def test_conform_dtypes(self):
+        df: pd.DataFrame = pd.DataFrame({"a": [1.0, 40_000.0], "b": [1.5, 2.0], "c": [1.0, None], "d": [1.0, 2.0]})
+        result: pd.DataFrame = TableCompactor.conform_dtypes(df, {"a": "int16", "b": "int64", "c": "int64",
+                                                                  "d": "int8"})
+        # nothing is truncated or overflowed, such columns are left as they are
+        self.assertEqual(["float64", "float64", "float64", "int8"], [str(dtype) for dtype in result.dtypes])
+
+    def test_for_editor(self):
+        editor_df: pd.DataFrame = TableCompactor.for_editor(self.compact_df, "movies")
+        self.assertEqual("string", str(editor_df["genres"].dtype))
+        self.assertEqual("category", str(self.compact_df["genres"].dtype))
+        self.assertIs(editor_df, TableCompactor.for_editor(self.compact_df))
+        self.assertIs(self.df, TableCompactor.for_editor(self.df))  # nothing to convert
+
+        # only the converted columns are copied, the rest are shared with the table
+        for column in ("id", "year", "rating"):
+            self.assertTrue(np.shares_memory(editor_df[column].to_numpy(), self.compact_df[column].to_numpy()))
+
+        # and the copy is counted in the report of the model
+        report: CompactionReport = TableCompactor.get_reports()["movies"]
+        self.assertEqual(int(editor_df[["genres"]].memory_usage(index=False, deep=True).sum()), report.editor_bytes)
+        self.assertAlmostEqual(1 - (report.bytes_after + report.editor_bytes) / report.bytes_before,
+                               report.saved_ratio)
+
+    def test_local_write_back(self):
+        new_df: pd.DataFrame = pd.DataFrame([{"id": 5.0, "title": "e", "year": 2003.0, "votes": 1.0, "rating": 7.2,
+                                              "genres": "Western"}])
+        result: pd.DataFrame = LocalWriteBack.apply(self.compact_df, {Operation.New: new_df}, ("id",))
+        self.assertEqual(self.compact_df.dtypes.to_list()[:-1], result.dtypes.to_list()[:-1])
+        self.assertEqual("category", str(result["genres"].dtype))
+        self.assertEqual(["Drama", "Comedy", "Drama", "Drama", "Western"], result["genres"].tolist())
+
+    def test_incremental_sync(self):
+        changes: pd.DataFrame = pd.DataFrame([{"id": 2, "title": "B", "year": 2000, "votes": 20, "rating": 5.5,
+                                               "genres": "Horror", "version": 8, "operation": Operation.Edited.value}])
+        result: pd.DataFrame = IncrementalSync.merge(self.compact_df, changes, ("id",), 7)
+        self.assertEqual([str(dtype) for dtype in self.compact_df.dtypes], [str(dtype) for dtype in result.dtypes])
+        self.assertEqual([9.7, 5.5, 6.0, 0.3], TableCompactor.to_list(result["rating"]))
+
+    def test_edited_rows(self):
+        st_session_state: dict = {}
+        model_data: ModelSessionData = ModelSessionData("movies", st_session_state)
+        editor_meta: EditorMetaData = EditorMetaDataMap[Operation.Edited]
+        st_session_state[model_data.get_key(ModelSessionDataEnum.EditorData)] = {
+            editor_meta.operation_key: {0: {"title": "A"}}}
+
+        edited_df: pd.DataFrame = UpdateCalculator(TableCompactor.for_editor(self.compact_df),
+                                                   model_data).calculate_update()[Operation.Edited]
+        self.assertEqual([9.7, 9.7], edited_df["rating"].tolist())
+        self.assertEqual(["a", "A"], edited_df["title"].tolist())
@@ -0,0 +1,55 @@
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from core.model_config import ModelConfig
+from core.table_filter import FilterSpec, TableFilter
+
+CONFIG_DIR: Path = Path(__file__).parent.parent.parent / "configs"
+
+
+class TestTableFilter(TestCase):
+
+    def setUp(self):
+        self.config: ModelConfig = ModelConfig(CONFIG_DIR / "movies.toml", {})
+        self.df: pd.DataFrame = pd.DataFrame({"id": [1, 2, 3, 4], "year": [1999, 2005, 2010, 2020],
+                                              "rating": np.array([7.1, 8.0, 6.5, 7.0], dtype=np.float32),
+                                              "genres": ["Drama", "Action,Drama", "Comedy", "action"]})
+
+    def test_specs(self):
+        specs: list[FilterSpec] = TableFilter.get_specs(self.config)
+        self.assertEqual(["minYear", "maxYear", "minRating", "genre"], [spec.param for spec in specs])
+        self.assertEqual(FilterSpec("minYear", "year", "ge", "From year"), specs[0])
+        self.assertEqual("year at most", FilterSpec("maxYear", "year", "le").get_label())
+
+        with self.assertRaises(ValueError):
+            FilterSpec.from_dict("year", {"column": "year", "op": "between"})
+
+        del self.config.config["apis"]["model"]["filters"]
+        self.assertEqual([], TableFilter.get_specs(self.config))
+
+    def test_query(self):
+        # empty values don't filter anything, and the same filters always give the same query
+        self.assertEqual("", TableFilter.to_query({"minYear": None, "genre": "  "}))
+        self.assertEqual("genre=drama&minYear=2000", TableFilter.to_query({"minYear": 2000, "genre": " drama "}))
+        self.assertEqual(TableFilter.to_query({"genre": "drama", "minYear": 2000}),
+                         TableFilter.to_query({"minYear": 2000, "genre": "drama"}))
+
+    def test_apply(self):
+        self.assertIs(self.df, TableFilter.apply(self.df, self.config))  # i.e. no filters
+
+        df: pd.DataFrame = TableFilter.set_values(self.df.copy(), {"minYear": 2000, "maxYear": 2015, "genre": None})
+        result: pd.DataFrame = TableFilter.apply(df, self.config)
+        self.assertEqual([2, 3], result["id"].to_list())
+        self.assertEqual([0, 1], result.index.to_list())
+        self.assertEqual({"minYear": 2000, "maxYear": 2015}, TableFilter.get_values(result))
+
+        df = TableFilter.set_values(self.df.copy(), {"genre": "ACTION"})
+        self.assertEqual([2, 4], TableFilter.apply(df, self.config)["id"].to_list())
+
+    def test_apply_to_float32(self):
+        # 7.1 as float32 is 7.0999999, which must still match a minimum rating of 7.1
+        df: pd.DataFrame = TableFilter.set_values(self.df.copy(), {"minRating": 7.1})
+        self.assertEqual([1, 2], TableFilter.apply(df, self.config)["id"].to_list())
@@ -0,0 +1,64 @@
+import random
+from unittest import TestCase
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from core.editor_meta_data import EditorMetaDataMap
+from core.model_session_data import ModelSessionData
+from core.update_calculator import UpdateCalculator
+from enums import Operation, ModelSessionDataEnum
+
+
+class TestUpdateCalculatorProperty(TestCase):
+    """ The vectorized _get_edited_rows must produce exactly what the reference implementation does """
+
+    def setUp(self):
+        self.st_session_state = dict()
+        self.model_data = ModelSessionData("model", self.st_session_state)
+        self.key: str = self.model_data.get_key(ModelSessionDataEnum.EditorData)
+
+    @staticmethod
+    def _random_value(rnd: random.Random, column: str):
+        if column == "int":
+            return rnd.randint(0, 5)
+        if column == "float":
+            return rnd.choice([0.5, 1.5, 2.0, 3])  # 3 is an int, to mix types as the editor might do
+        return rnd.choice(["a", "b", "c"])
+
+    def _random_case(self, rnd: random.Random) -> tuple[pd.DataFrame, dict[int, dict]]:
+        rows: int = rnd.randint(1, 30)
+        df: pd.DataFrame = pd.DataFrame({column: [self._random_value(rnd, column) for _ in range(rows)]
+                                         for column in ("int", "float", "str")})
+        edited_rows: dict[int, dict] = {}
+        for position in rnd.sample(range(rows), rnd.randint(0, rows)):
+            columns: list[str] = rnd.sample(list(df.columns), rnd.randint(1, len(df.columns)))
+            # half of the times, it is the same value, i.e. effectively no change
+            edited_rows[position] = {column: df.iloc[position][column] if rnd.random() < 0.5
+                                     else self._random_value(rnd, column) for column in columns}
+
+        return df, edited_rows
+
+    def test_same_as_reference(self):
+        rnd: random.Random = random.Random(42)
+        for _ in range(500):
+            df, edited_rows = self._random_case(rnd)
+            self.st_session_state[self.key] = {EditorMetaDataMap[Operation.Edited].operation_key: edited_rows}
+            calculator: UpdateCalculator = UpdateCalculator(df, self.model_data)
+            assert_frame_equal(calculator._get_edited_rows_reference(), calculator._get_edited_rows())
+
+    def test_unknown_column_is_a_change(self):
+        df: pd.DataFrame = pd.DataFrame({"A": [1, 2]})
+        self.st_session_state[self.key] = {EditorMetaDataMap[Operation.Edited].operation_key: {1: {"B": 3}}}
+        calculator: UpdateCalculator = UpdateCalculator(df, self.model_data)
+        assert_frame_equal(calculator._get_edited_rows_reference(), calculator._get_edited_rows())
+        self.assertEqual(2, calculator._get_edited_rows().shape[0])
+
+    def test_missing_values(self):
+        df: pd.DataFrame = pd.DataFrame({"A": [1.0, None], "B": ["x", None]})
+        self.st_session_state[self.key] = {EditorMetaDataMap[Operation.Edited].operation_key: {1: {"A": None}}}
+        calculator: UpdateCalculator = UpdateCalculator(df, self.model_data)
+        self.assertTrue(calculator._get_edited_rows().empty)  # NaN to None is not a change
+
+        self.st_session_state[self.key] = {EditorMetaDataMap[Operation.Edited].operation_key: {1: {"B": "y"}}}
+        self.assertEqual([None, "y"], calculator._get_edited_rows()["B"].to_list())
@@ -0,0 +1,47 @@
+import json
+from unittest import TestCase
+
+import pandas as pd
+
+from base.request_handler import RequestHandler
+from impl.movie import MoviesList
+from impl.super_hero import SuperHeroList, SuperHero
+from impl.super_hero_request_handler import SuperHeroJsonRequestHandler
+
+
+class TestSuperHeroJsonRequestHandler(TestCase):
+
+    def setUp(self):
+        self.df: pd.DataFrame = pd.DataFrame([
+            {"superHeroId": "1", "name": "Hero", "imdbLink": "link1", "awards": "Oscar, Golden Globe "},
+            {"superHeroId": "2", "name": "Hero", "imdbLink": "link2", "awards": "BAFTA"},
+        ])
+
+    def test_to_json(self):
+        payload: dict = json.loads(SuperHeroJsonRequestHandler.to_json(SuperHeroList.from_df(self.df)))
+        self.assertEqual([["Oscar", "Golden Globe"], ["BAFTA"]],
+                         [obj["awards"] for obj in payload["superHeroDtoList"]])
+        self.assertEqual(["1", "2"], [obj["superHeroId"] for obj in payload["superHeroDtoList"]])
+
+    def test_to_json_without_transform(self):
+        movies: pd.DataFrame = pd.DataFrame([{"id": 1, "title": "Title", "year": 2000, "votes": 10, "rating": 5.5,
+                                              "genres": "Drama"}])
+        model_list: MoviesList = MoviesList.from_df(movies)
+        self.assertEqual(model_list.model_dump_json(by_alias=True), RequestHandler.to_json(model_list))
+
+    def test_transform_incoming(self):
+        df: pd.DataFrame = pd.DataFrame([{"superHeroId": "1", "awards": ["Oscar", "Golden Globe"]},
+                                         {"superHeroId": "2", "awards": []}])
+        self.assertEqual(["Oscar,Golden Globe", ""],
+                         SuperHeroJsonRequestHandler.transform_incoming(df)["awards"].to_list())
+
+        # e.g. audit data without any awards column
+        df = pd.DataFrame([{"superHeroId": "1"}])
+        self.assertTrue(df.equals(SuperHeroJsonRequestHandler.transform_incoming(df)))
+
+    def test_round_trip(self):
+        payload: dict = json.loads(SuperHeroJsonRequestHandler.to_json(SuperHeroList.from_df(self.df)))
+        df: pd.DataFrame = SuperHeroJsonRequestHandler.transform_incoming(
+            SuperHeroJsonRequestHandler.response_decoder.decode(json.dumps(payload["superHeroDtoList"]).encode(),
+                                                                SuperHero))
+        self.assertEqual(["Oscar,Golden Globe", "BAFTA"], df["awards"].to_list())
@@ -0,0 +1,103 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from streamlit.testing.v1 import AppTest
+
+from core.model_config import ModelConfig
+from nav_pages.page_registry import PageRegistry, PageSettings
+from nav_pages.page_util import PageUtil
+
+PROJECT_ROOT_DIR: Path = Path(__file__).parent.parent.parent
+CONFIG_DIR: Path = PROJECT_ROOT_DIR / "configs"
+
+# startup (i.e. imports of the app + reading the configs) of a process with many models vs with a few models
+STARTUP_MODELS: int = 50
+STARTUP_BASE_MODELS: int = 2
+# mostly importing streamlit and pandas (same for both), reading the configs is ~1 ms per model
+STARTUP_RATIO: float = 1.5
+STARTUP_MARGIN_SECONDS: float = 0.5
+
+STARTUP_SCRIPT: str = '''
+import json, sys, time
+start = time.perf_counter()
+from pathlib import Path
+from config_parser import ConfigParser
+from nav_pages.page_registry import PageRegistry
+configs = ConfigParser.get_model_configs(Path(sys.argv[1]))
+print(json.dumps({"seconds": time.perf_counter() - start, "models": len(configs),
+                  "impl_modules": sorted(module for module in sys.modules if module.startswith("impl"))}))
+'''
+
+
+def navigation_app(config_dir: str):
+    import json
+    from pathlib import Path
+
+    import streamlit as st
+
+    from core.model_config import ModelConfig
+    from nav_pages.page_registry import PageRegistry
+
+    configs = {name: ModelConfig(Path(config_dir) / f"{name}.toml", {}) for name in ("movies", "super_hero")}
+    pages = PageRegistry.get_pages(configs)
+    st.markdown(json.dumps({title: [[page.title, page.url_path] for page in section] for title, section in
+                            pages.items()}))
+
+
+class TestPageRegistry(TestCase):
+
+    def test_pages(self):
+        # pages can only be created in a running app
+        app: AppTest = AppTest.from_function(navigation_app, args=(str(CONFIG_DIR),)).run()
+        self.assertEqual(0, len(app.exception))
+        self.assertEqual({"Movies": [["Data", "movies-data"], ["Audit", "movies-audit"]],
+                          "Super Heros": [["Data", "super_heros-data"], ["Audit", "super_heros-audit"]],
+                          "Diagnostics": [["Performance", "performance"]]}, json.loads(app.markdown[0].value))
+
+    def test_page_settings(self):
+        self.assertEqual(PageSettings("books", "books"), PageSettings.from_dict("books", None))
+        self.assertEqual(PageSettings("Books", "books"), PageSettings.from_dict("books", {"title": "Books"}))
+
+    def test_unique_titles(self):
+        config: ModelConfig = ModelConfig(CONFIG_DIR / "movies.toml", {})
+        config.config["page"]["title"] = "Super Heros"
+        with self.assertRaises(ValueError):
+            PageRegistry.get_pages({"movies": config, "super_hero": ModelConfig(CONFIG_DIR / "super_hero.toml", {})})
+
+    def test_audit_id_type(self):
+        self.assertIs(int, PageUtil._get_id_type(ModelConfig(CONFIG_DIR / "movies.toml", {})))
+        self.assertIs(str, PageUtil._get_id_type(ModelConfig(CONFIG_DIR / "super_hero.toml", {})))
+
+    def test_startup_budget(self):
+        """ models are not loaded at startup, so it stays (almost) flat with the number of models """
+        base_startup: dict = self._get_startup(STARTUP_BASE_MODELS)
+        startup: dict = self._get_startup(STARTUP_MODELS)
+
+        self.assertEqual(STARTUP_BASE_MODELS, base_startup["models"])
+        self.assertEqual(STARTUP_MODELS, startup["models"])
+        self.assertEqual([], startup["impl_modules"])
+        self.assertLess(startup["seconds"], base_startup["seconds"] * STARTUP_RATIO + STARTUP_MARGIN_SECONDS)
+
+    @staticmethod
+    def _get_startup(model_count: int) -> dict:
+        """ startup of a new process with model_count copies of the movies config """
+        with tempfile.TemporaryDirectory() as directory:
+            movies_config: str = (CONFIG_DIR / "movies.toml").read_text()
+            child_configs: list[str] = []
+            for index in range(model_count):
+                child_configs.append(f"model_{index}.toml")
+                config: str = movies_config.replace('name = "movies"', f'name = "model_{index}"')
+                (Path(directory) / child_configs[-1]).write_text(config.replace('"movies"', f'"model_{index}"'))
+
+            parent_config: Path = Path(directory) / "config.toml"
+            parent_config.write_text(f'child_config_directory = "{directory}"\n'
+                                     f'child_configs = {json.dumps(child_configs)}\n')
+
+            output: str = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, str(parent_config)],
+                                         cwd=PROJECT_ROOT_DIR, capture_output=True, text=True, check=True,
+                                         timeout=60).stdout
+            return json.loads(output.strip().splitlines()[-1])
@@ -0,0 +1,48 @@
+from pathlib import Path
+from unittest import TestCase
+
+import pandas as pd
+
+from core.model_config import ModelConfig
+from core.persistence import Persistence
+from core.response_data import ResponseData
+from core.table_filter import TableFilter
+from nav_pages.page_util import PageUtil
+from stub_backend.server import StubBackend
+
+CONFIG_DIR: Path = Path(__file__).parent.parent.parent / "configs"
+
+
+class TestPageUtil(TestCase):
+
+    def test_parse_ids(self):
+        self.assertEqual([1, 5, 10, 11, 12], PageUtil._parse_ids("1, 5,\n10-12, 5", int))
+        self.assertEqual(["spider man", "iron-man"], PageUtil._parse_ids(" spider man ,\niron-man,", str))
+
+        for text in ("1, a", "10-5", "1-2-3", f"1-{PageUtil.MAX_AUDIT_IDS + 1}"):
+            with self.assertRaises(ValueError):
+                PageUtil._parse_ids(text, int)
+
+        with self.assertRaises(ValueError):
+            PageUtil._parse_ids(f"1-{PageUtil.MAX_AUDIT_IDS}, {PageUtil.MAX_AUDIT_IDS + 1}", int)
+
+    def test_load_single_page(self):
+        Persistence.table_cache.clear()
+        with StubBackend.from_configs(rows=50) as backend:
+            config: ModelConfig = ModelConfig(CONFIG_DIR / "movies.toml", {})
+            config.port = backend.port
+            config.config["apis"]["model"].update({"page_size": 100, "first_page_fast": True})
+
+            # whole table is in the first page, and is still compacted and cached
+            data: ResponseData = PageUtil._load_table(config, {})
+            self.assertEqual(50, data.df.shape[0])
+            self.assertIsInstance(data.df["genres"].dtype, pd.CategoricalDtype)
+            self.assertTrue(Persistence.is_model_data_cached(config))
+            self.assertIs(data.df, PageUtil._load_table(config, {}).df)
+
+            # same for a filtered table, which is not reloaded on the next rerun as its filters are of the table
+            filters: dict = {"minYear": 2000}
+            data = PageUtil._load_table(config, filters)
+            self.assertLess(0, data.df.shape[0])
+            self.assertEqual(filters, TableFilter.get_values(data.df))
+            self.assertIs(data.df, PageUtil._load_table(config, filters).df)
@@ -0,0 +1,164 @@
+from pathlib import Path
+from unittest import TestCase
+
+import pandas as pd
+
+from core.model_config import ModelConfig
+from core.model_session_data import ModelSessionData
+from core.persistence import Persistence
+from core.response_data import ResponseData
+from core.update_calculator import UpdateCalculator
+from enums import ModelSessionDataEnum, Operation, State
+from stub_backend.server import FaultSettings, StubBackend
+from stub_backend.store import MODEL_SPECS
+from util import Util
+
+CONFIG_DIR: Path = Path(__file__).parent.parent.parent / "configs"
+
+
+class TestStubBackend(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend: StubBackend = StubBackend.from_configs(rows=50).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.backend.stop()
+
+    def setUp(self):
+        Persistence.table_cache.clear()
+        Persistence.audit_cache.clear()
+
+    def _get_config(self, name: str) -> ModelConfig:
+        config: ModelConfig = ModelConfig(CONFIG_DIR / name, {})
+        config.port = self.backend.port
+        # the stub serves the changes, even though these are not configured (for the backend)
+        config.config["apis"]["model_changes"] = {"get": MODEL_SPECS[config.name].changes_path}
+        return config
+
+    def test_get_model_data(self):
+        config: ModelConfig = self._get_config("movies.toml")
+        data: ResponseData = Persistence.get_model_data(config)
+        self.assertEqual(list(range(1, 51)), data.df["id"].to_list())
+        self.assertEqual(["id", "title", "year", "votes", "rating", "genres"], data.df.columns.to_list())
+        self.assertEqual("Red Dead Redemption II", data.df["title"].iloc[0])
+
+        Persistence.table_cache.clear()
+        config.config["apis"]["model"]["page_size"] = 15
+        self.assertTrue(data.df.equals(Persistence.get_model_data(config).df))
+
+    def test_snapshot_without_version(self):
+        config: ModelConfig = self._get_config("movies.toml")
+        config.config["apis"].pop("model_changes")  # as in the shipped configs
+        df: pd.DataFrame = Persistence.get_model_data(config).df
+        session_data: ModelSessionData = ModelSessionData(config.name, {})
+        session_data.update_data(ModelSessionDataEnum.TableData, df)
+
+        # e.g. table_cache has expired it, but the table is still the same
+        Persistence.table_cache.clear()
+        self.assertIs(df, Persistence.get_model_data(config).df)
+
+    def test_super_hero_awards(self):
+        config: ModelConfig = self._get_config("super_hero.toml")
+        df: pd.DataFrame = Persistence.get_model_data(config).df
+        self.assertTrue(all([isinstance(awards, str) for awards in df["awards"]]))
+
+        row: dict = dict(df.iloc[0].to_dict(), superHeroId="new_hero", awards="Oscar, Emmy")
+        Persistence(config, {Operation.New: pd.DataFrame([row])}).persist()
+        audit: pd.DataFrame = Persistence.get_model_audit_data(config, "new_hero").df
+        self.assertEqual(["Oscar,Emmy"], audit["awards"].to_list())
+
+    def test_persist(self):
+        config: ModelConfig = self._get_config("movies.toml")
+        df: pd.DataFrame = Persistence.get_model_data(config).df
+        new_row: dict = dict(df.iloc[0].to_dict(), id=1000)
+        edited: pd.DataFrame = pd.concat([df.iloc[[1]].assign(**{Util.STATE_STR: State.Old.value}),
+                                          df.iloc[[1]].assign(title="Edited", **{Util.STATE_STR: State.New.value})])
+        reports = Persistence(config, {Operation.New: pd.DataFrame([new_row]), Operation.Edited: edited,
+                                       Operation.Deleted: df.iloc[[2]]}).persist()
+        self.assertTrue(all([report.is_status_ok for report in reports.values()]))
+
+        synced_df: pd.DataFrame = Persistence.sync_model_data(config, df)
+        self.assertEqual(Persistence.get_model_data(config).df["id"].to_list(), synced_df["id"].to_list())
+        self.assertNotIn(3, synced_df["id"].to_list())
+        self.assertEqual("Edited", synced_df.loc[synced_df["id"] == 2, "title"].iloc[0])
+
+        audit: pd.DataFrame = Persistence.get_model_audit_data(config, 2).df
+        self.assertEqual([Operation.New.value, Operation.Edited.value], audit["operation"].to_list())
+
+        # adding the same row again is rejected
+        reports = Persistence(config, {Operation.New: pd.DataFrame([new_row])}).persist()
+        self.assertEqual(409, reports[Operation.New].batches[0].response.status_code)
+
+    def test_faults(self):
+        with StubBackend.from_configs(rows=10, faults=FaultSettings(latency_ms=1, error_rate=1.0)) as backend:
+            config: ModelConfig = self._get_config("movies.toml")
+            config.port = backend.port
+            data: ResponseData = Persistence.get_model_data(config)
+            self.assertEqual(500, data.status_code)
+            self.assertEqual("Injected error", data.error_msg)
+
+    def test_filters(self):
+        config: ModelConfig = self._get_config("movies.toml")
+        whole_df: pd.DataFrame = Persistence.get_model_data(config).df
+        filters: dict = {"minYear": 2010, "genre": "drama"}
+        df: pd.DataFrame = Persistence.get_model_data(config, filters=filters).df
+        expected: pd.DataFrame = whole_df[(whole_df["year"] >= 2010) & whole_df["genres"].astype(str).str.contains(
+            "drama", case=False)]
+        self.assertLess(0, df.shape[0])
+        self.assertEqual(expected["id"].to_list(), df["id"].to_list())
+
+        # filtered table is cached separately, and the whole table is still the same
+        self.assertTrue(Persistence.is_model_data_cached(config, {"genre": "drama", "minYear": 2010}))
+        self.assertIs(whole_df, Persistence.get_model_data(config).df)
+
+        # same with paging
+        Persistence.table_cache.clear()
+        config.config["apis"]["model"]["page_size"] = 3
+        self.assertEqual(df["id"].to_list(), Persistence.get_model_data(config, filters=filters).df["id"].to_list())
+
+    def test_edit_filtered_table(self):
+        with StubBackend.from_configs(rows=50) as backend:  # as the rows are changed
+            config: ModelConfig = self._get_config("movies.toml")
+            config.port = backend.port
+            filters: dict = {"minYear": 2010}
+            df: pd.DataFrame = Persistence.get_model_data(config, filters=filters).df
+
+            # 2nd row of the filtered table is edited in the editor, and the 1st is moved out of the filter
+            session_data: ModelSessionData = ModelSessionData(config.name, {})
+            editor_key: str = session_data.get_key(ModelSessionDataEnum.EditorData)
+            session_data._st_session_state[editor_key] = {"edited_rows": {0: {"year": 2000}, 1: {"title": "Edited"}}}
+            changes: dict = UpdateCalculator(df, session_data).calculate_update()
+            reports = Persistence(config, changes).persist()
+            self.assertTrue(all([report.is_status_ok for report in reports.values() if report is not None]))
+
+            synced_df: pd.DataFrame = Persistence.sync_model_data(config, df)
+            self.assertEqual(df["id"].to_list()[1:], synced_df["id"].to_list())
+            self.assertEqual("Edited", synced_df["title"].iloc[0])
+            self.assertTrue(Persistence.is_model_data_cached(config, filters))
+
+            whole_df: pd.DataFrame = Persistence.get_model_data(config).df
+            self.assertEqual("Edited", whole_df.loc[whole_df["id"] == df["id"].iloc[1], "title"].iloc[0])
+            self.assertEqual(2000, whole_df.loc[whole_df["id"] == df["id"].iloc[0], "year"].iloc[0])
+
+    def test_audits(self):
+        for batch_param in ("", "ids"):
+            Persistence.audit_cache.clear()
+            config: ModelConfig = self._get_config("super_hero.toml")
+            config.config["apis"]["model_audit"].update({"batch_param": batch_param, "batch_size": 4})
+            model_ids: list = Persistence.get_model_data(config).df["superHeroId"].to_list()[:10]
+
+            # a cached id is not fetched again, an unknown one has no history, and repeated ones are shown once
+            single: pd.DataFrame = Persistence.get_model_audit_data(config, model_ids[0]).df
+            data: ResponseData = Persistence.get_model_audits_data(config, model_ids + ["unknown", model_ids[0]])
+            self.assertEqual(sorted(model_ids), data.df["superHeroId"].unique().tolist())
+            self.assertTrue(all([isinstance(awards, str) for awards in data.df["awards"]]))
+            self.assertTrue(single.equals(data.df.loc[data.df["superHeroId"] == model_ids[0]].reset_index(drop=True)))
+
+            # histories are cached per id, same as for a single id
+            self.assertTrue(data.df.equals(Persistence.get_model_audits_data(config, model_ids).df))
+            self.assertEqual(len(model_ids), len([model_id for model_id in model_ids if
+                                                  Persistence.audit_cache.get(("super_hero", model_id)) is not None]))
+
+        self.assertFalse(Persistence.get_model_audits_data(config, ["unknown"]).is_valid())
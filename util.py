@@ -1,6 +1,7 @@
 import time
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from enums import Color, Operation
@@ -18,7 +19,16 @@ class Util:
 
     @staticmethod
     def is_none_or_empty_df(df: pd.DataFrame) -> bool:
-        return df is None or df.shape[0] == 0 or df.dropna(how='all').shape[0] == 0
+        """ same as df.dropna(how='all') being empty, but column by column, without copying the df """
+        if df is None or df.shape[0] == 0:
+            return True
+
+        for _, column in df.items():
+            # numpy int/bool columns can't have missing values (unlike the nullable extension dtypes, e.g. Int64)
+            if (isinstance(column.dtype, np.dtype) and column.dtype.kind in 'iub') or column.notna().any():
+                return False
+
+        return True
 
     @staticmethod
     def flash_message(handler, message: str, icon: str = "🚨", seconds: int = 5):